@@ -0,0 +1,466 @@
+import heapq
+import statistics
+import time
+from array import array
+from collections import deque
+from Simulation import DIRECTIONS
+from GameState import get_walls
+
+UNREACHABLE = 1 << 30
+CLEAR_CHUNK = 256
+UNREACHABLE_CHUNK = array('i', [UNREACHABLE]) * CLEAR_CHUNK
+
+
+class Autopilot:
+    '''
+    Класс Autopilot управляет змейкой без участия игрока. Он хранит поле расстояний до бонуса,
+    которое строится поиском в ширину один раз для каждого нового бонуса и затем обновляется
+    локально по клеткам, которые змейка заняла и освободила за такт. Перед ходом проверяется,
+    что после него змейке хватит свободного места, чтобы не запереть саму себя.
+    Вся работа за такт ограничена числом обработанных клеток: очистка и построение поля, исправление расстояний
+    после занятых и освобожденных клеток и проверка свободного места. Недоделанные построение и исправление
+    продолжаются на следующих тактах, чтобы время решения не превышало заданного бюджета. Карта препятствий
+    распаковывается один раз для каждого уровня, а буфер расстояний переиспользуется для каждого нового бонуса.
+    '''
+    def __init__(self, max_expansions=2000, max_area=250, budget=0.005, history=1000):
+        '''
+        Инициализация нового объекта Autopilot.
+
+        Args:
+            max_expansions (int, optional): Максимальное количество клеток, обрабатываемых за такт, включая проверку
+                свободного места. Если исправление поля затрагивает больше клеток, поле строится заново. По умолчанию 2000.
+            max_area (int, optional): Максимальное количество клеток, которое проверка свободного места обходит для
+                одного хода. Область, в которой найдено столько клеток, считается достаточной. По умолчанию 250.
+            budget (float, optional): Бюджет времени на одно решение в секундах, с которым сравниваются замеры. По умолчанию 0.005.
+            history (int, optional): Количество последних замеров времени решения, которые хранятся для статистики. По умолчанию 1000.
+        '''
+        self.max_expansions = max_expansions
+        self.max_area = max_area
+        self.budget = budget
+        self.timings = deque(maxlen=history)
+        self.decisions = 0
+        self.over_budget = 0
+        self.simulation = None
+        self.ticks = None
+        self.target = None
+        self.distances = array('i')
+        self.cleared = None
+        self.frontier = deque()
+        self.repair = []
+        self.affected = None
+        self.search = deque()
+        self.pending = set()
+        self.updates = deque()
+        self.work = 0
+
+    def __call__(self, simulation):
+        '''
+        Выбор направления движения змейки на следующий такт. Позволяет использовать автопилот как стратегию турнира.
+
+        Args:
+            simulation (Simulation): Симуляция игры.
+
+        Returns:
+            tuple: Новое направление движения или None, если подходящего хода нет.
+        '''
+        start = time.perf_counter()
+        self.work = max(self.max_expansions - (len(DIRECTIONS) - 1) * self.max_area, 1)
+        self.synchronize(simulation)
+        self.build()
+        direction = self.choose(simulation)
+        elapsed = time.perf_counter() - start
+        self.timings.append(elapsed)
+        self.decisions += 1
+        if elapsed > self.budget:
+            self.over_budget += 1
+        return direction
+
+    def reset(self, simulation):
+        '''
+        Привязка автопилота к симуляции: построение карты занятых клеток по препятствиям уровня и телу змейки.
+        Карта препятствий берется из общего для уровня кэша get_walls, а буфер расстояний сохраняется,
+        если размер поля не изменился.
+
+        Args:
+            simulation (Simulation): Симуляция игры.
+        '''
+        self.simulation = simulation
+        self.rows = simulation.height // simulation.cell_size + 1
+        self.cols = simulation.width // simulation.cell_size + 1
+
+        self.obstacles = get_walls(simulation.level, self.rows, self.cols)
+        self.blocked = bytearray(self.obstacles)
+        for segment in simulation.snake.get_segments():
+            if self.is_inside(segment):
+                self.blocked[self.index(segment)] = 1
+
+        self.ticks = simulation.ticks
+        self.target = None
+        if len(self.distances) != self.rows * self.cols:
+            self.distances = array('i')
+        self.cleared = None
+        self.frontier.clear()
+        self.repair = []
+        self.affected = None
+        self.search.clear()
+        self.pending.clear()
+        self.updates.clear()
+
+    def index(self, position):
+        '''
+        Преобразование координат клетки в ее номер.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            int: Номер клетки.
+        '''
+        return position[0] * self.cols + position[1]
+
+    def is_inside(self, position):
+        '''
+        Проверка, находится ли клетка на поле. Сегмент, добавленный при росте змейки, может оказаться за его пределами.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            bool: True, если клетка находится на поле, иначе False.
+        '''
+        return 0 <= position[0] < self.rows and 0 <= position[1] < self.cols
+
+    def neighbours(self, cell):
+        '''
+        Получение соседей клетки с учетом перехода через край поля.
+
+        Args:
+            cell (int): Номер клетки.
+
+        Returns:
+            tuple: Номера четырех соседних клеток.
+        '''
+        cols = self.cols
+        y, x = divmod(cell, cols)
+        row = y * cols
+        return (
+            ((y - 1) % self.rows) * cols + x,
+            ((y + 1) % self.rows) * cols + x,
+            row + (x - 1) % cols,
+            row + (x + 1) % cols,
+        )
+
+    def synchronize(self, simulation):
+        '''
+        Учет изменений симуляции с прошлого решения. Если прошел ровно один такт, поле расстояний
+        обновляется по занятым и освобожденным клеткам, иначе автопилот привязывается к симуляции заново.
+        При появлении нового бонуса начинается построение нового поля.
+
+        Args:
+            simulation (Simulation): Симуляция игры.
+        '''
+        if simulation is not self.simulation or simulation.ticks not in (self.ticks, self.ticks + 1):
+            self.reset(simulation)
+        elif simulation.ticks == self.ticks + 1:
+            self.ticks = simulation.ticks
+            for position in simulation.freed_cells:
+                if self.is_inside(position):
+                    self.unblock(self.index(position))
+            for position in simulation.filled_cells:
+                if self.is_inside(position):
+                    self.block(self.index(position))
+
+        target = simulation.bonus.position if simulation.bonus is not None else None
+        if target != self.target:
+            self.target = target
+            self.restart()
+
+    def restart(self):
+        '''
+        Начало построения поля расстояний заново от текущего бонуса. Буфер расстояний не выделяется заново,
+        а очищается в build частями по CLEAR_CHUNK клеток за счет запаса клеток на такт.
+        '''
+        self.pending.clear()
+        self.updates.clear()
+        self.repair = []
+        self.affected = None
+        self.search.clear()
+        self.frontier.clear()
+        self.cleared = None if self.target is None else 0
+
+    def is_busy(self):
+        '''
+        Проверка, продолжается ли построение или исправление поля расстояний.
+
+        Returns:
+            bool: True, если поле еще не соответствует занятым клеткам, иначе False.
+        '''
+        return bool(self.cleared is not None or self.frontier or self.affected is not None
+                    or self.repair or self.updates or self.pending)
+
+    def clear(self):
+        '''
+        Продолжение очистки буфера расстояний перед построением поля от нового бонуса. Очистка CLEAR_CHUNK клеток
+        засчитывается как обработка одной клетки. Буфер, выделенный после reset, при этом дорастает до размера поля.
+
+        Returns:
+            bool: True, если очистка закончена и построение поля начато, иначе False.
+        '''
+        distances = self.distances
+        size = self.rows * self.cols
+        while self.cleared < size and self.work > 0:
+            self.work -= 1
+            start = self.cleared
+            self.cleared = min(start + CLEAR_CHUNK, size)
+            distances[start:self.cleared] = UNREACHABLE_CHUNK[:self.cleared - start]
+        if self.cleared < size:
+            return False
+        self.cleared = None
+        cell = self.index(self.target)
+        distances[cell] = 0
+        self.frontier.append(cell)
+        return True
+
+    def build(self):
+        '''
+        Продолжение очистки буфера и построения поля расстояний поиском в ширину от бонуса, затем исправления
+        расстояний и применения изменений, накопленных с прошлых тактов: сначала занятых клеток, потом освобожденных.
+        Работа останавливается, когда исчерпан запас клеток на такт, и продолжается на следующем такте.
+        '''
+        if self.cleared is not None and not self.clear():
+            return
+        frontier = self.frontier
+        distances = self.distances
+        blocked = self.blocked
+        while frontier and self.work > 0:
+            self.work -= 1
+            cell = frontier.popleft()
+            distance = distances[cell] + 1
+            for neighbour in self.neighbours(cell):
+                if not blocked[neighbour] and distances[neighbour] > distance:
+                    distances[neighbour] = distance
+                    frontier.append(neighbour)
+        if frontier:
+            return
+
+        while self.work > 0:
+            if self.affected is not None:
+                if not self.run_search():
+                    return
+            elif self.repair:
+                self.run_repair()
+            elif self.updates:
+                cell = self.updates.popleft()
+                if self.blocked[cell]:
+                    self.invalidate(cell)
+                else:
+                    self.relax(cell)
+            elif self.pending:
+                pending, self.pending = self.pending, set()
+                self.updates.extend(cell for cell in pending if self.blocked[cell])
+                self.updates.extend(cell for cell in pending if not self.blocked[cell])
+            else:
+                return
+
+    def block(self, cell):
+        '''
+        Отметка клетки как занятой змейкой. Расстояния, которые через нее проходили, исправляются в build.
+
+        Args:
+            cell (int): Номер клетки.
+        '''
+        if self.blocked[cell]:
+            return
+        self.blocked[cell] = 1
+        if self.target is not None:
+            self.pending.add(cell)
+
+    def unblock(self, cell):
+        '''
+        Отметка клетки как свободной. Расстояния, которые через нее сокращаются, исправляются в build.
+
+        Args:
+            cell (int): Номер клетки.
+        '''
+        if not self.obstacles[cell]:
+            self.blocked[cell] = 0
+        if self.target is not None:
+            self.pending.add(cell)
+
+    def invalidate(self, cell):
+        '''
+        Начало исправления расстояний после того, как клетка стала занятой: в run_search находятся клетки,
+        все кратчайшие пути которых проходили через нее.
+
+        Args:
+            cell (int): Номер занятой клетки.
+        '''
+        self.work -= 1
+        if self.distances[cell] != UNREACHABLE and self.distances[cell] != 0:
+            self.affected = {cell}
+            self.search = deque([cell])
+
+    def run_search(self):
+        '''
+        Продолжение поиска клеток, расстояния которых зависели от занятой клетки, пока не исчерпан запас клеток
+        на такт. Каждая проверка соседей засчитывается как обработка клетки. Когда поиск закончен, расстояния
+        найденных клеток сбрасываются и вычисляются заново от границы области в run_repair.
+
+        Returns:
+            bool: True, если поиск продолжается или закончен, или False, если область больше max_expansions
+            и начато построение поля заново.
+        '''
+        distances = self.distances
+        blocked = self.blocked
+        affected = self.affected
+        queue = self.search
+        while queue and self.work > 0:
+            self.work -= 1
+            current = queue.popleft()
+            distance = distances[current] + 1
+            for neighbour in self.neighbours(current):
+                if neighbour in affected or distances[neighbour] != distance:
+                    continue
+                self.work -= 1
+                if not any(other not in affected and not blocked[other] and distances[other] == distance - 1
+                           for other in self.neighbours(neighbour)):
+                    affected.add(neighbour)
+                    queue.append(neighbour)
+            if len(affected) > self.max_expansions:
+                self.restart()
+                return False
+        if queue:
+            return True
+
+        self.affected = None
+        for current in affected:
+            distances[current] = UNREACHABLE
+        for current in affected:
+            if blocked[current]:
+                continue
+            best = UNREACHABLE
+            for neighbour in self.neighbours(current):
+                if not blocked[neighbour] and distances[neighbour] + 1 < best:
+                    best = distances[neighbour] + 1
+            if best < UNREACHABLE:
+                distances[current] = best
+                heapq.heappush(self.repair, (best, current))
+        return True
+
+    def relax(self, cell):
+        '''
+        Исправление расстояний после того, как клетка стала свободной: расстояние до нее определяется по соседям,
+        а уменьшение распространяется дальше в run_repair.
+
+        Args:
+            cell (int): Номер свободной клетки.
+        '''
+        distances = self.distances
+        blocked = self.blocked
+        self.work -= 1
+        for neighbour in self.neighbours(cell):
+            if not blocked[neighbour] and distances[neighbour] + 1 < distances[cell]:
+                distances[cell] = distances[neighbour] + 1
+        if distances[cell] < UNREACHABLE:
+            heapq.heappush(self.repair, (distances[cell], cell))
+
+    def run_repair(self):
+        '''
+        Продолжение исправления расстояний алгоритмом Дейкстры от клеток в очереди repair, пока не исчерпан запас клеток на такт.
+        '''
+        distances = self.distances
+        blocked = self.blocked
+        heap = self.repair
+        while heap and self.work > 0:
+            self.work -= 1
+            distance, current = heapq.heappop(heap)
+            if distance > distances[current] or blocked[current]:
+                continue
+            for neighbour in self.neighbours(current):
+                if not blocked[neighbour] and distances[neighbour] > distance + 1:
+                    distances[neighbour] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbour))
+
+    def reachable_area(self, cell, limit):
+        '''
+        Подсчет свободных клеток, достижимых из заданной клетки. Подсчет прекращается, как только найдено limit клеток.
+
+        Args:
+            cell (int): Номер начальной клетки.
+            limit (int): Достаточное количество клеток.
+
+        Returns:
+            int: Количество найденных клеток, не больше limit.
+        '''
+        blocked = self.blocked
+        seen = {cell}
+        queue = deque([cell])
+        while queue and len(seen) < limit:
+            for neighbour in self.neighbours(queue.popleft()):
+                if not blocked[neighbour] and neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return min(len(seen), limit)
+
+    def choose(self, simulation):
+        '''
+        Выбор хода: среди ходов, после которых змейке хватает места, выбирается ход с наименьшим
+        расстоянием до бонуса. Если безопасного хода нет, выбирается ход к наибольшей свободной области.
+        Пока поле расстояний строится или исправляется, расстояние до бонуса оценивается по прямой.
+        Место проверяется обходом не более max_area клеток на ход, поэтому для змейки длиннее max_area
+        достаточной считается область из max_area клеток.
+
+        Args:
+            simulation (Simulation): Симуляция игры.
+
+        Returns:
+            tuple: Новое направление движения или None, если любой ход ведет к столкновению.
+        '''
+        snake = simulation.snake
+        head = snake.get_head()
+        tail = snake.segments[-1]
+        distances = self.distances if self.target is not None and not self.is_busy() else None
+        candidates = []
+        for direction in DIRECTIONS:
+            if direction == (-snake.direction[0], -snake.direction[1]):
+                continue
+            position = ((head[0] + direction[0]) % self.rows, (head[1] + direction[1]) % self.cols)
+            cell = self.index(position)
+            if self.obstacles[cell] or (self.blocked[cell] and position != tail):
+                continue
+            if distances is not None:
+                distance = distances[cell]
+            elif self.target is not None:
+                distance = abs(position[0] - self.target[0]) + abs(position[1] - self.target[1])
+            else:
+                distance = 0
+            candidates.append((distance, direction != snake.direction, direction, cell))
+
+        limit = min(snake.get_length() + 1, self.max_area)
+        fallback, fallback_area = None, -1
+        for _, _, direction, cell in sorted(candidates):
+            area = self.reachable_area(cell, limit)
+            if area >= limit:
+                return direction
+            if area > fallback_area:
+                fallback, fallback_area = direction, area
+        return fallback
+
+    def get_stats(self):
+        '''
+        Получение статистики времени решения.
+
+        Returns:
+            dict: Количество решений, среднее, 99-й перцентиль и максимум времени по последним замерам в миллисекундах
+            и количество решений, превысивших бюджет.
+        '''
+        timings = sorted(self.timings)
+        if not timings:
+            return {'decisions': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0, 'over_budget': 0}
+        return {
+            'decisions': self.decisions,
+            'mean_ms': statistics.fmean(timings) * 1000,
+            'p99_ms': timings[min(len(timings) - 1, int(0.99 * len(timings)))] * 1000,
+            'max_ms': timings[-1] * 1000,
+            'over_budget': self.over_budget,
+        }
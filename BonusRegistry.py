@@ -0,0 +1,135 @@
+import hashlib
+import json
+
+
+def grow(snake, game, amount):
+    '''
+    Эффект роста: змейка увеличивается на amount сегментов.
+
+    Args:
+        snake (Snake): Змейка, подобравшая бонус.
+        game (Simulation): Игра, в которой происходит взаимодействие.
+        amount (int): Количество новых сегментов.
+    '''
+    for _ in range(amount):
+        snake.grow()
+
+
+def speed(snake, game, amount):
+    '''
+    Эффект ускорения: скорость змейки увеличивается на amount тактов в секунду.
+
+    Args:
+        snake (Snake): Змейка, подобравшая бонус.
+        game (Simulation): Игра, в которой происходит взаимодействие.
+        amount (int): Прибавка к скорости.
+    '''
+    game.snake_speed += amount
+
+
+EFFECTS = {
+    'grow': grow,
+    'speed': speed,
+}
+
+
+class BonusType:
+    '''
+    Класс BonusType описывает вид бонуса: цвет, вес при выборе вида нового бонуса, эффекты,
+    время жизни и период перемещения. Виды бонусов задаются в конфигурационном файле, а не отдельными классами.
+    '''
+    def __init__(self, name, color, weight=1, effects=None, lifetime=0, move_interval=0):
+        '''
+        Инициализация нового объекта BonusType.
+
+        Args:
+            name (str): Имя вида бонуса.
+            color (tuple): Цвет бонуса на экране.
+            weight (int, optional): Целый вес при выборе вида нового бонуса. Вид с весом 0 не появляется. По умолчанию 1.
+            effects (dict, optional): Эффекты из EFFECTS и их величины. По умолчанию эффектов нет.
+            lifetime (int, optional): Время жизни бонуса в тактах или 0, если бонус не исчезает. По умолчанию 0.
+            move_interval (int, optional): Период перемещения бонуса в тактах или 0, если бонус неподвижен. По умолчанию 0.
+        '''
+        self.name = name
+        self.color = tuple(color)
+        self.weight = weight
+        self.effects = [(EFFECTS[effect], amount) for effect, amount in (effects or {}).items()]
+        self.lifetime = lifetime
+        self.move_interval = move_interval
+
+    def apply(self, snake, game):
+        '''
+        Применение эффектов бонуса к змейке, которая его подобрала.
+
+        Args:
+            snake (Snake): Змейка, подобравшая бонус.
+            game (Simulation): Игра, в которой происходит взаимодействие.
+        '''
+        for effect, amount in self.effects:
+            effect(snake, game, amount)
+
+
+class BonusRegistry:
+    '''
+    Класс BonusRegistry хранит виды бонусов и максимальное количество бонусов на поле.
+    Реестр загружается из файла JSON один раз и затем переиспользуется всеми играми.
+    '''
+    loaded = {}
+
+    def __init__(self, types, max_pickups=1, path=None, digest=''):
+        '''
+        Инициализация нового объекта BonusRegistry.
+
+        Args:
+            types (list): Виды бонусов BonusType.
+            max_pickups (int, optional): Максимальное количество бонусов на поле одновременно. По умолчанию 1.
+            path (str, optional): Файл, из которого загружен реестр, или None. По умолчанию None.
+            digest (str, optional): Хеш SHA-256 содержимого файла реестра. По умолчанию ''.
+        '''
+        self.types = types
+        self.max_pickups = max_pickups
+        self.path = path
+        self.digest = digest
+        self.names = {bonus_type.name: kind for kind, bonus_type in enumerate(types)}
+        self.total_weight = sum(bonus_type.weight for bonus_type in types)
+
+    @classmethod
+    def load(cls, path='bonuses.json'):
+        '''
+        Загрузка реестра из файла JSON с ключами "max_pickups" и "types". Загруженные реестры кэшируются по пути к файлу,
+        а хеш содержимого файла сохраняется в digest, чтобы записи игр можно было сверить с конфигурацией бонусов.
+
+        Args:
+            path (str, optional): Путь к файлу. По умолчанию 'bonuses.json'.
+
+        Returns:
+            BonusRegistry: Реестр бонусов.
+        '''
+        registry = cls.loaded.get(path)
+        if registry is None:
+            with open(path, 'rb') as file:
+                data = file.read()
+            config = json.loads(data)
+            registry = cls(
+                [BonusType(**bonus_type) for bonus_type in config['types']], config.get('max_pickups', 1),
+                path, hashlib.sha256(data).hexdigest(),
+            )
+            cls.loaded[path] = registry
+        return registry
+
+    def choose(self, random):
+        '''
+        Выбор вида нового бонуса с учетом весов.
+
+        Args:
+            random (Random): Генератор случайных чисел игры.
+
+        Returns:
+            int: Номер вида бонуса.
+        '''
+        value = random.randrange(self.total_weight)
+        for kind, bonus_type in enumerate(self.types):
+            value -= bonus_type.weight
+            if value < 0:
+                return kind
+        return len(self.types) - 1
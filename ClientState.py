@@ -0,0 +1,171 @@
+import base64
+from collections import deque
+
+
+class ClientState:
+    '''
+    Класс ClientState хранит состояние сетевого матча "Snake Game" на стороне клиента.
+    Он собирается из полного состояния, полученного при подключении, и изменений каждого такта.
+    Чтобы игрок видел отклик на поворот без задержки сети, движение своей змейки предсказывается
+    локально, а при получении такта от сервера предсказание сверяется с ним и отбрасывается.
+    '''
+    def __init__(self):
+        '''
+        Инициализация нового пустого объекта ClientState.
+        '''
+        self.player = None
+        self.match = None
+        self.tick = 0
+        self.tick_rate = 0
+        self.rows = 0
+        self.cols = 0
+        self.obstacles = b''
+        self.snakes = {}
+        self.bonuses = {}
+        self.direction = (0, 1)
+        self.prediction = None
+        self.predictions = 0
+        self.mispredictions = 0
+
+    def apply_snapshot(self, message):
+        '''
+        Применение полного состояния матча из сообщения "welcome".
+
+        Args:
+            message (dict): Сообщение сервера.
+        '''
+        self.player = message['player']
+        self.match = message['match']
+        self.tick = message['tick']
+        self.tick_rate = message['tick_rate']
+        self.rows = message['rows']
+        self.cols = message['cols']
+        self.obstacles = base64.b64decode(message['obstacles'])
+        self.snakes = {int(player): deque(tuple(segment) for segment in segments) for player, segments in message['snakes'].items()}
+        self.bonuses = {(y, x): kind for y, x, kind in message['bonuses']}
+        self.direction = (0, 1)
+        self.prediction = None
+
+    def apply_delta(self, delta):
+        '''
+        Применение изменений за такт. Если в такте есть голова своей змейки, предсказание сверяется с ней.
+
+        Args:
+            delta (dict): Изменения за такт, возвращенные Match.step.
+        '''
+        self.tick = delta['t']
+        for player, y, x in delta.get('h', ()):
+            segments = self.snakes.get(player)
+            if segments is None:
+                continue
+            previous = segments[0]
+            segments.appendleft((y, x))
+            segments.pop()
+            if player == self.player:
+                self.direction = (self.step_delta(previous[0], y, self.rows + 1), self.step_delta(previous[1], x, self.cols + 1))
+                if self.prediction is not None:
+                    if self.prediction != (y, x):
+                        self.mispredictions += 1
+                    self.prediction = None
+        for player, y, x in delta.get('g', ()):
+            if player in self.snakes:
+                self.snakes[player].append((y, x))
+        for y, x in delta.get('e', ()):
+            self.bonuses.pop((y, x), None)
+        for y, x, kind in delta.get('b', ()):
+            self.bonuses[(y, x)] = kind
+        for player, _, segments in delta.get('j', ()):
+            self.snakes[player] = deque(tuple(segment) for segment in segments)
+            if player == self.player:
+                self.direction = (0, 1)
+        for player in delta.get('d', ()):
+            self.snakes.pop(player, None)
+            if player == self.player:
+                self.prediction = None
+
+    @staticmethod
+    def step_delta(previous, current, size):
+        '''
+        Вычисление смещения головы по одной оси с учетом перехода через край поля.
+
+        Args:
+            previous (int): Предыдущая координата.
+            current (int): Новая координата.
+            size (int): Размер поля по этой оси с учетом скрытой строки или столбца.
+
+        Returns:
+            int: Смещение -1, 0 или 1.
+        '''
+        delta = (current - previous) % size
+        return -1 if delta == size - 1 else delta
+
+    def is_obstacle(self, position):
+        '''
+        Проверка, является ли заданная позиция препятствием.
+
+        Args:
+            position (tuple): Координаты позиции на игровом поле.
+
+        Returns:
+            bool: True, если позиция является препятствием, иначе False.
+        '''
+        y, x = position
+        if 0 <= y < self.rows and 0 <= x < self.cols:
+            index = y * self.cols + x
+            return (self.obstacles[index >> 3] & (0x80 >> (index & 7))) != 0
+        return False
+
+    def get_segments(self):
+        '''
+        Получение сегментов своей змейки.
+
+        Returns:
+            deque: Сегменты змейки от головы к хвосту или None, если змейки нет на поле.
+        '''
+        return self.snakes.get(self.player)
+
+    def next_position(self, direction):
+        '''
+        Вычисление клетки, в которую попадет голова своей змейки при движении в заданном направлении.
+
+        Args:
+            direction (tuple): Направление движения.
+
+        Returns:
+            tuple: Координаты клетки в формате (y, x).
+        '''
+        head = self.get_segments()[0]
+        return (head[0] + direction[0]) % (self.rows + 1), (head[1] + direction[1]) % (self.cols + 1)
+
+    def predict(self, direction=None):
+        '''
+        Предсказание следующей клетки головы своей змейки после поворота, который только что отправлен на сервер.
+
+        Args:
+            direction (tuple, optional): Новое направление движения или None, чтобы сохранить текущее.
+
+        Returns:
+            tuple: Предсказанная клетка головы или None, если змейки нет на поле.
+        '''
+        segments = self.get_segments()
+        if segments is None:
+            return None
+        if direction is not None and direction != (-self.direction[0], -self.direction[1]):
+            self.direction = direction
+        self.prediction = self.next_position(self.direction)
+        self.predictions += 1
+        return self.prediction
+
+    def get_predicted_segments(self):
+        '''
+        Получение сегментов своей змейки с учетом предсказанного хода для отрисовки.
+
+        Returns:
+            list: Сегменты змейки от головы к хвосту или пустой список, если змейки нет на поле.
+        '''
+        segments = self.get_segments()
+        if segments is None:
+            return []
+        if self.prediction is None:
+            return list(segments)
+        return [self.prediction] + list(segments)[:-1]
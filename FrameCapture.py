@@ -0,0 +1,192 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+import pygame
+
+IMAGE_FORMATS = ('.png', '.bmp', '.tga', '.jpg')
+
+
+class FrameCapture:
+    '''
+    Класс FrameCapture записывает кадры игры "Snake Game" в последовательность изображений или в файл несжатого видео.
+    На игровом цикле кадр только копируется блиттингом в одну из заранее созданных поверхностей пула,
+    а кодирование и запись на диск выполняет фоновый поток. Если все поверхности пула заняты,
+    кадр пропускается, поэтому запись не замедляет игру. Для записи без пропусков (например, при
+    отрисовке повтора без окна) capture может ждать свободную поверхность.
+
+    Файл несжатого видео содержит кадры RGB24 подряд, а параметры записываются рядом в файл .json, например:
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 640x480 -r 30 -i game.rgb game.mp4
+    '''
+    def __init__(self, output, fps=30, pool_size=8, block=False, realtime=True):
+        '''
+        Инициализация нового объекта FrameCapture и запуск фонового потока.
+
+        Args:
+            output (str): Каталог для последовательности изображений или файл .rgb для несжатого видео.
+                Если output оканчивается на .png, .bmp, .tga или .jpg, это шаблон имени кадра с одним полем для номера,
+                например 'frames/frame_{:06d}.png'. Для каталога кадры сохраняются в формате PNG.
+            fps (int, optional): Частота кадров записи. По умолчанию 30.
+            pool_size (int, optional): Количество поверхностей в пуле, то есть кадров, ожидающих записи. По умолчанию 8.
+            block (bool, optional): Ждать свободную поверхность вместо пропуска кадра. По умолчанию False.
+            realtime (bool, optional): Пропускать кадры, пришедшие раньше чем через 1 / fps секунд после предыдущего записанного.
+                Выключается, когда вызывающий код сам передает кадры с нужной частотой. По умолчанию True.
+        '''
+        self.output = output
+        self.fps = fps
+        self.pool_size = pool_size
+        self.block = block
+        self.realtime = realtime
+        if output.endswith('.rgb'):
+            self.pattern = None
+            directory = os.path.dirname(output)
+        elif output.endswith(IMAGE_FORMATS):
+            self.pattern = output
+            directory = os.path.dirname(output)
+        else:
+            self.pattern = os.path.join(output, 'frame_{:06d}.png')
+            directory = output
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.free = deque()
+        self.free_event = threading.Condition()
+        self.pending = queue.Queue()
+        self.size = None
+        self.frames = 0
+        self.written = 0
+        self.dropped = 0
+        self.last_capture = None
+        self.encode_time = 0.0
+        self.file = None
+        self.error = None
+        self.worker = threading.Thread(target=self.work, name='FrameCapture', daemon=True)
+        self.worker.start()
+
+    @classmethod
+    def from_environment(cls, environ=os.environ):
+        '''
+        Создание объекта по переменным окружения. SNAKE_CAPTURE задает каталог или файл записи,
+        SNAKE_CAPTURE_FPS - частоту записи кадров.
+
+        Args:
+            environ (dict, optional): Переменные окружения. По умолчанию os.environ.
+
+        Returns:
+            FrameCapture: Новый объект или None, если запись не включена.
+        '''
+        output = environ.get('SNAKE_CAPTURE')
+        if not output or output == '0':
+            return None
+        return cls(output, fps=int(environ.get('SNAKE_CAPTURE_FPS', 30)))
+
+    def allocate(self, surface):
+        '''
+        Создание поверхностей пула в формате захватываемой поверхности. Выполняется один раз при первом захвате.
+
+        Args:
+            surface (Surface): Захватываемая поверхность.
+        '''
+        self.size = surface.get_size()
+        for _ in range(self.pool_size):
+            self.free.append(surface.copy())
+        if self.pattern is None:
+            self.file = open(self.output, 'wb')
+            with open(os.path.splitext(self.output)[0] + '.json', 'w') as file:
+                json.dump({'width': self.size[0], 'height': self.size[1], 'pix_fmt': 'rgb24', 'fps': self.fps}, file, indent=2)
+
+    def capture(self, surface, now=None):
+        '''
+        Захват кадра. При realtime=True кадр не записывается, если с прошлого захвата прошло меньше 1 / fps секунд.
+        Если свободных поверхностей нет, кадр пропускается или, при block=True, ожидает освобождения поверхности.
+        При block=True ошибка записи в фоновом потоке вызывается повторно здесь.
+
+        Args:
+            surface (Surface): Поверхность с кадром, обычно окно игры.
+            now (float, optional): Текущее время в секундах. По умолчанию time.perf_counter().
+
+        Returns:
+            bool: True, если кадр поставлен в очередь записи, иначе False.
+        '''
+        if self.realtime:
+            now = time.perf_counter() if now is None else now
+            if self.last_capture is not None and now - self.last_capture < 1 / self.fps:
+                return False
+            self.last_capture = now
+        if self.block and self.error is not None:
+            raise self.error
+        if self.size is None:
+            self.allocate(surface)
+        try:
+            buffer = self.free.popleft()
+        except IndexError:
+            if not self.block:
+                self.dropped += 1
+                return False
+            with self.free_event:
+                self.free_event.wait_for(lambda: self.free or self.error is not None)
+            if self.error is not None:
+                raise self.error
+            buffer = self.free.popleft()
+        buffer.blit(surface, (0, 0))
+        self.pending.put((self.frames, buffer))
+        self.frames += 1
+        return True
+
+    def work(self):
+        '''
+        Цикл фонового потока: запись кадров из очереди и возврат поверхностей в пул. Завершается по None в очереди.
+        Любая ошибка записи сохраняется в error, а ожидающий capture пробуждается и получает ее вместо вечного ожидания.
+        '''
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            index, buffer = item
+            start = time.perf_counter()
+            try:
+                if self.error is None:
+                    if self.pattern is None:
+                        self.file.write(pygame.image.tobytes(buffer, 'RGB'))
+                    else:
+                        pygame.image.save(buffer, self.pattern.format(index))
+                    self.written += 1
+            except Exception as error:
+                self.error = error
+            self.encode_time += time.perf_counter() - start
+            with self.free_event:
+                self.free.append(buffer)
+                self.free_event.notify_all()
+
+    def close(self):
+        '''
+        Запись оставшихся кадров и остановка фонового потока.
+
+        Returns:
+            dict: Статистика записи.
+        '''
+        if self.worker.is_alive():
+            self.pending.put(None)
+            self.worker.join()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return self.get_stats()
+
+    def get_stats(self):
+        '''
+        Статистика записи.
+
+        Returns:
+            dict: Количество захваченных, записанных и пропущенных кадров, среднее время записи кадра в миллисекундах
+            и текст ошибки записи или None. После ошибки кадры больше не записываются, но игра продолжается.
+        '''
+        return {
+            'frames': self.frames,
+            'written': self.written,
+            'dropped': self.dropped,
+            'encode_ms': self.encode_time / self.written * 1000 if self.written else 0.0,
+            'error': str(self.error) if self.error is not None else None,
+        }
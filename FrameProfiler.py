@@ -0,0 +1,206 @@
+import cProfile
+import csv
+import json
+import os
+import time
+from array import array
+
+PHASES = ('input', 'wait', 'update', 'render')
+INPUT, WAIT, UPDATE, RENDER = range(len(PHASES))
+
+
+class FrameProfiler:
+    '''
+    Класс FrameProfiler замеряет время фаз игрового цикла: обработки ввода, ожидания следующего кадра,
+    тактов симуляции и отрисовки. Замеры хранятся в кольцевом буфере фиксированного размера,
+    поэтому профилирование не выделяет память на каждом кадре. Поверх игры можно показывать
+    панель с частотой кадров и перцентилями времени кадра, а при выходе сохранять замеры в JSON или CSV.
+    '''
+    def __init__(self, capacity=1024, export_path=None, profile_frames=0, profile_path='profile.prof', show_hud=True, hud_interval=0.25):
+        '''
+        Инициализация нового объекта FrameProfiler.
+
+        Args:
+            capacity (int, optional): Количество последних кадров, которые хранятся в буфере. По умолчанию 1024.
+            export_path (str, optional): Файл .json или .csv, в который замеры сохраняются при выходе из игры. По умолчанию None.
+            profile_frames (int, optional): Количество первых кадров, которые выполняются под cProfile. По умолчанию 0.
+            profile_path (str, optional): Файл для статистики cProfile. По умолчанию 'profile.prof'.
+            show_hud (bool, optional): Показывать панель с замерами поверх игры. По умолчанию True.
+            hud_interval (float, optional): Интервал обновления текста панели в секундах. По умолчанию 0.25.
+        '''
+        self.capacity = capacity
+        self.export_path = export_path
+        self.profile_frames = profile_frames
+        self.profile_path = profile_path
+        self.show_hud = show_hud
+        self.hud_interval = hud_interval
+        self.timings = array('d', bytes(8 * capacity * len(PHASES)))
+        self.ticks = array('I', bytes(4 * capacity))
+        self.frames = 0
+        self.row = 0
+        self.last = 0.0
+        self.profile = None
+        self.font = None
+        self.hud_surface = None
+        self.hud_updated = 0.0
+
+    @classmethod
+    def from_environment(cls, environ=os.environ):
+        '''
+        Создание профилировщика по переменным окружения. SNAKE_PROFILE включает профилирование и может
+        содержать путь к файлу .json или .csv для сохранения замеров, SNAKE_PROFILE_FRAMES задает
+        количество кадров для cProfile.
+
+        Args:
+            environ (dict, optional): Переменные окружения. По умолчанию os.environ.
+
+        Returns:
+            FrameProfiler: Новый профилировщик или None, если профилирование не включено.
+        '''
+        value = environ.get('SNAKE_PROFILE')
+        if not value or value == '0':
+            return None
+        export_path = value if value.endswith(('.json', '.csv')) else None
+        return cls(export_path=export_path, profile_frames=int(environ.get('SNAKE_PROFILE_FRAMES', 0)))
+
+    def begin_frame(self):
+        '''
+        Начало замера нового кадра. На первом кадре запускается cProfile, если он запрошен.
+        '''
+        if self.frames == 0 and self.profile_frames > 0:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.row = (self.frames % self.capacity) * len(PHASES)
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        '''
+        Запись времени, прошедшего с предыдущей отметки, в фазу текущего кадра.
+
+        Args:
+            phase (int): Номер фазы: INPUT, WAIT, UPDATE или RENDER.
+        '''
+        now = time.perf_counter()
+        self.timings[self.row + phase] = now - self.last
+        self.last = now
+
+    def end_frame(self, ticks):
+        '''
+        Завершение замера кадра. Через profile_frames кадров cProfile останавливается, а его статистика сохраняется.
+
+        Args:
+            ticks (int): Количество тактов симуляции, выполненных за кадр.
+        '''
+        self.ticks[self.frames % self.capacity] = ticks
+        self.frames += 1
+        if self.frames >= self.profile_frames:
+            self.stop_profile()
+
+    def stop_profile(self):
+        '''
+        Остановка cProfile, если он запущен, и сохранение его статистики в profile_path.
+        '''
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.profile_path)
+            self.profile = None
+
+    def get_frames(self):
+        '''
+        Получение замеров из буфера в порядке следования кадров.
+
+        Returns:
+            list: Кортежи (время фаз..., количество тактов) для каждого хранимого кадра.
+        '''
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        frames = []
+        for frame in range(first, self.frames):
+            slot = frame % self.capacity
+            row = slot * len(PHASES)
+            frames.append(tuple(self.timings[row:row + len(PHASES)]) + (self.ticks[slot],))
+        return frames
+
+    def get_stats(self):
+        '''
+        Сводка замеров по кадрам в буфере.
+
+        Returns:
+            dict: Частота кадров, среднее время такта, перцентили времени кадра без ожидания и среднее время фаз в миллисекундах.
+        '''
+        frames = self.get_frames()
+        if not frames:
+            return {'frames': 0, 'fps': 0.0, 'tick_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'phases_ms': {}}
+        totals = sorted(sum(frame[:len(PHASES)]) - frame[WAIT] for frame in frames)
+        elapsed = sum(sum(frame[:len(PHASES)]) for frame in frames)
+        ticks = sum(frame[-1] for frame in frames)
+        return {
+            'frames': len(frames),
+            'fps': len(frames) / elapsed if elapsed > 0 else 0.0,
+            'tick_ms': sum(frame[UPDATE] for frame in frames) / ticks * 1000 if ticks else 0.0,
+            'p50_ms': totals[len(totals) // 2] * 1000,
+            'p99_ms': totals[min(len(totals) - 1, int(0.99 * len(totals)))] * 1000,
+            'phases_ms': {phase: sum(frame[i] for frame in frames) / len(frames) * 1000 for i, phase in enumerate(PHASES)},
+        }
+
+    def draw_hud(self, screen, snake_length):
+        '''
+        Отрисовка панели с частотой кадров, временем такта, перцентилями времени кадра и длиной змейки
+        в левом верхнем углу экрана. Текст панели обновляется раз в hud_interval секунд.
+
+        Args:
+            screen (Surface): Объект Surface из pygame, на котором отображается игра.
+            snake_length (int): Длина змейки.
+
+        Returns:
+            Rect: Прямоугольник панели на экране или None, если панель скрыта.
+        '''
+        if not self.show_hud:
+            return None
+        import pygame
+
+        now = time.perf_counter()
+        if self.hud_surface is None or now - self.hud_updated >= self.hud_interval:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 22)
+            stats = self.get_stats()
+            text = (f"FPS {stats['fps']:.0f}  tick {stats['tick_ms']:.2f} ms  "
+                    f"p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms  len {snake_length}")
+            self.hud_surface = self.font.render(text, True, (255, 255, 0), (0, 0, 0))
+            self.hud_updated = now
+        return screen.blit(self.hud_surface, (4, 4))
+
+    def export(self, path=None):
+        '''
+        Сохранение замеров из буфера. Формат определяется по расширению файла: .csv или JSON.
+        Если раунд закончился раньше, чем прошло profile_frames кадров, cProfile останавливается и его статистика
+        сохраняется здесь, чтобы он не продолжал работать в следующих раундах.
+
+        Args:
+            path (str, optional): Путь к файлу. По умолчанию export_path.
+
+        Returns:
+            str: Путь к сохраненному файлу или None, если путь не задан.
+        '''
+        self.stop_profile()
+        path = path or self.export_path
+        if path is None:
+            return None
+        frames = self.get_frames()
+        first = self.frames - len(frames)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(('frame',) + tuple(f'{phase}_ms' for phase in PHASES) + ('ticks',))
+                for i, frame in enumerate(frames):
+                    writer.writerow((first + i,) + tuple(round(value * 1000, 4) for value in frame[:len(PHASES)]) + (frame[-1],))
+        else:
+            document = {
+                'phases': list(PHASES),
+                'stats': self.get_stats(),
+                'frames': [{'frame': first + i, **{f'{phase}_ms': frame[j] * 1000 for j, phase in enumerate(PHASES)}, 'ticks': frame[-1]}
+                           for i, frame in enumerate(frames)],
+            }
+            with open(path, 'w') as file:
+                json.dump(document, file, indent=2)
+        return path
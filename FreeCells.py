@@ -0,0 +1,156 @@
+from array import array
+from Level import BIT_OFFSETS
+
+
+class FreeCells:
+    '''
+    Класс FreeCells хранит множество свободных клеток игрового поля. Добавление, удаление и выбор
+    случайной свободной клетки выполняются за O(1), поэтому бонусы быстро размещаются даже на почти заполненном поле.
+
+    Свободные клетки лежат в первых count позициях массива, а занятая клетка заменяется последней свободной.
+    Массивы array хранят смещения от начального состояния, в котором клетка n находится в позиции n,
+    поэтому они создаются заполненными нулями без построения списков на все клетки поля.
+    '''
+    def __init__(self, rows, cols):
+        '''
+        Инициализация нового объекта FreeCells, в котором все клетки поля свободны.
+
+        Args:
+            rows (int): Количество строк игрового поля.
+            cols (int): Количество столбцов игрового поля.
+        '''
+        self.rows = rows
+        self.cols = cols
+        self.count = rows * cols
+        self.cells = array('i', bytes(4 * self.count))
+        self.index = array('i', bytes(4 * self.count))
+
+    @classmethod
+    def from_level(cls, level):
+        '''
+        Создание множества свободных клеток уровня прямо из его битовой карты, без построения списка obstacles
+        (цикл по битам записан здесь, а не через Level.get_obstacle_cells, чтобы не вызывать генератор на каждое препятствие).
+        Препятствия занимаются в порядке номеров клеток, как при удалении по одному, поэтому выбор
+        случайных клеток не зависит от способа загрузки уровня.
+
+        Args:
+            level (Level): Уровень.
+
+        Returns:
+            FreeCells: Свободные клетки уровня.
+        '''
+        free_cells = cls(level.rows, level.cols)
+        cells, index = free_cells.cells, free_cells.index
+        size = count = free_cells.count
+        for byte_index, byte in enumerate(level.bitmap):
+            if not byte:
+                continue
+            base = byte_index * 8
+            for bit in BIT_OFFSETS[byte]:
+                cell = base + bit
+                if cell >= size:
+                    break
+                i = index[cell] + cell
+                count -= 1
+                last = cells[count] + count
+                if last != cell:
+                    cells[i] = last - i
+                    index[last] = i - last
+                index[cell] = -1 - cell
+        free_cells.count = count
+        return free_cells
+
+    def _to_index(self, position):
+        '''
+        Преобразование координат клетки в ее номер.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            int: Номер клетки или -1, если клетка находится за пределами поля.
+        '''
+        y, x = position
+        if 0 <= y < self.rows and 0 <= x < self.cols:
+            return y * self.cols + x
+        return -1
+
+    def add(self, position):
+        '''
+        Отмечает клетку как свободную. Клетки за пределами поля игнорируются.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+        '''
+        cell = self._to_index(position)
+        if cell >= 0 and self.index[cell] + cell < 0:
+            i = self.count
+            self.cells[i] = cell - i
+            self.index[cell] = i - cell
+            self.count += 1
+
+    def discard(self, position):
+        '''
+        Отмечает клетку как занятую. Клетки за пределами поля игнорируются.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+        '''
+        cell = self._to_index(position)
+        if cell < 0:
+            return
+        i = self.index[cell] + cell
+        if i >= 0:
+            self.count -= 1
+            last = self.cells[self.count] + self.count
+            if last != cell:
+                self.cells[i] = last - i
+                self.index[last] = i - last
+            self.index[cell] = -1 - cell
+
+    def contains(self, position):
+        '''
+        Проверка, свободна ли клетка.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            bool: True, если клетка свободна, иначе False.
+        '''
+        cell = self._to_index(position)
+        return cell >= 0 and self.index[cell] + cell >= 0
+
+    def get_count(self):
+        '''
+        Получение количества свободных клеток.
+
+        Returns:
+            int: Количество свободных клеток.
+        '''
+        return self.count
+
+    def is_full(self):
+        '''
+        Проверка, заполнено ли поле целиком.
+
+        Returns:
+            bool: True, если свободных клеток не осталось, иначе False.
+        '''
+        return not self.count
+
+    def sample(self, random):
+        '''
+        Выбор случайной свободной клетки с равной вероятностью.
+
+        Args:
+            random (Random): Генератор случайных чисел.
+
+        Returns:
+            tuple: Координаты клетки в формате (y, x) или None, если поле заполнено.
+        '''
+        if not self.count:
+            return None
+        position = random.randrange(self.count)
+        cell = self.cells[position] + position
+        return divmod(cell, self.cols)
@@ -1,173 +1,304 @@
-import pygame
-import sys
-from Snake import Snake
-from random import randint
-import shelve
-from Level import Level
-from Apple import Apple
-from Banana import Banana
-
-class Game:
-    '''
-    Основной класс игры "Snake Game". Он контролирует все основные механики игры, включая обработку ввода,
-    обновление состояния игры, отображение объектов на экране и сохранение рекордов.
-    '''
-    def __init__(self, name, difficulty='Easy'):
-        '''
-        Инициализация нового объекта Game.
-
-        Args:
-            name (str): Имя игрока.
-            difficulty (str, optional): Уровень сложности игры. Может быть 'Easy', 'Medium' или 'Hard'. По умолчанию 'Easy'.
-        '''
-        self.name = name
-        self.difficulty = difficulty
-        pygame.init()
-        self.width, self.height = 640, 480
-        self.cell_size = 20
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption('Snake Game')
-        self.clock = pygame.time.Clock()
-
-        self.snake = Snake((self.height // 2 // self.cell_size, self.width // 4 // self.cell_size), (0, 1))
-        self.running = True
-        self.level = Level(self.width, self.height, self.cell_size)
-
-
-        if self.difficulty == 'Easy':
-            self.snake_speed = 5
-            self.level.generate_obstacles('level1.txt')
-        elif self.difficulty == 'Medium':
-            self.snake_speed = 10
-            self.level.generate_obstacles('level2.txt')
-        elif self.difficulty == 'Hard':
-            self.snake_speed = 15
-            self.level.generate_obstacles('level3.txt')
-        self.generate_bonus()
-
-    def generate_bonus(self):
-        '''
-        Генерация бонусного предмета (яблока или банана) в случайной позиции на игровом поле.
-        '''
-        if randint(0,1) == 0:
-            bonus_class = Apple
-        else:
-            bonus_class = Banana
-        while True:
-            self.bonus = bonus_class((randint(0, self.height // self.cell_size - 1), randint(0, self.width // self.cell_size - 1)))
-            if self.bonus.position not in self.snake.get_segments() and self.bonus.position not in self.level.obstacles:
-                break
-
-    def process_input(self):
-        '''
-        Обработка ввода с клавиатуры. Реагирует на клавиши вверх, вниз, влево и вправо для управления змейкой,
-        а также на событие выхода из игры.
-        '''
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_DOWN and self.snake.direction != (-1, 0):
-                    self.snake.change_direction((1, 0))
-                elif event.key == pygame.K_UP and self.snake.direction != (1, 0):
-                    self.snake.change_direction((-1, 0))
-                elif event.key == pygame.K_LEFT and self.snake.direction != (0, 1):
-                    self.snake.change_direction((0, -1))
-                elif event.key == pygame.K_RIGHT and self.snake.direction != (0, -1):
-                    self.snake.change_direction((0, 1))
-
-    def update(self):
-        '''
-        Обновление состояния игры, включая перемещение змейки, проверку на столкновение с бонусами и проверку на столкновения.
-        '''
-        self.snake.move(next_position=self.get_next_snake_position())
-
-        if self.snake.get_head() == self.bonus.position:
-            self.bonus.effect_on_snake(self.snake, self)
-            self.generate_bonus()
-
-        if self.check_collision():
-            self.running = False
-
-    def check_collision(self):
-        '''
-        Проверка столкновения головы змейки с ее телом или препятствиями на игровом поле.
-
-        Returns:
-            bool: True, если произошло столкновение, иначе False.
-        '''
-        head = self.snake.get_head()
-        return (
-                self.snake.is_collision() or
-                self.level.is_obstacle(head)
-        )
-
-    def render(self):
-        '''
-        Отрисовка всех объектов на игровом поле, включая змейку, бонусы и препятствия.
-        '''
-        self.screen.fill((0, 0, 0))
-
-        for segment in self.snake.get_segments():
-            pygame.draw.rect(self.screen, (255, 255, 255), (segment[1] * self.cell_size, segment[0] * self.cell_size, self.cell_size, self.cell_size))
-
-        pygame.draw.rect(self.screen, self.bonus.color, (self.bonus.position[1] * self.cell_size, self.bonus.position[0] * self.cell_size, self.cell_size, self.cell_size))
-        self.level.render_obstacles(self.screen)
-
-        pygame.display.flip()
-
-    def get_score(self):
-        '''
-        Получение текущего счета игрока, который равен длине змейки.
-
-        Returns:
-            int: Длина змейки.
-        '''
-        return self.snake.get_length()
-
-    def run(self):
-        '''
-        Запуск основного игрового цикла, который обрабатывает ввод, обновляет состояние игры и отрисовывает объекты на экране.
-        '''
-        while self.running:
-            self.process_input()
-            self.update()
-            self.render()
-            self.clock.tick(self.snake_speed)
-
-        self.save_highscore()
-        pygame.quit()
-        sys.exit()
-
-    def save_highscore(self):
-        '''
-        Сохранение текущего рекорда игрока в таблицу рекордов, которая хранит топ-10 рекордов.
-        '''
-        with shelve.open('highscores.db', 'c') as db:
-            highscores = db.get('highscores', [])
-            highscores.append((self.name, self.get_score()))
-            highscores.sort(key=lambda x: x[1], reverse=True)
-            db['highscores'] = highscores[:10]
-
-    def get_next_snake_position(self):
-        '''
-        Вычисление следующей позиции змейки на основе текущего направления ее движения.
-
-        Returns:
-            tuple: Следующая позиция змейки в формате (y, x).
-        '''
-        self.snake.block_direction = False
-        next_y = self.snake.segments[0][0] + self.snake.direction[0]
-        next_x = self.snake.segments[0][1] + self.snake.direction[1]
-        if next_y > self.height // self.cell_size:
-            next_y = 0
-        elif next_y < 0:
-            next_y = self.height // self.cell_size
-
-        if next_x > self.width // self.cell_size:
-            next_x = 0
-        elif next_x < 0:
-            next_x = self.width // self.cell_size
-
-        next_position = (next_y, next_x)
-        return next_position
+import pygame
+import os
+import time
+from collections import deque
+from FrameProfiler import FrameProfiler, INPUT, WAIT, UPDATE, RENDER
+from FrameCapture import FrameCapture
+from Replay import Replay
+from Simulation import Simulation
+from Renderer import Renderer
+from Viewport import Viewport
+
+class Game:
+    '''
+    Основной класс игры "Snake Game". Он обрабатывает ввод, отображает объекты на экране и сохраняет рекорды,
+    а игровая логика выполняется объектом Simulation, который работает без дисплея.
+    '''
+    def __init__(self, name, difficulty='Easy', incremental_render=True, leaderboard=None, frame_rate=60, seed=None, replay_dir='replays', catalog=None, level=None, autopilot=None, profiler=None, screen=None, capture=None):
+        '''
+        Инициализация нового объекта Game.
+
+        Args:
+            name (str): Имя игрока.
+            difficulty (str, optional): Уровень сложности игры. Может быть 'Easy', 'Medium' или 'Hard'. По умолчанию 'Easy'.
+            incremental_render (bool, optional): Перерисовывать только изменившиеся клетки вместо всего экрана. По умолчанию True.
+            leaderboard (Leaderboard, optional): Таблица рекордов или None, чтобы не сохранять рекорды (например, в тестах
+                производительности и при проверке записей). По умолчанию None.
+            frame_rate (int, optional): Частота кадров отрисовки и опроса ввода. По умолчанию 60.
+            seed (int, optional): Начальное значение генератора случайных чисел игры. По умолчанию выбирается случайно.
+            replay_dir (str, optional): Каталог, в который сохраняется запись игры, или None, чтобы не сохранять ее. По умолчанию 'replays'.
+            catalog (LevelCatalog, optional): Каталог уровней, из которого берется уровень. По умолчанию уровень читается из текстового файла.
+            level (Level, optional): Уровень для игры вместо уровня сложности. Если поле больше окна, камера следует за змейкой. По умолчанию None.
+            autopilot (Autopilot, optional): Автопилот, который управляет змейкой вместо игрока. Рекорд такой игры не сохраняется. По умолчанию None.
+            profiler (FrameProfiler, optional): Профилировщик игрового цикла. По умолчанию создается по переменной окружения SNAKE_PROFILE,
+                а если она не задана, профилирование выключено.
+            screen (Surface, optional): Уже созданное окно. По умолчанию pygame инициализируется и окно создается заново.
+            capture (FrameCapture, optional): Запись кадров игры в фоновом потоке. По умолчанию создается по переменной окружения SNAKE_CAPTURE,
+                а если она не задана, кадры не записываются.
+        '''
+        self.name = name
+        self.difficulty = difficulty
+        self.cell_size = 20
+        if screen is None:
+            pygame.init()
+            screen = pygame.display.set_mode((640, 480))
+            pygame.display.set_caption('Snake Game')
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.quit_requested = False
+        self.clock = pygame.time.Clock()
+        self.frame_rate = frame_rate
+        self.directions = deque()
+        self.leaderboard = leaderboard
+        self.autopilot = autopilot
+        self.profiler = profiler if profiler is not None else FrameProfiler.from_environment()
+        self.capture = capture if capture is not None else FrameCapture.from_environment()
+
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), 'little')
+        self.replay_dir = replay_dir
+        if level is None and catalog is not None:
+            level = catalog.get_for_difficulty(self.difficulty)
+        self.simulation = Simulation(self.difficulty, self.width, self.height, self.cell_size, seed=self.seed, record=True, level=level)
+        if self.simulation.width > self.width or self.simulation.height > self.height:
+            self.renderer = Viewport(self.screen, self.level, self.cell_size)
+        elif incremental_render:
+            self.renderer = Renderer(self.screen, self.level, self.cell_size)
+        else:
+            self.renderer = None
+
+    @property
+    def snake(self):
+        '''
+        Змейка текущей симуляции.
+        '''
+        return self.simulation.snake
+
+    @property
+    def level(self):
+        '''
+        Уровень текущей симуляции.
+        '''
+        return self.simulation.level
+
+    @property
+    def bonus(self):
+        '''
+        Первый бонус на игровом поле или None, если бонусов нет.
+        '''
+        return self.simulation.bonus
+
+    @property
+    def running(self):
+        '''
+        Флаг, показывающий, продолжается ли игра.
+        '''
+        return self.simulation.running
+
+    @running.setter
+    def running(self, value):
+        self.simulation.running = value
+
+    @property
+    def snake_speed(self):
+        '''
+        Скорость змейки в тактах в секунду.
+        '''
+        return self.simulation.snake_speed
+
+    @snake_speed.setter
+    def snake_speed(self, value):
+        self.simulation.snake_speed = value
+
+    def generate_bonus(self):
+        '''
+        Генерация бонуса случайного вида в случайной позиции на игровом поле.
+        '''
+        self.simulation.generate_bonus()
+
+    def process_input(self):
+        '''
+        Обработка ввода с клавиатуры. Реагирует на клавиши вверх, вниз, влево и вправо для управления змейкой,
+        а также на событие выхода из игры. Клавиша F3 показывает и скрывает панель профилировщика. Повороты ставятся в очередь и применяются по одному за такт,
+        поэтому быстрые последовательные нажатия не теряются.
+        '''
+        keys = {
+            pygame.K_DOWN: (1, 0),
+            pygame.K_UP: (-1, 0),
+            pygame.K_LEFT: (0, -1),
+            pygame.K_RIGHT: (0, 1),
+        }
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+                self.quit_requested = True
+            if event.type == pygame.VIDEOEXPOSE and self.renderer is not None:
+                self.renderer.needs_full_redraw = True
+            if event.type == pygame.KEYDOWN and event.key in keys:
+                self.queue_direction(keys[event.key])
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler is not None:
+                self.profiler.show_hud = not self.profiler.show_hud
+                if self.renderer is not None:
+                    self.renderer.needs_full_redraw = True
+
+    def queue_direction(self, direction):
+        '''
+        Добавление поворота в очередь ввода. Поворот игнорируется, если он совпадает с последним
+        запланированным направлением, разворачивает змейку назад или очередь уже заполнена.
+
+        Args:
+            direction (tuple): Новое направление движения.
+        '''
+        planned = self.directions[-1] if self.directions else self.snake.direction
+        if direction != planned and direction != (-planned[0], -planned[1]) and len(self.directions) < 3:
+            self.directions.append(direction)
+
+    def update(self):
+        '''
+        Обновление состояния игры, включая перемещение змейки, проверку на столкновение с бонусами и проверку на столкновения.
+        Перед тактом применяется первый поворот из очереди ввода или поворот, выбранный автопилотом.
+        '''
+        if self.autopilot is not None:
+            direction = self.autopilot(self.simulation)
+            if direction is not None:
+                self.snake.change_direction(direction)
+        elif self.directions:
+            self.snake.change_direction(self.directions.popleft())
+        self.simulation.update()
+        if self.renderer is not None:
+            self.renderer.record(self.simulation)
+
+    def check_collision(self):
+        '''
+        Проверка столкновения головы змейки с ее телом или препятствиями на игровом поле.
+
+        Returns:
+            bool: True, если произошло столкновение, иначе False.
+        '''
+        return self.simulation.check_collision()
+
+    def render(self, alpha=1.0):
+        '''
+        Отрисовка всех объектов на игровом поле, включая змейку, бонусы и препятствия.
+        При инкрементальной отрисовке обновляются только клетки, изменившиеся с прошлого кадра,
+        а голова и хвост змейки сдвигаются на долю клетки, пройденную с последнего такта.
+
+        Args:
+            alpha (float, optional): Доля времени, прошедшая с последнего такта, от 0 до 1. По умолчанию 1.0.
+        '''
+        if self.renderer is not None:
+            self.renderer.render(self.simulation, alpha)
+            self.render_hud()
+            return
+
+        self.screen.fill((0, 0, 0))
+
+        for segment in self.snake.get_segments():
+            pygame.draw.rect(self.screen, (255, 255, 255), (segment[1] * self.cell_size, segment[0] * self.cell_size, self.cell_size, self.cell_size))
+
+        pickups = self.simulation.pickups
+        for slot in range(len(pickups)):
+            y, x = pickups.get_position(slot)
+            pygame.draw.rect(self.screen, pickups.get_type(slot).color, (x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size))
+        self.level.render_obstacles(self.screen)
+
+        pygame.display.flip()
+        self.render_hud()
+
+    def render_hud(self):
+        '''
+        Отрисовка панели профилировщика поверх игрового поля, если профилирование включено.
+        Клетки под панелью перерисовываются на следующем кадре.
+        '''
+        if self.profiler is None:
+            return
+        rect = self.profiler.draw_hud(self.screen, self.get_score())
+        if rect is not None:
+            pygame.display.update(rect)
+            if self.renderer is not None:
+                self.renderer.invalidate(rect)
+
+    def get_score(self):
+        '''
+        Получение текущего счета игрока, который равен длине змейки.
+
+        Returns:
+            int: Длина змейки.
+        '''
+        return self.simulation.get_score()
+
+    def run(self):
+        '''
+        Запуск основного игрового цикла, который обрабатывает ввод, обновляет состояние игры и отрисовывает объекты на экране.
+        Игра продвигается тактами фиксированной длины 1 / snake_speed секунд, а ввод и отрисовка
+        выполняются с частотой кадров frame_rate независимо от скорости змейки.
+        Если задан профилировщик, время каждой фазы кадра записывается в него, а при выходе замеры сохраняются.
+        Если задана запись кадров, каждый кадр после отрисовки передается в FrameCapture, а при выходе запись завершается.
+        После окончания игры окно не закрывается, а управление возвращается вызывающему коду.
+
+        Returns:
+            int: Итоговый счет игрока.
+        '''
+        profiler = self.profiler
+        accumulator = 0.0
+        while self.running:
+            if profiler is not None:
+                profiler.begin_frame()
+            self.process_input()
+            if profiler is not None:
+                profiler.mark(INPUT)
+            accumulator = min(accumulator + self.clock.tick(self.frame_rate) / 1000, 0.25)
+            if profiler is not None:
+                profiler.mark(WAIT)
+            ticks = 0
+            while self.running and accumulator >= 1 / self.snake_speed:
+                accumulator -= 1 / self.snake_speed
+                self.update()
+                ticks += 1
+            if profiler is not None:
+                profiler.mark(UPDATE)
+            self.render(min(accumulator * self.snake_speed, 1.0))
+            if self.capture is not None:
+                self.capture.capture(self.screen)
+            if profiler is not None:
+                profiler.mark(RENDER)
+                profiler.end_frame(ticks)
+
+        if profiler is not None:
+            profiler.export()
+        if self.capture is not None:
+            self.capture.close()
+        self.save_highscore()
+        self.save_replay()
+        return self.get_score()
+
+    def save_highscore(self):
+        '''
+        Сохранение текущего рекорда игрока в таблицу рекордов. Игры автопилота в таблицу не попадают.
+        '''
+        if self.autopilot is not None or self.leaderboard is None:
+            return
+        self.leaderboard.add(self.name, self.get_score(), self.difficulty)
+
+    def save_replay(self):
+        '''
+        Сохранение записи игры в каталог replay_dir, чтобы рекорд можно было проверить повтором.
+        Игры на уровне, созданном в памяти (например, генератором), не записываются: их нельзя воспроизвести.
+
+        Returns:
+            str: Путь к файлу записи или None, если запись не сохраняется.
+        '''
+        if self.replay_dir is None or self.simulation.level_file is None:
+            return None
+        os.makedirs(self.replay_dir, exist_ok=True)
+        path = os.path.join(self.replay_dir, f'{int(time.time())}_{self.name}_{self.get_score()}.snr')
+        Replay.from_simulation(self.simulation, self.name).save(path)
+        return path
+
+    def get_next_snake_position(self):
+        '''
+        Вычисление следующей позиции змейки на основе текущего направления ее движения.
+
+        Returns:
+            tuple: Следующая позиция змейки в формате (y, x).
+        '''
+        return self.simulation.get_next_snake_position()
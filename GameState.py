@@ -0,0 +1,367 @@
+from array import array
+from weakref import WeakKeyDictionary
+from Simulation import DIRECTIONS
+
+MASK64 = (1 << 64) - 1
+
+walls_cache = WeakKeyDictionary()
+
+
+def get_walls(level, grid_rows, grid_cols):
+    '''
+    Получение карты препятствий уровня по клеткам поля со скрытыми строкой и столбцом.
+    Карта распаковывается из битовой карты уровня один раз для каждого уровня и не изменяется,
+    поэтому ее разделяют все состояния и автопилоты.
+
+    Args:
+        level (Level): Уровень.
+        grid_rows (int): Количество строк с учетом скрытой строки.
+        grid_cols (int): Количество столбцов с учетом скрытого столбца.
+
+    Returns:
+        bytes: 1 для препятствия и 0 для свободной клетки по номерам клеток y * grid_cols + x.
+    '''
+    walls = walls_cache.get(level)
+    if walls is None or len(walls) != grid_rows * grid_cols:
+        bitmap = bytes(level.bitmap)
+        cells = b''
+        if bitmap:
+            bits = format(int.from_bytes(bitmap, 'big'), f'0{len(bitmap) * 8}b')
+            cells = bits.encode('ascii').translate(bytes.maketrans(b'01', b'\0\1'))
+        grid = bytearray()
+        for y in range(grid_rows):
+            row = cells[y * level.cols:(y + 1) * level.cols] if y < level.rows else b''
+            grid += row[:grid_cols].ljust(grid_cols, b'\0')
+        walls = bytes(grid)
+        walls_cache[level] = walls
+    return walls
+
+
+class GameState:
+    '''
+    Класс GameState представляет компактное состояние одиночной игры "Snake Game" для поиска с просмотром вперед
+    (MCTS, expectimax). В отличие от Game и Simulation оно не содержит объектов pygame и Snake:
+    тело змейки хранится в кольцевых буферах array, занятость клеток в bytearray, а бонусы в словаре по номерам клеток.
+
+    Копирование выполняется за O(1): копия разделяет буферы с оригиналом, и буфер копируется
+    одной операцией memcpy только перед первым изменением (копирование при записи). Метод step
+    запоминает все, что изменил, поэтому undo отменяет ход, рост и эффекты бонусов без копирования.
+
+    Правила совпадают с Simulation, но новые бонусы размещаются собственным генератором случайных чисел
+    на 64-битном целом, а исчезновение и перемещение бонусов не моделируются.
+    '''
+    __slots__ = ('rows', 'cols', 'walls', 'registry', 'max_pickups', 'body_y', 'body_x', 'mask', 'head', 'length',
+                 'occupancy', 'pickups', 'direction', 'snake_speed', 'ticks', 'running', 'death_cause', 'seed',
+                 'shared', 'history')
+
+    @classmethod
+    def from_simulation(cls, simulation, seed=0):
+        '''
+        Создание состояния из текущего состояния симуляции.
+
+        Args:
+            simulation (Simulation): Симуляция.
+            seed (int, optional): Начальное значение генератора случайных чисел для новых бонусов. По умолчанию 0.
+
+        Returns:
+            GameState: Новое состояние.
+        '''
+        state = cls.__new__(cls)
+        state.rows = simulation.height // simulation.cell_size + 1
+        state.cols = simulation.width // simulation.cell_size + 1
+        state.walls = get_walls(simulation.level, state.rows, state.cols)
+        state.registry = simulation.bonus_registry
+        state.max_pickups = simulation.bonus_registry.max_pickups
+
+        segments = simulation.snake.get_segments()
+        capacity = 16
+        while capacity <= len(segments):
+            capacity *= 2
+        state.body_y = array('i', bytes(4 * capacity))
+        state.body_x = array('i', bytes(4 * capacity))
+        state.mask = capacity - 1
+        state.head = len(segments) - 1
+        state.length = len(segments)
+        state.occupancy = bytearray(state.rows * state.cols)
+        for i, (y, x) in enumerate(segments):
+            state.body_y[state.head - i] = y
+            state.body_x[state.head - i] = x
+            state._occupy(y, x, 1)
+
+        pickups = simulation.pickups
+        state.pickups = {pickups.rows[slot] * state.cols + pickups.cols[slot]: pickups.kinds[slot] for slot in range(len(pickups))}
+        state.direction = simulation.snake.direction
+        state.snake_speed = simulation.snake_speed
+        state.ticks = simulation.ticks
+        state.running = simulation.running
+        state.death_cause = simulation.death_cause
+        state.seed = (seed * 6364136223846793005 + 1442695040888963407) & MASK64
+        state.shared = False
+        state.history = []
+        return state
+
+    def clone(self):
+        '''
+        Копирование состояния за O(1). Буферы разделяются до первого изменения в любом из состояний.
+        История ходов у копии пустая, поэтому undo в копии не заходит дальше момента копирования.
+
+        Returns:
+            GameState: Копия состояния.
+        '''
+        state = GameState.__new__(GameState)
+        state.rows, state.cols, state.walls, state.registry, state.max_pickups = self.rows, self.cols, self.walls, self.registry, self.max_pickups
+        state.body_y, state.body_x, state.mask, state.head, state.length = self.body_y, self.body_x, self.mask, self.head, self.length
+        state.occupancy, state.pickups, state.direction, state.snake_speed = self.occupancy, self.pickups, self.direction, self.snake_speed
+        state.ticks, state.running, state.death_cause, state.seed = self.ticks, self.running, self.death_cause, self.seed
+        state.history = []
+        state.shared = self.shared = True
+        return state
+
+    def _own(self):
+        '''
+        Копирование разделяемых буферов перед изменением.
+        '''
+        if self.shared:
+            self.body_y = self.body_y[:]
+            self.body_x = self.body_x[:]
+            self.occupancy = self.occupancy[:]
+            self.pickups = self.pickups.copy()
+            self.shared = False
+
+    def _occupy(self, y, x, delta):
+        '''
+        Изменение счетчика занятости клетки. Сегменты за пределами поля, которые может добавить рост змейки, не учитываются.
+
+        Args:
+            y (int): Строка клетки.
+            x (int): Столбец клетки.
+            delta (int): 1, чтобы занять клетку, или -1, чтобы освободить.
+        '''
+        if 0 <= y < self.rows and 0 <= x < self.cols:
+            self.occupancy[y * self.cols + x] += delta
+
+    def randrange(self, n):
+        '''
+        Случайное целое число от 0 до n - 1 из линейного конгруэнтного генератора. Имя совпадает с Random.randrange,
+        поэтому BonusRegistry.choose выбирает вид бонуса по генератору состояния.
+
+        Args:
+            n (int): Количество вариантов.
+
+        Returns:
+            int: Случайное число.
+        '''
+        self.seed = (self.seed * 6364136223846793005 + 1442695040888963407) & MASK64
+        return ((self.seed >> 32) * n) >> 32
+
+    def get_head(self):
+        '''
+        Получение координат головы змейки.
+
+        Returns:
+            tuple: Координаты головы в формате (y, x).
+        '''
+        return self.body_y[self.head], self.body_x[self.head]
+
+    def get_segments(self):
+        '''
+        Получение сегментов змейки.
+
+        Returns:
+            list: Координаты сегментов от головы к хвосту.
+        '''
+        return [(self.body_y[(self.head - i) & self.mask], self.body_x[(self.head - i) & self.mask]) for i in range(self.length)]
+
+    def get_score(self):
+        '''
+        Получение текущего счета, который равен длине змейки.
+
+        Returns:
+            int: Длина змейки.
+        '''
+        return self.length
+
+    def contains(self, position):
+        '''
+        Проверка, занята ли клетка змейкой.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            bool: True, если клетка занята, иначе False.
+        '''
+        y, x = position
+        return 0 <= y < self.rows and 0 <= x < self.cols and self.occupancy[y * self.cols + x] > 0
+
+    def is_obstacle(self, position):
+        '''
+        Проверка, является ли клетка препятствием.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            bool: True, если клетка является препятствием, иначе False.
+        '''
+        y, x = position
+        return 0 <= y < self.rows and 0 <= x < self.cols and self.walls[y * self.cols + x] != 0
+
+    def get_actions(self):
+        '''
+        Получение допустимых направлений: все, кроме разворота назад.
+
+        Returns:
+            list: Направления движения.
+        '''
+        reverse = (-self.direction[0], -self.direction[1])
+        return [direction for direction in DIRECTIONS if direction != reverse]
+
+    def grow(self):
+        '''
+        Добавление сегмента в конец змейки так же, как в Snake.grow. Вызывается эффектами бонусов.
+        '''
+        if self.length > self.mask:
+            self._resize()
+        tail = (self.head - self.length + 1) & self.mask
+        before = (tail + 1) & self.mask
+        y = 2 * self.body_y[tail] - self.body_y[before]
+        x = 2 * self.body_x[tail] - self.body_x[before]
+        slot = (tail - 1) & self.mask
+        self.body_y[slot] = y
+        self.body_x[slot] = x
+        self.length += 1
+        self._occupy(y, x, 1)
+
+    def _resize(self):
+        '''
+        Увеличение кольцевых буферов тела вдвое.
+        '''
+        segments = self.get_segments()
+        capacity = 2 * (self.mask + 1)
+        self.body_y = array('i', bytes(4 * capacity))
+        self.body_x = array('i', bytes(4 * capacity))
+        self.mask = capacity - 1
+        self.head = len(segments) - 1
+        for i, (y, x) in enumerate(segments):
+            self.body_y[self.head - i] = y
+            self.body_x[self.head - i] = x
+
+    def _shrink(self):
+        '''
+        Удаление последнего сегмента змейки. Используется для отмены роста.
+        '''
+        tail = (self.head - self.length + 1) & self.mask
+        self._occupy(self.body_y[tail], self.body_x[tail], -1)
+        self.length -= 1
+
+    def _sample_free_cell(self):
+        '''
+        Выбор случайной свободной клетки видимой части поля: сначала случайными пробами, затем перебором с случайного места.
+
+        Returns:
+            int: Номер клетки или -1, если свободных клеток нет.
+        '''
+        rows, cols = self.rows - 1, self.cols - 1
+        for _ in range(32):
+            y = self.randrange(rows)
+            x = self.randrange(cols)
+            cell = y * self.cols + x
+            if not self.occupancy[cell] and not self.walls[cell] and cell not in self.pickups:
+                return cell
+        start = self.randrange(rows * cols)
+        for i in range(rows * cols):
+            y, x = divmod((start + i) % (rows * cols), cols)
+            cell = y * self.cols + x
+            if not self.occupancy[cell] and not self.walls[cell] and cell not in self.pickups:
+                return cell
+        return -1
+
+    def step(self, action=None):
+        '''
+        Продвижение состояния на один такт по правилам Simulation. Изменения запоминаются для undo.
+
+        Args:
+            action (tuple, optional): Новое направление движения или None, чтобы сохранить текущее. Разворот назад игнорируется.
+
+        Returns:
+            bool: True, если игра продолжается, иначе False.
+        '''
+        if not self.running:
+            return False
+        self._own()
+        direction = self.direction
+        if action is not None and action != (-direction[0], -direction[1]):
+            self.direction = action
+
+        mask = self.mask
+        tail = (self.head - self.length + 1) & mask
+        old_tail = (self.body_y[tail], self.body_x[tail])
+        self._occupy(old_tail[0], old_tail[1], -1)
+        y = (self.body_y[self.head] + self.direction[0]) % self.rows
+        x = (self.body_x[self.head] + self.direction[1]) % self.cols
+        self.head = (self.head + 1) & mask
+        self.body_y[self.head] = y
+        self.body_x[self.head] = x
+        cell = y * self.cols + x
+        self.occupancy[cell] += 1
+
+        length, snake_speed, seed = self.length, self.snake_speed, self.seed
+        eaten = self.pickups.pop(cell, None)
+        covered = []
+        if eaten is not None:
+            self.registry.types[eaten].apply(self, self)
+            for i in range(length, self.length):
+                slot = (self.head - i) & self.mask
+                segment_y, segment_x = self.body_y[slot], self.body_x[slot]
+                if 0 <= segment_y < self.rows and 0 <= segment_x < self.cols:
+                    segment = segment_y * self.cols + segment_x
+                    if segment in self.pickups:
+                        covered.append((segment, self.pickups.pop(segment)))
+        added = []
+        while len(self.pickups) < self.max_pickups:
+            kind = self.registry.choose(self)
+            free = self._sample_free_cell()
+            if free < 0:
+                break
+            self.pickups[free] = kind
+            added.append(free)
+
+        self.history.append((direction, old_tail, eaten, length, snake_speed, seed, covered, added, self.death_cause))
+        self.ticks += 1
+        if self.occupancy[cell] > 1:
+            self.death_cause = 'self'
+        elif self.walls[cell]:
+            self.death_cause = 'obstacle'
+        self.running = self.death_cause is None
+        return self.running
+
+    def undo(self):
+        '''
+        Отмена последнего хода, сделанного step: движения, роста, эффектов бонусов и появления новых бонусов.
+
+        Raises:
+            IndexError: Если отменять нечего.
+        '''
+        direction, old_tail, eaten, length, snake_speed, seed, covered, added, death_cause = self.history.pop()
+        self._own()
+        for cell in added:
+            del self.pickups[cell]
+        for cell, kind in covered:
+            self.pickups[cell] = kind
+        while self.length > length:
+            self._shrink()
+        y, x = self.body_y[self.head], self.body_x[self.head]
+        if eaten is not None:
+            self.pickups[y * self.cols + x] = eaten
+        self.occupancy[y * self.cols + x] -= 1
+        self.head = (self.head - 1) & self.mask
+        tail = (self.head - self.length + 1) & self.mask
+        self.body_y[tail], self.body_x[tail] = old_tail
+        self._occupy(old_tail[0], old_tail[1], 1)
+        self.direction = direction
+        self.snake_speed = snake_speed
+        self.seed = seed
+        self.death_cause = death_cause
+        self.running = death_cause is None
+        self.ticks -= 1
@@ -0,0 +1,230 @@
+import atexit
+import json
+import os
+import shelve
+import threading
+from bisect import insort
+
+
+class Leaderboard:
+    '''
+    Класс Leaderboard хранит таблицы рекордов игры "Snake Game": общую, по уровням сложности и по игрокам.
+    Таблицы находятся в памяти в отсортированном виде, а новые рекорды дописываются в журнал на диске
+    фоновым потоком, поэтому запись и чтение рекордов не задерживают интерфейс. Когда журнал становится
+    намного больше хранимых записей, он сжимается.
+    '''
+    def __init__(self, path='highscores.log', capacity=10000, flush_interval=1.0, compact_ratio=2.0, legacy_path='highscores.db', read_only=False):
+        '''
+        Инициализация нового объекта Leaderboard и загрузка журнала рекордов.
+
+        Args:
+            path (str, optional): Путь к журналу рекордов. По умолчанию 'highscores.log'.
+            capacity (int, optional): Максимальное количество записей в каждой таблице. По умолчанию 10000.
+            flush_interval (float, optional): Интервал записи новых рекордов на диск в секундах. По умолчанию 1.0.
+            compact_ratio (float, optional): Во сколько раз журнал может превышать количество хранимых записей перед сжатием. По умолчанию 2.0.
+            legacy_path (str, optional): Путь к старой базе shelve, из которой рекорды переносятся при первом запуске. По умолчанию 'highscores.db'.
+            read_only (bool, optional): Только читать журнал: без фонового потока, переноса старой базы, записи и сжатия.
+                Новые рекорды остаются в памяти. По умолчанию False.
+        '''
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.compact_ratio = compact_ratio
+        self.read_only = read_only
+        self.boards = {}
+        self.players = {}
+        self.pending = []
+        self.log_records = 0
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.closed = False
+
+        if os.path.exists(path):
+            self._load()
+        if read_only:
+            self.thread = None
+            self.closed = True
+            return
+        if not os.path.exists(path):
+            self._import_legacy(legacy_path)
+
+        self.thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _load(self):
+        '''
+        Загрузка рекордов из журнала. Оборванная последняя запись пропускается.
+        '''
+        with open(self.path, 'r') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._insert(record['name'], record['score'], record['difficulty'])
+                self.log_records += 1
+
+    def _import_legacy(self, legacy_path):
+        '''
+        Перенос рекордов из старой базы shelve, в которой уровень сложности не хранился.
+
+        Args:
+            legacy_path (str): Путь к старой базе shelve.
+        '''
+        try:
+            with shelve.open(legacy_path, 'r') as db:
+                highscores = db.get('highscores', [])
+        except Exception:
+            return
+        for name, score in highscores:
+            self.add(name, score, None)
+
+    def _insert(self, name, score, difficulty):
+        '''
+        Добавление рекорда в таблицы в памяти.
+
+        Args:
+            name (str): Имя игрока.
+            score (int): Счет игрока.
+            difficulty (str): Уровень сложности или None, если он неизвестен.
+
+        Returns:
+            tuple: Добавленная запись.
+        '''
+        self.sequence += 1
+        entry = (-score, self.sequence, name, difficulty)
+        boards = [self.boards.setdefault(None, [])]
+        if difficulty is not None:
+            boards.append(self.boards.setdefault(difficulty, []))
+        boards.append(self.players.setdefault(name, []))
+        for board in boards:
+            insort(board, entry)
+            if len(board) > self.capacity:
+                board.pop()
+        return entry
+
+    def add(self, name, score, difficulty):
+        '''
+        Добавление нового рекорда. Запись на диск выполняется фоновым потоком, а в режиме только для чтения
+        рекорд хранится только в памяти.
+
+        Args:
+            name (str): Имя игрока.
+            score (int): Счет игрока.
+            difficulty (str): Уровень сложности или None, если он неизвестен.
+        '''
+        with self.lock:
+            self._insert(name, score, difficulty)
+            if not self.read_only:
+                self.pending.append({'name': name, 'score': score, 'difficulty': difficulty})
+
+    def top(self, count=10, difficulty=None):
+        '''
+        Получение лучших рекордов.
+
+        Args:
+            count (int, optional): Количество рекордов. По умолчанию 10.
+            difficulty (str, optional): Уровень сложности или None для общей таблицы. По умолчанию None.
+
+        Returns:
+            list: Список пар (имя, счет), отсортированный по убыванию счета.
+        '''
+        with self.lock:
+            board = self.boards.get(difficulty, [])
+            return [(name, -score) for score, _, name, _ in board[:count]]
+
+    def player_top(self, name, count=10, difficulty=None):
+        '''
+        Получение лучших рекордов игрока.
+
+        Args:
+            name (str): Имя игрока.
+            count (int, optional): Количество рекордов. По умолчанию 10.
+            difficulty (str, optional): Уровень сложности или None для всех уровней. По умолчанию None.
+
+        Returns:
+            list: Список пар (уровень сложности, счет), отсортированный по убыванию счета.
+        '''
+        with self.lock:
+            entries = self.players.get(name, [])
+            if difficulty is not None:
+                entries = [entry for entry in entries if entry[3] == difficulty]
+            return [(entry_difficulty, -score) for score, _, _, entry_difficulty in entries[:count]]
+
+    def flush(self):
+        '''
+        Запись накопленных рекордов в журнал и сжатие журнала при необходимости.
+        '''
+        with self.write_lock:
+            with self.lock:
+                pending, self.pending = self.pending, []
+            if pending:
+                with open(self.path, 'a') as file:
+                    for record in pending:
+                        file.write(json.dumps(record) + '\n')
+                self.log_records += len(pending)
+            if self.log_records > self.compact_ratio * max(self._retained_count(), 1) and self.log_records > 100:
+                self._compact()
+
+    def _retained_entries(self):
+        '''
+        Получение всех записей, которые хранятся хотя бы в одной таблице.
+
+        Returns:
+            list: Записи, отсортированные по порядку добавления.
+        '''
+        entries = set()
+        for board in self.boards.values():
+            entries.update(board)
+        for board in self.players.values():
+            entries.update(board)
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def _retained_count(self):
+        '''
+        Оценка количества хранимых записей сверху.
+
+        Returns:
+            int: Сумма размеров общей таблицы и таблиц игроков.
+        '''
+        with self.lock:
+            return len(self.boards.get(None, [])) + sum(len(board) for board in self.players.values())
+
+    def _compact(self):
+        '''
+        Перезапись журнала так, чтобы в нем остались только записи, хранящиеся в таблицах.
+        '''
+        with self.lock:
+            entries = self._retained_entries()
+            pending = list(self.pending)
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as file:
+            for score, _, name, difficulty in entries:
+                file.write(json.dumps({'name': name, 'score': -score, 'difficulty': difficulty}) + '\n')
+        os.replace(temporary_path, self.path)
+        self.log_records = len(entries)
+        with self.lock:
+            self.pending = self.pending[len(pending):]
+
+    def _flush_loop(self):
+        '''
+        Цикл фонового потока, который периодически записывает новые рекорды на диск.
+        '''
+        while not self.closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def close(self):
+        '''
+        Остановка фонового потока и запись оставшихся рекордов.
+        '''
+        if self.closed:
+            return
+        self.closed = True
+        self.wakeup.set()
+        self.thread.join()
+        self.flush()
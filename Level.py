@@ -1,56 +1,174 @@
-import pygame
-
-class Level:
-    '''
-    Класс Level представляет уровень в игре "Snake Game". Он содержит информацию о препятствиях на игровом поле.
-    '''
-    def __init__(self, width, height, cell_size):
-        '''
-        Инициализация нового объекта Level.
-
-        Args:
-            width (int): Ширина игрового поля.
-            height (int): Высота игрового поля.
-            cell_size (int): Размер ячейки на игровом поле.
-        '''
-        self.width = width
-        self.height = height
-        self.cell_size = cell_size
-        self.obstacles = []
-
-    def generate_obstacles(self, filename):
-        '''
-        Генерация препятствий на основе текстового файла. Символ '#' в файле обозначает препятствие.
-
-        Args:
-            filename (str): Имя текстового файла, из которого загружаются препятствия.
-        '''
-        with open(filename, 'r') as file:
-            lines = file.readlines()
-            for y, line in enumerate(lines):
-                for x, char in enumerate(line):
-                    if char == '#':
-                        obstacle_position = (y, x)
-                        self.obstacles.append(obstacle_position)
-
-    def render_obstacles(self, screen):
-        '''
-        Отрисовка препятствий на игровом поле.
-
-        Args:
-            screen (Surface): Объект Surface из pygame, на котором отрисовываются препятствия.
-        '''
-        for obstacle in self.obstacles:
-            pygame.draw.rect(screen, (128, 128, 128), (obstacle[1] * self.cell_size, obstacle[0] * self.cell_size, self.cell_size, self.cell_size))
-
-    def is_obstacle(self, position):
-        '''
-        Проверка, является ли заданная позиция препятствием.
-
-        Args:
-            position (tuple): Координаты позиции на игровом поле.
-
-        Returns:
-            bool: True, если позиция является препятствием, иначе False.
-        '''
-        return position in self.obstacles
+import json
+import mmap
+import struct
+
+LEVEL_MAGIC = b'SNKL'
+LEVEL_VERSION = 1
+LEVEL_HEADER = struct.Struct('<4sHHIIiiI')
+BIT_OFFSETS = tuple(tuple(bit for bit in range(8) if byte & (0x80 >> bit)) for byte in range(256))
+
+
+class Level:
+    '''
+    Класс Level представляет уровень в игре "Snake Game". Он содержит информацию о препятствиях на игровом поле.
+    Препятствия хранятся в упакованной битовой карте, по одному биту на клетку поля.
+    Уровень загружается из текстового файла или из скомпилированного файла .lvl, который отображается в память.
+    '''
+    def __init__(self, width, height, cell_size):
+        '''
+        Инициализация нового объекта Level.
+
+        Args:
+            width (int): Ширина игрового поля.
+            height (int): Высота игрового поля.
+            cell_size (int): Размер ячейки на игровом поле.
+        '''
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.rows = height // cell_size
+        self.cols = width // cell_size
+        self._obstacles = []
+        self.bitmap = bytearray((self.rows * self.cols + 7) // 8)
+        self.path = None
+        self.spawn = None
+        self.metadata = {}
+
+    @classmethod
+    def from_file(cls, path, width=640, height=480, cell_size=20):
+        '''
+        Загрузка уровня из файла. Файлы .lvl загружаются функцией load, остальные читаются как текст.
+
+        Args:
+            path (str): Путь к файлу уровня.
+            width (int, optional): Ширина игрового поля для текстового уровня. По умолчанию 640.
+            height (int, optional): Высота игрового поля для текстового уровня. По умолчанию 480.
+            cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+
+        Returns:
+            Level: Загруженный уровень.
+        '''
+        if path.endswith('.lvl'):
+            return cls.load(path, cell_size)
+        level = cls(width, height, cell_size)
+        level.generate_obstacles(path)
+        return level
+
+    @classmethod
+    def load(cls, path, cell_size=20):
+        '''
+        Загрузка скомпилированного уровня. Файл отображается в память, поэтому загрузка не зависит
+        от размера карты, а битовая карта читается с диска по мере обращения к ней.
+
+        Args:
+            path (str): Путь к файлу .lvl.
+            cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+
+        Returns:
+            Level: Загруженный уровень.
+        '''
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, rows, cols, spawn_y, spawn_x, metadata_length = LEVEL_HEADER.unpack_from(data)
+        if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+            raise ValueError(f'{path} is not a compiled level')
+
+        level = cls(cols * cell_size, rows * cell_size, cell_size)
+        offset = LEVEL_HEADER.size + metadata_length
+        level.metadata = json.loads(data[LEVEL_HEADER.size:offset])
+        level.bitmap = memoryview(data)[offset:offset + (rows * cols + 7) // 8]
+        level.mmap = data
+        level._obstacles = None
+        level.path = level.metadata.get('source', path)
+        if spawn_y >= 0:
+            level.spawn = (spawn_y, spawn_x)
+        return level
+
+    @property
+    def obstacles(self):
+        '''
+        Список координат всех препятствий. Для скомпилированного уровня он строится из битовой карты при первом обращении.
+        '''
+        if self._obstacles is None:
+            cols = self.cols
+            self._obstacles = [divmod(cell, cols) for cell in self.get_obstacle_cells()]
+        return self._obstacles
+
+    def get_obstacle_cells(self):
+        '''
+        Перебор препятствий по битовой карте без построения списка obstacles.
+
+        Returns:
+            generator: Номера клеток y * cols + x с препятствиями в порядке возрастания.
+        '''
+        size = self.rows * self.cols
+        for i, byte in enumerate(self.bitmap):
+            if byte:
+                base = i * 8
+                for bit in BIT_OFFSETS[byte]:
+                    if base + bit < size:
+                        yield base + bit
+
+    def generate_obstacles(self, filename):
+        '''
+        Генерация препятствий на основе текстового файла. Символ '#' в файле обозначает препятствие,
+        а символ 'S' - начальную позицию змейки. Если символов 'S' несколько, используется первый, как в level_compiler.
+
+        Args:
+            filename (str): Имя текстового файла, из которого загружаются препятствия.
+        '''
+        self.path = filename
+        with open(filename, 'r') as file:
+            lines = file.readlines()
+            for y, line in enumerate(lines):
+                for x, char in enumerate(line):
+                    if char == '#':
+                        obstacle_position = (y, x)
+                        self.add_obstacle(obstacle_position)
+                    elif char == 'S' and self.spawn is None:
+                        self.spawn = (y, x)
+
+    def add_obstacle(self, position):
+        '''
+        Добавление препятствия на игровое поле. Препятствия за пределами поля не попадают в битовую карту.
+        Битовая карта скомпилированного уровня отображена в память только для чтения, поэтому перед первым
+        изменением она копируется в bytearray, а файл .lvl не изменяется.
+
+        Args:
+            position (tuple): Координаты препятствия на игровом поле.
+        '''
+        self.obstacles.append(position)
+        y, x = position
+        if 0 <= y < self.rows and 0 <= x < self.cols:
+            if not isinstance(self.bitmap, bytearray):
+                self.bitmap = bytearray(self.bitmap)
+            index = y * self.cols + x
+            self.bitmap[index >> 3] |= 0x80 >> (index & 7)
+
+    def render_obstacles(self, screen):
+        '''
+        Отрисовка препятствий на игровом поле.
+
+        Args:
+            screen (Surface): Объект Surface из pygame, на котором отрисовываются препятствия.
+        '''
+        import pygame
+
+        for obstacle in self.obstacles:
+            pygame.draw.rect(screen, (128, 128, 128), (obstacle[1] * self.cell_size, obstacle[0] * self.cell_size, self.cell_size, self.cell_size))
+
+    def is_obstacle(self, position):
+        '''
+        Проверка, является ли заданная позиция препятствием.
+
+        Args:
+            position (tuple): Координаты позиции на игровом поле.
+
+        Returns:
+            bool: True, если позиция является препятствием, иначе False.
+        '''
+        y, x = position
+        if 0 <= y < self.rows and 0 <= x < self.cols:
+            index = y * self.cols + x
+            return (self.bitmap[index >> 3] & (0x80 >> (index & 7))) != 0
+        return False
@@ -0,0 +1,102 @@
+import glob
+import os
+from Level import Level
+from Simulation import DIFFICULTIES
+from level_compiler import compile_level
+
+
+class LevelCatalog:
+    '''
+    Класс LevelCatalog находит уровни игры "Snake Game" в каталоге и загружает их по требованию.
+    Текстовые уровни компилируются в формат .lvl в каталоге кэша и перекомпилируются только после
+    изменения исходного файла, а загруженные уровни переиспользуются между раундами.
+    '''
+    def __init__(self, directory='.', cache_directory='.level_cache', width=640, height=480, cell_size=20):
+        '''
+        Инициализация нового объекта LevelCatalog. Каталог не просматривается до первого обращения.
+
+        Args:
+            directory (str, optional): Каталог с уровнями. По умолчанию текущий каталог.
+            cache_directory (str, optional): Каталог для скомпилированных уровней. По умолчанию '.level_cache'.
+            width (int, optional): Минимальная ширина игрового поля. По умолчанию 640.
+            height (int, optional): Минимальная высота игрового поля. По умолчанию 480.
+            cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+        '''
+        self.directory = directory
+        self.cache_directory = cache_directory
+        self.rows = height // cell_size
+        self.cols = width // cell_size
+        self.cell_size = cell_size
+        self.sources = None
+        self.levels = {}
+
+    def get_sources(self):
+        '''
+        Получение файлов уровней каталога. Каталог просматривается один раз при первом вызове.
+
+        Returns:
+            dict: Соответствие имени уровня и пути к его файлу.
+        '''
+        if self.sources is None:
+            self.sources = {}
+            paths = glob.glob(os.path.join(self.directory, 'level*.txt')) + glob.glob(os.path.join(self.directory, '*.lvl'))
+            for path in paths:
+                self.sources[os.path.splitext(os.path.basename(path))[0]] = os.path.normpath(path)
+        return self.sources
+
+    def get_names(self):
+        '''
+        Получение имен всех уровней каталога.
+
+        Returns:
+            list: Отсортированный список имен уровней.
+        '''
+        return sorted(self.get_sources())
+
+    def get(self, name):
+        '''
+        Получение уровня по имени. Уровень загружается при первом обращении и затем берется из кэша.
+
+        Args:
+            name (str): Имя уровня, например 'level1'.
+
+        Returns:
+            Level: Загруженный уровень.
+        '''
+        level = self.levels.get(name)
+        if level is None:
+            path = self.get_sources()[name]
+            if not path.endswith('.lvl'):
+                path = self.compile(name, path)
+            level = Level.load(path, self.cell_size)
+            self.levels[name] = level
+        return level
+
+    def get_for_difficulty(self, difficulty):
+        '''
+        Получение уровня, соответствующего уровню сложности.
+
+        Args:
+            difficulty (str): Уровень сложности: 'Easy', 'Medium' или 'Hard'.
+
+        Returns:
+            Level: Загруженный уровень.
+        '''
+        return self.get(os.path.splitext(DIFFICULTIES[difficulty][1])[0])
+
+    def compile(self, name, source):
+        '''
+        Компиляция текстового уровня в каталог кэша, если скомпилированный файл отсутствует или устарел.
+
+        Args:
+            name (str): Имя уровня.
+            source (str): Путь к текстовому файлу уровня.
+
+        Returns:
+            str: Путь к файлу .lvl.
+        '''
+        os.makedirs(self.cache_directory, exist_ok=True)
+        destination = os.path.join(self.cache_directory, name + '.lvl')
+        if not os.path.exists(destination) or os.path.getmtime(destination) < os.path.getmtime(source):
+            compile_level(source, destination, self.rows, self.cols)
+        return destination
@@ -0,0 +1,344 @@
+import base64
+from collections import deque
+from random import Random
+from FreeCells import FreeCells
+from Level import Level
+from Snake import Snake
+from Simulation import DIFFICULTIES, DIRECTIONS
+from BonusRegistry import BonusRegistry
+from Pickups import Pickups
+
+
+class Player:
+    '''
+    Класс Player представляет игрока в сетевом матче "Snake Game": его змейку, очередь поворотов и скорость.
+    Скорость задается в клетках в секунду, поэтому при фиксированной частоте тактов сервера
+    медленная змейка двигается не на каждом такте.
+    '''
+    def __init__(self, player_id, name, snake_speed):
+        '''
+        Инициализация нового объекта Player.
+
+        Args:
+            player_id (int): Номер игрока в матче.
+            name (str): Имя игрока.
+            snake_speed (int): Скорость змейки в клетках в секунду.
+        '''
+        self.player_id = player_id
+        self.name = name
+        self.snake_speed = snake_speed
+        self.snake = None
+        self.directions = deque()
+        self.progress = 0.0
+
+    @property
+    def alive(self):
+        '''
+        Флаг, показывающий, есть ли у игрока змейка на поле.
+        '''
+        return self.snake is not None
+
+
+class Match:
+    '''
+    Класс Match выполняет один матч с несколькими змейками на общем поле без отображения.
+    Сервер вызывает step с фиксированной частотой, а step возвращает только изменения за такт:
+    новые клетки голов, освобожденные клетки, появившиеся и съеденные бонусы, вход и гибель игроков.
+    Занятость клеток всеми змейками хранится в общем словаре счетчиков, поэтому столкновения
+    проверяются за O(1) на змейку.
+    '''
+    def __init__(self, match_id, difficulty='Easy', seed=None, tick_rate=20, bonus_count=3, level=None, bonuses='bonuses.json'):
+        '''
+        Инициализация нового объекта Match.
+
+        Args:
+            match_id (int): Номер матча.
+            difficulty (str, optional): Уровень сложности, определяющий уровень и начальную скорость змеек. По умолчанию 'Easy'.
+            seed (int, optional): Начальное значение генератора случайных чисел. По умолчанию None.
+            tick_rate (int, optional): Частота тактов сервера в секунду. По умолчанию 20.
+            bonus_count (int, optional): Количество бонусов, одновременно находящихся на поле. По умолчанию 3.
+            level (Level, optional): Уже загруженный уровень. По умолчанию уровень берется по уровню сложности.
+            bonuses (str, optional): Файл с видами бонусов. Количество бонусов на поле задается bonus_count. По умолчанию 'bonuses.json'.
+        '''
+        self.match_id = match_id
+        self.difficulty = difficulty
+        self.tick_rate = tick_rate
+        self.bonus_count = bonus_count
+        self.random = Random(seed)
+        self.snake_speed, level_file = DIFFICULTIES[difficulty]
+        self.level = level if level is not None else Level.from_file(level_file)
+        self.rows = self.level.rows + 1
+        self.cols = self.level.cols + 1
+
+        self.free_cells = FreeCells.from_level(self.level)
+        self.occupied = {}
+        self.bonus_registry = BonusRegistry.load(bonuses)
+        self.pickups = Pickups(self.bonus_registry)
+        self.players = {}
+        self.next_player_id = 1
+        self.ticks = 0
+        self.joined = []
+        self.left = []
+
+    def add_player(self, name):
+        '''
+        Добавление игрока в матч. Змейка сразу размещается на поле, а остальные игроки узнают о ней на следующем такте.
+
+        Args:
+            name (str): Имя игрока.
+
+        Returns:
+            Player: Новый игрок.
+        '''
+        player = Player(self.next_player_id, name, self.snake_speed)
+        self.next_player_id += 1
+        self.players[player.player_id] = player
+        self.spawn(player)
+        return player
+
+    def remove_player(self, player_id):
+        '''
+        Удаление игрока из матча вместе с его змейкой.
+
+        Args:
+            player_id (int): Номер игрока.
+        '''
+        player = self.players.pop(player_id, None)
+        if player is not None and player.alive:
+            self.left.append(player)
+
+    def spawn(self, player):
+        '''
+        Размещение новой змейки игрока в свободной клетке, слева от которой тоже свободно.
+
+        Args:
+            player (Player): Игрок без змейки.
+
+        Returns:
+            bool: True, если змейка размещена, иначе False.
+        '''
+        for _ in range(100):
+            head = self.free_cells.sample(self.random)
+            if head is None:
+                return False
+            tail = (head[0], head[1] - 1)
+            if head in self.occupied or self.pickups.at(head) >= 0 or not self.free_cells.contains(tail) or tail in self.occupied:
+                continue
+            player.snake = Snake(head, (0, 1))
+            player.directions.clear()
+            player.progress = 0.0
+            player.snake_speed = self.snake_speed
+            for segment in player.snake.get_segments():
+                self.occupied[segment] = self.occupied.get(segment, 0) + 1
+                self.free_cells.discard(segment)
+            self.joined.append(player)
+            return True
+        return False
+
+    def turn(self, player_id, direction):
+        '''
+        Добавление поворота в очередь игрока. Повторы и развороты назад отбрасываются, очередь ограничена тремя поворотами.
+
+        Args:
+            player_id (int): Номер игрока.
+            direction (tuple): Новое направление движения.
+        '''
+        player = self.players.get(player_id)
+        if player is None or not player.alive:
+            return
+        planned = player.directions[-1] if player.directions else player.snake.direction
+        if direction != planned and direction != (-planned[0], -planned[1]) and len(player.directions) < 3:
+            player.directions.append(direction)
+
+    def next_position(self, snake):
+        '''
+        Вычисление следующей клетки головы змейки с переходом через край поля, как в Simulation.
+
+        Args:
+            snake (Snake): Змейка.
+
+        Returns:
+            tuple: Координаты клетки в формате (y, x).
+        '''
+        head = snake.get_head()
+        return (head[0] + snake.direction[0]) % self.rows, (head[1] + snake.direction[1]) % self.cols
+
+    def _release(self, position, freed):
+        '''
+        Уменьшение счетчика занятости клетки. Клетка, которую больше никто не занимает, попадает в freed.
+
+        Args:
+            position (tuple): Координаты клетки.
+            freed (list): Список кандидатов в освобожденные клетки.
+        '''
+        count = self.occupied[position] - 1
+        if count:
+            self.occupied[position] = count
+        else:
+            del self.occupied[position]
+            freed.append(position)
+
+    def step(self):
+        '''
+        Продвижение матча на один такт: перемещение змеек, бонусы, столкновения и появление новых змеек.
+        Сначала освобождаются хвосты всех движущихся змеек, а затем продвигаются головы, поэтому результат такта
+        не зависит от порядка игроков.
+
+        Returns:
+            dict: Изменения за такт. Ключ 't' содержит номер такта, остальные ключи присутствуют, только если список не пуст:
+            'h' - новые головы [игрок, y, x], 'g' - сегменты, добавленные при росте [игрок, y, x],
+            'f' - освобожденные клетки [y, x], 'b' - новые бонусы [y, x, вид], 'e' - съеденные и исчезнувшие бонусы [y, x],
+            'j' - вошедшие игроки [игрок, имя, сегменты], 'd' - погибшие и вышедшие игроки.
+        '''
+        self.ticks += 1
+        heads, grown, freed, eaten, deaths = [], [], [], [], []
+
+        removed = []
+        for player in self.left:
+            for segment in player.snake.get_segments():
+                self._release(segment, freed)
+            player.snake = None
+            removed.append(player.player_id)
+        self.left = []
+
+        movers = []
+        for player in self.players.values():
+            if not player.alive:
+                continue
+            player.progress += player.snake_speed / self.tick_rate
+            if player.progress >= 1:
+                player.progress = min(player.progress - 1, 1.0)
+                movers.append(player)
+
+        for player in movers:
+            snake = player.snake
+            if player.directions:
+                snake.change_direction(player.directions.popleft())
+            snake.block_direction = False
+            self._release(snake.segments[-1], freed)
+
+        for player in movers:
+            snake = player.snake
+            head = self.next_position(snake)
+            snake.move(head)
+            self.occupied[head] = self.occupied.get(head, 0) + 1
+            heads.append([player.player_id, head[0], head[1]])
+
+            slot = self.pickups.at(head)
+            if slot >= 0:
+                bonus_type = self.pickups.get_type(slot)
+                self.pickups.remove(slot)
+                eaten.append([head[0], head[1]])
+                length = snake.get_length()
+                bonus_type.apply(snake, player)
+                for index in range(length, snake.get_length()):
+                    tail = snake.segments[index]
+                    self.occupied[tail] = self.occupied.get(tail, 0) + 1
+                    grown.append([player.player_id, tail[0], tail[1]])
+                    covered = self.pickups.at(tail)
+                    if covered >= 0:
+                        self.pickups.remove(covered)
+                        eaten.append([tail[0], tail[1]])
+
+        for player in self.players.values():
+            if player.alive:
+                head = player.snake.get_head()
+                if self.occupied[head] > 1 or self.level.is_obstacle(head):
+                    deaths.append(player)
+        for player in deaths:
+            for segment in player.snake.get_segments():
+                self._release(segment, freed)
+            player.snake = None
+
+        released = []
+        for position in freed:
+            if position not in self.occupied:
+                released.append([position[0], position[1]])
+                if not self.level.is_obstacle(position):
+                    self.free_cells.add(position)
+        for player_id, y, x in heads + grown:
+            if (y, x) in self.occupied:
+                self.free_cells.discard((y, x))
+
+        spawned = self.update_bonuses(eaten)
+        spawned.extend(self.spawn_bonuses())
+        joined = [[player.player_id, player.name, [list(segment) for segment in player.snake.get_segments()]]
+                  for player in self.joined if player.alive]
+        self.joined = []
+
+        delta = {'t': self.ticks}
+        for key, values in (('h', heads), ('g', grown), ('f', released), ('b', spawned), ('e', eaten), ('j', joined)):
+            if values:
+                delta[key] = values
+        removed.extend(player.player_id for player in deaths)
+        if removed:
+            delta['d'] = removed
+        return delta
+
+    def update_bonuses(self, removed):
+        '''
+        Удаление бонусов, время жизни которых истекло, и перемещение подвижных бонусов в соседнюю свободную клетку.
+        Для клиентов перемещение выглядит как исчезновение бонуса и появление в новой клетке.
+
+        Args:
+            removed (list): Список, в который добавляются клетки исчезнувших бонусов [y, x].
+
+        Returns:
+            list: Бонусы в новых клетках в виде [y, x, вид].
+        '''
+        pickups = self.pickups
+        for slot in pickups.pop_expired(self.ticks):
+            y, x = pickups.get_position(slot)
+            removed.append([y, x])
+            pickups.remove(slot)
+        moved = []
+        for slot in pickups.pop_moving(self.ticks):
+            y, x = pickups.get_position(slot)
+            direction = DIRECTIONS[self.random.randrange(len(DIRECTIONS))]
+            position = (y + direction[0], x + direction[1])
+            if self.free_cells.contains(position) and position not in self.occupied and pickups.at(position) < 0:
+                pickups.move(slot, position)
+                removed.append([y, x])
+                moved.append([position[0], position[1], pickups.get_type(slot).name])
+        return moved
+
+    def spawn_bonuses(self):
+        '''
+        Размещение бонусов в свободных клетках, пока их меньше bonus_count.
+
+        Returns:
+            list: Новые бонусы в виде [y, x, вид].
+        '''
+        spawned = []
+        attempts = 0
+        while len(self.pickups) < self.bonus_count and attempts < 100:
+            attempts += 1
+            position = self.free_cells.sample(self.random)
+            if position is None:
+                break
+            if self.pickups.at(position) >= 0 or position in self.occupied:
+                continue
+            kind = self.bonus_registry.choose(self.random)
+            self.pickups.add(kind, position, self.ticks)
+            spawned.append([position[0], position[1], self.bonus_registry.types[kind].name])
+        return spawned
+
+    def snapshot(self):
+        '''
+        Полное состояние матча для только что подключившегося игрока.
+
+        Returns:
+            dict: Размеры поля, препятствия в виде битовой карты base64, змейки и бонусы.
+        '''
+        return {
+            'match': self.match_id,
+            'tick': self.ticks,
+            'tick_rate': self.tick_rate,
+            'rows': self.level.rows,
+            'cols': self.level.cols,
+            'obstacles': base64.b64encode(bytes(self.level.bitmap)).decode('ascii'),
+            'snakes': {str(player.player_id): [list(segment) for segment in player.snake.get_segments()]
+                       for player in self.players.values() if player.alive},
+            'bonuses': [[self.pickups.rows[slot], self.pickups.cols[slot], self.pickups.get_type(slot).name]
+                        for slot in range(len(self.pickups))],
+        }
@@ -0,0 +1,206 @@
+import heapq
+from array import array
+
+
+class Pickup:
+    '''
+    Класс Pickup представляет один бонус на поле для кода, которому нужен отдельный объект: позицию, цвет и вид.
+    Сами бонусы хранятся в Pickups по столбцам, а объекты Pickup создаются только по запросу.
+    '''
+    def __init__(self, position, bonus_type):
+        '''
+        Инициализация нового объекта Pickup.
+
+        Args:
+            position (tuple): Координаты бонуса на игровом поле.
+            bonus_type (BonusType): Вид бонуса.
+        '''
+        self.position = position
+        self.bonus_type = bonus_type
+        self.color = bonus_type.color
+        self.name = bonus_type.name
+
+
+class Pickups:
+    '''
+    Класс Pickups хранит все бонусы на поле в виде структуры массивов: вид, строка, столбец и номер бонуса
+    лежат в отдельных массивах, а словарь по клеткам указывает на индекс бонуса в них. Поэтому проверка клетки
+    под головой змейки занимает O(1) при любом количестве бонусов, а удаление переносит последний бонус на место удаленного.
+    Исчезновение и перемещение бонусов планируются в очередях с приоритетом, и на каждом такте обрабатываются
+    только бонусы, срок которых наступил.
+    '''
+    def __init__(self, registry):
+        '''
+        Инициализация нового пустого объекта Pickups.
+
+        Args:
+            registry (BonusRegistry): Реестр видов бонусов.
+        '''
+        self.registry = registry
+        self.clear()
+
+    def clear(self):
+        '''
+        Удаление всех бонусов.
+        '''
+        self.kinds = array('H')
+        self.rows = array('i')
+        self.cols = array('i')
+        self.ids = array('q')
+        self.cells = {}
+        self.slots = {}
+        self.expirations = []
+        self.moves = []
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind, position, tick=0):
+        '''
+        Добавление бонуса. Бонусы с ограниченным временем жизни и подвижные бонусы ставятся в очереди.
+
+        Args:
+            kind (int): Номер вида бонуса в реестре.
+            position (tuple): Координаты свободной клетки без бонуса.
+            tick (int, optional): Текущий такт игры. По умолчанию 0.
+
+        Returns:
+            int: Номер бонуса.
+        '''
+        pickup_id = self.next_id
+        self.next_id += 1
+        slot = len(self.kinds)
+        self.kinds.append(kind)
+        self.rows.append(position[0])
+        self.cols.append(position[1])
+        self.ids.append(pickup_id)
+        self.cells[position] = slot
+        self.slots[pickup_id] = slot
+        bonus_type = self.registry.types[kind]
+        if bonus_type.lifetime:
+            heapq.heappush(self.expirations, (tick + bonus_type.lifetime, pickup_id))
+        if bonus_type.move_interval:
+            heapq.heappush(self.moves, (tick + bonus_type.move_interval, pickup_id))
+        return pickup_id
+
+    def remove(self, slot):
+        '''
+        Удаление бонуса. На его место переносится последний бонус, поэтому удаление занимает O(1).
+
+        Args:
+            slot (int): Индекс бонуса в массивах.
+        '''
+        del self.cells[self.get_position(slot)]
+        del self.slots[self.ids[slot]]
+        last = len(self.kinds) - 1
+        if slot != last:
+            self.kinds[slot] = self.kinds[last]
+            self.rows[slot] = self.rows[last]
+            self.cols[slot] = self.cols[last]
+            self.ids[slot] = self.ids[last]
+            self.cells[self.get_position(slot)] = slot
+            self.slots[self.ids[slot]] = slot
+        self.kinds.pop()
+        self.rows.pop()
+        self.cols.pop()
+        self.ids.pop()
+
+    def move(self, slot, position):
+        '''
+        Перемещение бонуса в другую клетку.
+
+        Args:
+            slot (int): Индекс бонуса в массивах.
+            position (tuple): Координаты новой клетки без бонуса.
+        '''
+        del self.cells[self.get_position(slot)]
+        self.rows[slot], self.cols[slot] = position
+        self.cells[position] = slot
+
+    def at(self, position):
+        '''
+        Поиск бонуса в клетке.
+
+        Args:
+            position (tuple): Координаты клетки.
+
+        Returns:
+            int: Индекс бонуса в массивах или -1, если в клетке нет бонуса.
+        '''
+        return self.cells.get(position, -1)
+
+    def get_position(self, slot):
+        '''
+        Получение координат бонуса.
+
+        Args:
+            slot (int): Индекс бонуса в массивах.
+
+        Returns:
+            tuple: Координаты бонуса в формате (y, x).
+        '''
+        return self.rows[slot], self.cols[slot]
+
+    def get_type(self, slot):
+        '''
+        Получение вида бонуса.
+
+        Args:
+            slot (int): Индекс бонуса в массивах.
+
+        Returns:
+            BonusType: Вид бонуса.
+        '''
+        return self.registry.types[self.kinds[slot]]
+
+    def get(self, slot):
+        '''
+        Получение бонуса в виде отдельного объекта.
+
+        Args:
+            slot (int): Индекс бонуса в массивах.
+
+        Returns:
+            Pickup: Бонус или None, если бонуса с таким индексом нет.
+        '''
+        if slot < 0 or slot >= len(self.kinds):
+            return None
+        return Pickup(self.get_position(slot), self.get_type(slot))
+
+    def pop_expired(self, tick):
+        '''
+        Получение бонусов, время жизни которых истекло к заданному такту. Бонусы, съеденные раньше, пропускаются.
+
+        Args:
+            tick (int): Текущий такт игры.
+
+        Returns:
+            list: Индексы бонусов в массивах в порядке убывания, чтобы их можно было удалять по очереди.
+        '''
+        expired = []
+        while self.expirations and self.expirations[0][0] <= tick:
+            slot = self.slots.get(heapq.heappop(self.expirations)[1])
+            if slot is not None:
+                expired.append(slot)
+        expired.sort(reverse=True)
+        return expired
+
+    def pop_moving(self, tick):
+        '''
+        Получение бонусов, которые должны переместиться на заданном такте. Следующее перемещение планируется сразу.
+
+        Args:
+            tick (int): Текущий такт игры.
+
+        Returns:
+            list: Индексы бонусов в массивах.
+        '''
+        moving = []
+        while self.moves and self.moves[0][0] <= tick:
+            pickup_id = heapq.heappop(self.moves)[1]
+            slot = self.slots.get(pickup_id)
+            if slot is not None:
+                moving.append(slot)
+                heapq.heappush(self.moves, (tick + self.get_type(slot).move_interval, pickup_id))
+        return moving
@@ -0,0 +1,192 @@
+import pygame
+
+
+class Renderer:
+    '''
+    Класс Renderer выполняет инкрементальную отрисовку игры "Snake Game". Препятствия один раз
+    отрисовываются в кэшированный фон, а на каждом кадре перерисовываются и обновляются на экране
+    только клетки, изменившиеся за такт: голова, хвост и клетки бонусов. Между тактами голова плавно входит
+    в новую клетку, а хвост плавно покидает освобожденную.
+    '''
+    def __init__(self, screen, level, cell_size):
+        '''
+        Инициализация нового объекта Renderer.
+
+        Args:
+            screen (Surface): Объект Surface из pygame, на котором отображается игра.
+            level (Level): Уровень, препятствия которого отрисовываются в фон.
+            cell_size (int): Размер ячейки на игровом поле.
+        '''
+        self.screen = screen
+        self.cell_size = cell_size
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill((0, 0, 0))
+        level.render_obstacles(self.background)
+        self.needs_full_redraw = True
+        self.changed_cells = set()
+        self.interpolated_cells = set()
+        self.head = None
+        self.tail = None
+
+    def cell_rect(self, position):
+        '''
+        Вычисление прямоугольника клетки на экране.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            Rect: Прямоугольник клетки в пикселях.
+        '''
+        return pygame.Rect(position[1] * self.cell_size, position[0] * self.cell_size, self.cell_size, self.cell_size)
+
+    def partial_rect(self, position, neighbour, fraction):
+        '''
+        Вычисление части клетки, примыкающей к соседней клетке.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+            neighbour (tuple): Координаты соседней клетки в формате (y, x).
+            fraction (float): Доля клетки от 0 до 1.
+
+        Returns:
+            Rect: Прямоугольник части клетки или None, если клетки не соседние (змейка перешла через край поля).
+        '''
+        rect = self.cell_rect(position)
+        size = round(self.cell_size * fraction)
+        delta = (neighbour[0] - position[0], neighbour[1] - position[1])
+        if delta == (0, -1):
+            rect.width = size
+        elif delta == (0, 1):
+            rect.left = rect.right - size
+            rect.width = size
+        elif delta == (-1, 0):
+            rect.height = size
+        elif delta == (1, 0):
+            rect.top = rect.bottom - size
+            rect.height = size
+        else:
+            return None
+        return rect
+
+    def invalidate(self, rect):
+        '''
+        Отметка клеток, попадающих в прямоугольник экрана, для перерисовки на следующем кадре.
+        Используется, когда поверх поля нарисовано что-то, чего нет в симуляции.
+
+        Args:
+            rect (Rect): Прямоугольник в пикселях.
+        '''
+        for y in range(max(rect.top, 0) // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+            for x in range(max(rect.left, 0) // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+                self.changed_cells.add((y, x))
+
+    def record(self, simulation):
+        '''
+        Запоминание клеток, изменившихся за последний такт симуляции. Вызывается после каждого такта,
+        поэтому изменения не теряются, если между кадрами прошло несколько тактов.
+
+        Args:
+            simulation (Simulation): Симуляция, выполнившая такт.
+        '''
+        self.changed_cells.update(simulation.filled_cells)
+        self.changed_cells.update(simulation.freed_cells)
+        self.changed_cells.update(simulation.pickup_cells)
+        segments = simulation.snake.get_segments()
+        self.head = (segments[0], segments[1]) if len(segments) > 1 else None
+        self.tail = (simulation.freed_cells[0], segments[-1]) if simulation.freed_cells else None
+
+    def draw_cell(self, simulation, position):
+        '''
+        Отрисовка содержимого клетки: фона, сегмента змейки или бонуса.
+
+        Args:
+            simulation (Simulation): Отрисовываемая симуляция.
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            Rect: Прямоугольник клетки в пикселях.
+        '''
+        rect = self.cell_rect(position)
+        slot = simulation.pickups.at(position)
+        if simulation.snake.contains(position):
+            pygame.draw.rect(self.screen, (255, 255, 255), rect)
+        elif slot >= 0:
+            pygame.draw.rect(self.screen, simulation.pickups.get_type(slot).color, rect)
+        else:
+            self.screen.blit(self.background, rect, rect)
+        return rect
+
+    def draw_interpolation(self, simulation, alpha):
+        '''
+        Отрисовка головы, частично вошедшей в новую клетку, и хвоста, частично покинувшего освобожденную клетку.
+
+        Args:
+            simulation (Simulation): Отрисовываемая симуляция.
+            alpha (float): Доля времени, прошедшая с последнего такта, от 0 до 1.
+
+        Returns:
+            list: Прямоугольники перерисованных клеток.
+        '''
+        self.interpolated_cells = set()
+        if alpha >= 1:
+            return []
+        rects = []
+        if self.head is not None:
+            head, previous = self.head
+            rect = self.partial_rect(head, previous, alpha)
+            if rect is not None:
+                cell = self.cell_rect(head)
+                self.screen.blit(self.background, cell, cell)
+                pygame.draw.rect(self.screen, (255, 255, 255), rect)
+                self.interpolated_cells.add(head)
+                rects.append(cell)
+        if self.tail is not None and simulation.running:
+            tail, new_tail = self.tail
+            rect = self.partial_rect(tail, new_tail, 1 - alpha)
+            if rect is not None and not simulation.snake.contains(tail) and simulation.pickups.at(tail) < 0:
+                pygame.draw.rect(self.screen, (255, 255, 255), rect)
+                self.interpolated_cells.add(tail)
+                rects.append(self.cell_rect(tail))
+        return rects
+
+    def render(self, simulation, alpha=1.0):
+        '''
+        Отрисовка изменений, произошедших в симуляции с прошлого кадра. При первом вызове
+        или после запроса полной перерисовки отрисовывается весь экран.
+
+        Args:
+            simulation (Simulation): Отрисовываемая симуляция.
+            alpha (float, optional): Доля времени, прошедшая с последнего такта, от 0 до 1. По умолчанию 1.0.
+        '''
+        if self.needs_full_redraw:
+            self.render_full(simulation, alpha)
+            return
+
+        cells = self.changed_cells | self.interpolated_cells
+        self.changed_cells = set()
+
+        rects = [self.draw_cell(simulation, cell) for cell in cells]
+        rects.extend(self.draw_interpolation(simulation, alpha))
+        pygame.display.update(rects)
+
+    def render_full(self, simulation, alpha=1.0):
+        '''
+        Полная отрисовка игрового поля: фона с препятствиями, змейки и бонусов.
+
+        Args:
+            simulation (Simulation): Отрисовываемая симуляция.
+            alpha (float, optional): Доля времени, прошедшая с последнего такта, от 0 до 1. По умолчанию 1.0.
+        '''
+        self.screen.blit(self.background, (0, 0))
+        for segment in simulation.snake.get_segments():
+            pygame.draw.rect(self.screen, (255, 255, 255), self.cell_rect(segment))
+
+        pickups = simulation.pickups
+        for slot in range(len(pickups)):
+            pygame.draw.rect(self.screen, pickups.get_type(slot).color, self.cell_rect(pickups.get_position(slot)))
+
+        self.changed_cells = set()
+        self.draw_interpolation(simulation, alpha)
+        pygame.display.flip()
+        self.needs_full_redraw = False
@@ -0,0 +1,256 @@
+import struct
+from Simulation import Simulation, DIRECTIONS
+from BonusRegistry import BonusRegistry
+
+MAGIC = b'SNKR'
+VERSION = 3
+HEADER = struct.Struct('<4sBQII')
+BOARD = struct.Struct('<III')
+
+
+def write_varint(buffer, value):
+    '''
+    Запись неотрицательного целого числа в формате LEB128.
+
+    Args:
+        buffer (bytearray): Буфер, в который дописывается число.
+        value (int): Число.
+    '''
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    '''
+    Чтение неотрицательного целого числа в формате LEB128.
+
+    Args:
+        data (bytes): Данные.
+        offset (int): Смещение начала числа.
+
+    Returns:
+        tuple: Число и смещение следующего байта.
+    '''
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def write_string(buffer, text):
+    '''
+    Запись строки в кодировке UTF-8 с длиной в начале.
+
+    Args:
+        buffer (bytearray): Буфер, в который дописывается строка.
+        text (str): Строка.
+    '''
+    encoded = text.encode('utf-8')
+    write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def read_string(data, offset):
+    '''
+    Чтение строки, записанной функцией write_string.
+
+    Args:
+        data (bytes): Данные.
+        offset (int): Смещение начала строки.
+
+    Returns:
+        tuple: Строка и смещение следующего байта.
+    '''
+    length, offset = read_varint(data, offset)
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+class Replay:
+    '''
+    Класс Replay представляет запись игры "Snake Game": начальное значение генератора случайных чисел,
+    уровень сложности, размеры поля, файл уровня, файл бонусов с хешем его содержимого и направление движения змейки на каждом такте. Направления хранятся
+    сериями одинаковых значений, поэтому запись занимает несколько байт на каждый поворот.
+    Игра воспроизводится без отображения, что позволяет проверять рекорды.
+    '''
+    def __init__(self, seed, difficulty, level_file, directions, name='', score=0, width=640, height=480, cell_size=20,
+                 bonuses='bonuses.json', bonuses_digest=''):
+        '''
+        Инициализация нового объекта Replay.
+
+        Args:
+            seed (int): Начальное значение генератора случайных чисел игры.
+            difficulty (str): Уровень сложности игры.
+            level_file (str): Файл уровня.
+            directions (bytes): Код направления движения (индекс в DIRECTIONS) на каждом такте.
+            name (str, optional): Имя игрока. По умолчанию ''.
+            score (int, optional): Счет, с которым закончилась игра. По умолчанию 0.
+            width (int, optional): Ширина игрового поля. По умолчанию 640.
+            height (int, optional): Высота игрового поля. По умолчанию 480.
+            cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+            bonuses (str, optional): Файл с видами бонусов. По умолчанию 'bonuses.json'.
+            bonuses_digest (str, optional): Хеш SHA-256 файла бонусов или '', если он не записан. По умолчанию ''.
+        '''
+        self.seed = seed
+        self.difficulty = difficulty
+        self.level_file = level_file
+        self.directions = bytes(directions)
+        self.name = name
+        self.score = score
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.bonuses = bonuses
+        self.bonuses_digest = bonuses_digest
+
+    @classmethod
+    def from_simulation(cls, simulation, name=''):
+        '''
+        Создание записи из симуляции, созданной с параметром record=True. Уровень должен быть загружен из файла,
+        иначе игру нельзя воспроизвести.
+
+        Args:
+            simulation (Simulation): Симуляция игры.
+            name (str, optional): Имя игрока. По умолчанию ''.
+
+        Returns:
+            Replay: Запись игры.
+        '''
+        if simulation.level_file is None:
+            raise ValueError('Level loaded from memory cannot be replayed')
+        return cls(
+            simulation.seed, simulation.difficulty, simulation.level_file, simulation.recording, name, simulation.get_score(),
+            simulation.width, simulation.height, simulation.cell_size,
+            simulation.bonus_registry.path, simulation.bonus_registry.digest,
+        )
+
+    def encode(self):
+        '''
+        Кодирование записи в двоичный формат.
+
+        Returns:
+            bytes: Закодированная запись.
+        '''
+        buffer = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.score, len(self.directions)))
+        buffer += BOARD.pack(self.width, self.height, self.cell_size)
+        write_string(buffer, self.difficulty)
+        write_string(buffer, self.level_file)
+        write_string(buffer, self.name)
+        write_string(buffer, self.bonuses)
+        write_string(buffer, self.bonuses_digest)
+
+        i = 0
+        while i < len(self.directions):
+            code = self.directions[i]
+            run = 1
+            while i + run < len(self.directions) and self.directions[i + run] == code:
+                run += 1
+            write_varint(buffer, (run << 2) | code)
+            i += run
+        return bytes(buffer)
+
+    @classmethod
+    def decode(cls, data):
+        '''
+        Декодирование записи из двоичного формата. Записи версии 1 без размеров поля сделаны на поле 640x480,
+        а записи версий 1 и 2 без файла бонусов воспроизводятся с 'bonuses.json' без проверки хеша.
+
+        Args:
+            data (bytes): Закодированная запись.
+
+        Returns:
+            Replay: Запись игры.
+        '''
+        magic, version, seed, score, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or not 1 <= version <= VERSION:
+            raise ValueError('Unsupported replay format')
+        offset = HEADER.size
+        width, height, cell_size = 640, 480, 20
+        if version >= 2:
+            width, height, cell_size = BOARD.unpack_from(data, offset)
+            offset += BOARD.size
+        difficulty, offset = read_string(data, offset)
+        level_file, offset = read_string(data, offset)
+        name, offset = read_string(data, offset)
+        bonuses, bonuses_digest = 'bonuses.json', ''
+        if version >= 3:
+            bonuses, offset = read_string(data, offset)
+            bonuses_digest, offset = read_string(data, offset)
+
+        directions = bytearray()
+        while len(directions) < ticks:
+            value, offset = read_varint(data, offset)
+            directions += bytes((value & 3,)) * (value >> 2)
+        return cls(seed, difficulty, level_file, directions, name, score, width, height, cell_size, bonuses, bonuses_digest)
+
+    def save(self, path):
+        '''
+        Сохранение записи в файл.
+
+        Args:
+            path (str): Путь к файлу.
+        '''
+        with open(path, 'wb') as file:
+            file.write(self.encode())
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Загрузка записи из файла.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            Replay: Запись игры.
+        '''
+        with open(path, 'rb') as file:
+            return cls.decode(file.read())
+
+    def create_simulation(self):
+        '''
+        Создание симуляции в начальном состоянии записанной игры: с тем же полем, уровнем, бонусами и начальным значением.
+
+        Returns:
+            Simulation: Новая симуляция.
+
+        Raises:
+            ValueError: Если файл бонусов изменился после записи игры.
+        '''
+        registry = BonusRegistry.load(self.bonuses)
+        if self.bonuses_digest and registry.digest != self.bonuses_digest:
+            raise ValueError(f'Bonus configuration {self.bonuses} has changed since the game was recorded')
+        return Simulation(
+            self.difficulty, self.width, self.height, self.cell_size, seed=self.seed, level_file=self.level_file,
+            bonuses=self.bonuses,
+        )
+
+    def simulate(self):
+        '''
+        Воспроизведение игры без отображения.
+
+        Returns:
+            Simulation: Симуляция после последнего записанного такта. Если змейка погибла раньше,
+                        воспроизведение останавливается на такте столкновения.
+        '''
+        simulation = self.create_simulation()
+        for code in self.directions:
+            if not simulation.step(DIRECTIONS[code]):
+                break
+        return simulation
+
+    def verify(self):
+        '''
+        Проверка записи: игра воспроизводится до конца, и полученный счет сравнивается с записанным.
+
+        Returns:
+            bool: True, если все такты воспроизведены и счет совпал, иначе False.
+        '''
+        simulation = self.simulate()
+        return simulation.ticks == len(self.directions) and simulation.get_score() == self.score
@@ -0,0 +1,87 @@
+import pygame
+
+
+class Session:
+    '''
+    Класс Session хранит ресурсы, общие для всех раундов игры "Snake Game": окно, шрифты,
+    каталог скомпилированных уровней и таблицу рекордов. Окно создается один раз, а остальные
+    ресурсы загружаются при первом обращении, поэтому окно открывается сразу, а новый раунд
+    начинается без повторной инициализации pygame и чтения файлов.
+    '''
+    def __init__(self, width=640, height=480, caption='Snake Game'):
+        '''
+        Инициализация нового объекта Session и создание окна.
+
+        Args:
+            width (int, optional): Ширина окна. По умолчанию 640.
+            height (int, optional): Высота окна. По умолчанию 480.
+            caption (str, optional): Заголовок окна. По умолчанию 'Snake Game'.
+        '''
+        pygame.init()
+        self.screen = pygame.display.set_mode((width, height))
+        pygame.display.set_caption(caption)
+        self.fonts = {}
+        self._leaderboard = None
+        self._catalog = None
+
+    @property
+    def leaderboard(self):
+        '''
+        Таблица рекордов. Загружается при первом обращении.
+        '''
+        if self._leaderboard is None:
+            from Leaderboard import Leaderboard
+            self._leaderboard = Leaderboard()
+        return self._leaderboard
+
+    @property
+    def catalog(self):
+        '''
+        Каталог уровней. Создается при первом обращении, а уровни загружаются по мере использования.
+        '''
+        if self._catalog is None:
+            from LevelCatalog import LevelCatalog
+            self._catalog = LevelCatalog()
+        return self._catalog
+
+    def get_font(self, size):
+        '''
+        Получение шрифта по умолчанию заданного размера. Каждый размер загружается один раз.
+
+        Args:
+            size (int): Размер шрифта.
+
+        Returns:
+            Font: Шрифт pygame.
+        '''
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def play(self, name, difficulty='Easy', **options):
+        '''
+        Проведение одного раунда в окне сессии. Управление возвращается сразу после окончания игры.
+
+        Args:
+            name (str): Имя игрока.
+            difficulty (str, optional): Уровень сложности. По умолчанию 'Easy'.
+            **options: Дополнительные аргументы Game, например autopilot или replay_dir.
+
+        Returns:
+            Game: Завершенная игра.
+        '''
+        from Game import Game
+
+        game = Game(name, difficulty, leaderboard=self.leaderboard, catalog=self.catalog, screen=self.screen, **options)
+        game.run()
+        return game
+
+    def close(self):
+        '''
+        Сохранение рекордов и закрытие окна.
+        '''
+        if self._leaderboard is not None:
+            self._leaderboard.close()
+        pygame.quit()
@@ -0,0 +1,235 @@
+from random import Random
+from Snake import Snake
+from Level import Level
+from FreeCells import FreeCells
+from BonusRegistry import BonusRegistry
+from Pickups import Pickups
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+DIFFICULTIES = {
+    'Easy': (5, 'level1.txt'),
+    'Medium': (10, 'level2.txt'),
+    'Hard': (15, 'level3.txt'),
+}
+
+
+class Simulation:
+    '''
+    Класс Simulation представляет игровую логику "Snake Game" без отображения и без таймера.
+    Он отвечает за движение змейки, переход через края поля, бонусы и столкновения, а игра продвигается
+    вызовами step(), поэтому симуляцию можно прогонять с любой скоростью, в том числе на серверах без дисплея.
+    Виды бонусов и их количество на поле задаются в реестре BonusRegistry, а сами бонусы хранятся в Pickups.
+    '''
+    def __init__(self, difficulty='Easy', width=640, height=480, cell_size=20, seed=None, level_file=None, record=False, level=None, bonuses='bonuses.json'):
+        '''
+        Инициализация новой симуляции.
+
+        Args:
+            difficulty (str, optional): Уровень сложности игры. Может быть 'Easy', 'Medium' или 'Hard'. По умолчанию 'Easy'.
+            width (int, optional): Ширина игрового поля. По умолчанию 640.
+            height (int, optional): Высота игрового поля. По умолчанию 480.
+            cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+            seed (int, optional): Начальное значение генератора случайных чисел. По умолчанию None.
+            level_file (str, optional): Файл уровня вместо файла, соответствующего уровню сложности. По умолчанию None.
+            record (bool, optional): Записывать направление движения на каждом такте для повтора игры. По умолчанию False.
+            level (Level, optional): Уже загруженный уровень. Размеры поля в этом случае берутся из уровня. По умолчанию None.
+            bonuses (str, optional): Файл с видами бонусов. По умолчанию 'bonuses.json'.
+        '''
+        self.difficulty = difficulty
+        self.width, self.height = width, height
+        self.cell_size = cell_size
+        self.seed = seed
+        self.random = Random(seed)
+        self.recording = bytearray() if record else None
+
+        self.snake_speed, difficulty_level_file = DIFFICULTIES[self.difficulty]
+        if level is None:
+            level = Level.from_file(level_file or difficulty_level_file, self.width, self.height, self.cell_size)
+        self.level = level
+        self.level_file = level.path
+        self.width, self.height = level.width, level.height
+
+        spawn = level.spawn or (self.height // 2 // self.cell_size, self.width // 4 // self.cell_size)
+        self.snake = Snake(spawn, (0, 1))
+        self.running = True
+        self.ticks = 0
+        self.death_cause = None
+        self.filled_cells = []
+        self.freed_cells = []
+        self.pickup_cells = []
+        self.bonus_registry = BonusRegistry.load(bonuses)
+        self.pickups = Pickups(self.bonus_registry)
+
+        self.free_cells = FreeCells.from_level(self.level)
+        for segment in self.snake.get_segments():
+            self.free_cells.discard(segment)
+        self.fill_bonuses()
+
+    @property
+    def bonus(self):
+        '''
+        Первый бонус на поле в виде объекта Pickup или None, если бонусов нет.
+        '''
+        return self.pickups.get(0)
+
+    def generate_bonus(self):
+        '''
+        Генерация бонуса случайного вида с учетом весов в случайной свободной клетке игрового поля.
+        Если свободных клеток не осталось или в выбранной клетке уже есть бонус, бонус не создается.
+
+        Returns:
+            bool: True, если бонус создан, иначе False.
+        '''
+        kind = self.bonus_registry.choose(self.random)
+        position = self.free_cells.sample(self.random)
+        if position is None or self.pickups.at(position) >= 0:
+            return False
+        self.pickups.add(kind, position, self.ticks)
+        self.pickup_cells.append(position)
+        return True
+
+    def fill_bonuses(self):
+        '''
+        Генерация бонусов, пока их на поле меньше максимального количества из реестра. Если в выбранной клетке
+        уже есть бонус, клетка выбирается заново, пока остаются свободные клетки без бонусов.
+        '''
+        pickups = self.pickups
+        vacant = self.free_cells.get_count() - sum(
+            1 for slot in range(len(pickups)) if self.free_cells.contains(pickups.get_position(slot))
+        )
+        while len(pickups) < self.bonus_registry.max_pickups and vacant > 0:
+            if self.generate_bonus():
+                vacant -= 1
+
+    def update_bonuses(self):
+        '''
+        Удаление бонусов, время жизни которых истекло, и перемещение подвижных бонусов в случайную соседнюю свободную клетку.
+        '''
+        pickups = self.pickups
+        for slot in pickups.pop_expired(self.ticks):
+            self.pickup_cells.append(pickups.get_position(slot))
+            pickups.remove(slot)
+        for slot in pickups.pop_moving(self.ticks):
+            y, x = pickups.get_position(slot)
+            direction = DIRECTIONS[self.random.randrange(len(DIRECTIONS))]
+            position = (y + direction[0], x + direction[1])
+            if self.free_cells.contains(position) and pickups.at(position) < 0:
+                pickups.move(slot, position)
+                self.pickup_cells.append((y, x))
+                self.pickup_cells.append(position)
+
+    def step(self, action=None):
+        '''
+        Продвигает игру на один такт.
+
+        Args:
+            action (tuple, optional): Новое направление движения змейки или None, чтобы сохранить текущее.
+
+        Returns:
+            bool: True, если игра продолжается, иначе False.
+        '''
+        if not self.running:
+            return False
+        if action is not None:
+            self.snake.change_direction(action)
+        self.update()
+        return self.running
+
+    def update(self):
+        '''
+        Обновление состояния игры, включая перемещение змейки и бонусов, проверку на столкновение с бонусами и проверку на столкновения.
+        Клетки, которые змейка заняла и освободила за этот такт, сохраняются в filled_cells и freed_cells,
+        а клетки, в которых появились, исчезли или переместились бонусы, в pickup_cells.
+        '''
+        self.ticks += 1
+        tail = self.snake.segments[-1]
+        self.snake.move(next_position=self.get_next_snake_position())
+        if self.recording is not None:
+            self.recording.append(DIRECTION_CODES[self.snake.direction])
+        head = self.snake.get_head()
+        self.filled_cells = [head]
+        self.freed_cells = []
+        if not self.snake.contains(tail):
+            self.freed_cells.append(tail)
+            if not self.level.is_obstacle(tail):
+                self.free_cells.add(tail)
+        self.free_cells.discard(head)
+
+        self.pickup_cells = []
+        self.update_bonuses()
+        slot = self.pickups.at(head)
+        if slot >= 0:
+            bonus_type = self.pickups.get_type(slot)
+            self.pickups.remove(slot)
+            self.pickup_cells.append(head)
+            length = self.snake.get_length()
+            bonus_type.apply(self.snake, self)
+            for index in range(length, self.snake.get_length()):
+                segment = self.snake.segments[index]
+                self.filled_cells.append(segment)
+                self.free_cells.discard(segment)
+                covered = self.pickups.at(segment)
+                if covered >= 0:
+                    self.pickups.remove(covered)
+                    self.pickup_cells.append(segment)
+        self.fill_bonuses()
+
+        self.death_cause = self.get_collision()
+        if self.death_cause is not None:
+            self.running = False
+
+    def get_collision(self):
+        '''
+        Определение причины столкновения головы змейки.
+
+        Returns:
+            str: 'self' при столкновении с телом, 'obstacle' при столкновении с препятствием или None.
+        '''
+        if self.snake.is_collision():
+            return 'self'
+        if self.level.is_obstacle(self.snake.get_head()):
+            return 'obstacle'
+        return None
+
+    def check_collision(self):
+        '''
+        Проверка столкновения головы змейки с ее телом или препятствиями на игровом поле.
+
+        Returns:
+            bool: True, если произошло столкновение, иначе False.
+        '''
+        return self.get_collision() is not None
+
+    def get_score(self):
+        '''
+        Получение текущего счета игрока, который равен длине змейки.
+
+        Returns:
+            int: Длина змейки.
+        '''
+        return self.snake.get_length()
+
+    def get_next_snake_position(self):
+        '''
+        Вычисление следующей позиции змейки на основе текущего направления ее движения.
+
+        Returns:
+            tuple: Следующая позиция змейки в формате (y, x).
+        '''
+        self.snake.block_direction = False
+        next_y = self.snake.segments[0][0] + self.snake.direction[0]
+        next_x = self.snake.segments[0][1] + self.snake.direction[1]
+        if next_y > self.height // self.cell_size:
+            next_y = 0
+        elif next_y < 0:
+            next_y = self.height // self.cell_size
+
+        if next_x > self.width // self.cell_size:
+            next_x = 0
+        elif next_x < 0:
+            next_x = self.width // self.cell_size
+
+        next_position = (next_y, next_x)
+        return next_position
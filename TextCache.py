@@ -0,0 +1,36 @@
+class TextCache:
+    '''
+    Класс TextCache хранит уже отрисованные строки текста, чтобы не вызывать font.render
+    для одной и той же строки на каждом кадре.
+    '''
+    def __init__(self, font, capacity=256):
+        '''
+        Инициализация нового объекта TextCache.
+
+        Args:
+            font (Font): Шрифт pygame, которым отрисовывается текст.
+            capacity (int, optional): Максимальное количество хранимых строк. По умолчанию 256.
+        '''
+        self.font = font
+        self.capacity = capacity
+        self.surfaces = {}
+
+    def render(self, text, color):
+        '''
+        Получение отрисованной строки текста.
+
+        Args:
+            text (str): Текст.
+            color (tuple): Цвет текста.
+
+        Returns:
+            Surface: Объект Surface с отрисованным текстом.
+        '''
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.capacity:
+                self.surfaces.clear()
+            surface = self.font.render(text, True, color)
+            self.surfaces[key] = surface
+        return surface
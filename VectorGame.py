@@ -0,0 +1,220 @@
+import numpy as np
+from Level import Level
+from Simulation import DIFFICULTIES, DIRECTIONS as SIMULATION_DIRECTIONS
+
+DIRECTIONS = np.array(SIMULATION_DIRECTIONS, dtype=np.int16)
+DEATH_CAUSES = (None, 'self', 'obstacle')
+
+
+class VectorGame:
+    '''
+    Класс VectorGame одновременно продвигает множество независимых игр "Snake Game" без отображения.
+    Поля, змейки, направления и бонусы всех игр хранятся в массивах NumPy, поэтому каждый такт
+    выполняется пакетными операциями над массивами. Правила совпадают с Simulation: переход через
+    края поля, препятствия уровня, столкновение с собой, рост от яблока и ускорение от банана.
+    Завершившиеся игры автоматически начинаются заново.
+
+    Направления кодируются числами: 0 - вверх, 1 - вниз, 2 - влево, 3 - вправо.
+    Бонусы кодируются числами: 0 - яблоко, 1 - банан, -1 - бонуса нет.
+    '''
+    def __init__(self, num_envs, difficulty='Easy', width=640, height=480, cell_size=20, seed=None):
+        '''
+        Инициализация нового объекта VectorGame.
+
+        Args:
+            num_envs (int): Количество одновременно идущих игр.
+            difficulty (str, optional): Уровень сложности игры. Может быть 'Easy', 'Medium' или 'Hard'. По умолчанию 'Easy'.
+            width (int, optional): Ширина игрового поля. По умолчанию 640.
+            height (int, optional): Высота игрового поля. По умолчанию 480.
+            cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+            seed (int, optional): Начальное значение, из которого выводятся генераторы случайных чисел каждой игры. По умолчанию None.
+        '''
+        self.num_envs = num_envs
+        self.difficulty = difficulty
+        self.rows = height // cell_size
+        self.cols = width // cell_size
+        # Змейка может заходить в строку rows и столбец cols, как и в Simulation.get_next_snake_position.
+        self.grid_height = self.rows + 1
+        self.grid_width = self.cols + 1
+
+        self.base_speed, level_file = DIFFICULTIES[difficulty]
+        level = Level(width, height, cell_size)
+        level.generate_obstacles(level_file)
+        self.obstacles = np.zeros((self.grid_height, self.grid_width), dtype=bool)
+        for y, x in level.obstacles:
+            if level.is_obstacle((y, x)):
+                self.obstacles[y, x] = True
+        self.spawn_cells = ~self.obstacles[:self.rows, :self.cols].reshape(-1)
+
+        capacity = self.grid_height * self.grid_width + 2
+        self.body_y = np.zeros((num_envs, capacity), dtype=np.int16)
+        self.body_x = np.zeros((num_envs, capacity), dtype=np.int16)
+        self.head_index = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int8)
+        self.occupancy = np.zeros((num_envs, self.grid_height, self.grid_width), dtype=np.int16)
+        self.bonus_y = np.zeros(num_envs, dtype=np.int16)
+        self.bonus_x = np.zeros(num_envs, dtype=np.int16)
+        self.bonus_kind = np.full(num_envs, -1, dtype=np.int8)
+        self.speed = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.death_cause = np.zeros(num_envs, dtype=np.int8)
+
+        self.seed(seed)
+        self.reset()
+
+    def seed(self, seed=None):
+        '''
+        Создание независимых генераторов случайных чисел для всех игр.
+
+        Args:
+            seed (int, optional): Начальное значение. Одинаковое значение дает одинаковые последовательности игр. По умолчанию None.
+        '''
+        children = np.random.SeedSequence(seed).spawn(self.num_envs)
+        self.generators = [np.random.default_rng(child) for child in children]
+
+    def reset(self, envs=None):
+        '''
+        Начало новых игр в заданных окружениях.
+
+        Args:
+            envs (ndarray, optional): Номера окружений, которые нужно сбросить. По умолчанию сбрасываются все.
+        '''
+        if envs is None:
+            envs = np.arange(self.num_envs)
+        if len(envs) == 0:
+            return
+        head_y, head_x = self.rows // 2, self.cols // 4
+
+        self.occupancy[envs] = 0
+        self.body_y[envs, 0] = head_y
+        self.body_x[envs, 0] = head_x - 1
+        self.body_y[envs, 1] = head_y
+        self.body_x[envs, 1] = head_x
+        self.occupancy[envs, head_y, head_x - 1] += 1
+        self.occupancy[envs, head_y, head_x] += 1
+        self.head_index[envs] = 1
+        self.length[envs] = 2
+        self.direction[envs] = 3
+        self.speed[envs] = self.base_speed
+        self.ticks[envs] = 0
+        self.death_cause[envs] = 0
+        self._spawn_bonus(envs)
+
+    def _spawn_bonus(self, envs):
+        '''
+        Размещение нового бонуса в случайной свободной клетке для заданных окружений.
+        Если поле заполнено, бонус не создается.
+
+        Args:
+            envs (ndarray): Номера окружений.
+        '''
+        if len(envs) == 0:
+            return
+        draws = np.array([self.generators[env].random(2) for env in envs])
+        free = (self.occupancy[envs, :self.rows, :self.cols].reshape(len(envs), -1) == 0) & self.spawn_cells
+        counts = free.sum(axis=1)
+        picks = np.minimum((draws[:, 1] * counts).astype(np.int64), np.maximum(counts - 1, 0))
+        cells = np.argmax(np.cumsum(free, axis=1) > picks[:, None], axis=1)
+
+        self.bonus_y[envs] = cells // self.cols
+        self.bonus_x[envs] = cells % self.cols
+        self.bonus_kind[envs] = np.where(counts > 0, (draws[:, 0] * 2).astype(np.int8), -1)
+
+    def step(self, actions=None):
+        '''
+        Продвижение всех игр на один такт.
+
+        Args:
+            actions (ndarray, optional): Новое направление для каждой игры или -1, чтобы сохранить текущее. По умолчанию направления не меняются.
+
+        Returns:
+            tuple: Массив длин змеек (счетов) после такта и массив флагов завершившихся игр.
+                   Завершившиеся игры сразу начинаются заново, а причина их завершения сохраняется в death_cause.
+        '''
+        envs = np.arange(self.num_envs)
+        capacity = self.body_y.shape[1]
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions >= 0) & (actions != (self.direction ^ 1))
+            self.direction = np.where(turn, actions, self.direction).astype(np.int8)
+
+        head_y = self.body_y[envs, self.head_index]
+        head_x = self.body_x[envs, self.head_index]
+        next_y = (head_y + DIRECTIONS[self.direction, 0]) % self.grid_height
+        next_x = (head_x + DIRECTIONS[self.direction, 1]) % self.grid_width
+
+        tail_index = (self.head_index - self.length + 1) % capacity
+        self._release(envs, tail_index)
+        self.head_index = (self.head_index + 1) % capacity
+        self.body_y[envs, self.head_index] = next_y
+        self.body_x[envs, self.head_index] = next_x
+        self.occupancy[envs, next_y, next_x] += 1
+
+        ate = (self.bonus_kind >= 0) & (next_y == self.bonus_y) & (next_x == self.bonus_x)
+        grow = np.flatnonzero(ate & (self.bonus_kind == 0))
+        if len(grow):
+            self._grow(grow)
+        self.speed += ate & (self.bonus_kind == 1)
+        self._spawn_bonus(np.flatnonzero(ate | (self.bonus_kind < 0)))
+
+        self.ticks += 1
+        hit_self = self.occupancy[envs, next_y, next_x] > 1
+        hit_obstacle = self.obstacles[next_y, next_x]
+        self.death_cause = np.where(hit_self, 1, np.where(hit_obstacle, 2, 0)).astype(np.int8)
+        dones = self.death_cause > 0
+        scores = self.length.copy()
+
+        finished = np.flatnonzero(dones)
+        causes = self.death_cause[finished]
+        self.reset(finished)
+        self.death_cause[finished] = causes
+        return scores, dones
+
+    def _release(self, envs, index):
+        '''
+        Удаление сегментов змеек из карты занятости.
+
+        Args:
+            envs (ndarray): Номера окружений.
+            index (ndarray): Индексы сегментов в кольцевом буфере тела.
+        '''
+        y = self.body_y[envs, index]
+        x = self.body_x[envs, index]
+        inside = (y >= 0) & (y < self.grid_height) & (x >= 0) & (x < self.grid_width)
+        self.occupancy[envs[inside], y[inside], x[inside]] -= 1
+
+    def _grow(self, envs):
+        '''
+        Увеличение змеек на один сегмент в конце, как в Snake.grow.
+
+        Args:
+            envs (ndarray): Номера окружений, змейки которых растут.
+        '''
+        capacity = self.body_y.shape[1]
+        last = (self.head_index[envs] - self.length[envs] + 1) % capacity
+        second_last = (last + 1) % capacity
+        new_y = 2 * self.body_y[envs, last] - self.body_y[envs, second_last]
+        new_x = 2 * self.body_x[envs, last] - self.body_x[envs, second_last]
+
+        self.length[envs] += 1
+        new_index = (last - 1) % capacity
+        self.body_y[envs, new_index] = new_y
+        self.body_x[envs, new_index] = new_x
+        inside = (new_y >= 0) & (new_y < self.grid_height) & (new_x >= 0) & (new_x < self.grid_width)
+        self.occupancy[envs[inside], new_y[inside], new_x[inside]] += 1
+
+    def observe(self):
+        '''
+        Получение изображений всех игровых полей.
+
+        Returns:
+            ndarray: Массив формы (num_envs, rows + 1, cols + 1), где 0 - пустая клетка, 1 - препятствие,
+                     2 - тело змейки, 3 - голова змейки, 4 - яблоко, 5 - банан.
+        '''
+        envs = np.arange(self.num_envs)
+        boards = np.where(self.occupancy > 0, 2, self.obstacles.astype(np.int8)).astype(np.int8)
+        has_bonus = np.flatnonzero(self.bonus_kind >= 0)
+        boards[has_bonus, self.bonus_y[has_bonus], self.bonus_x[has_bonus]] = 4 + self.bonus_kind[has_bonus]
+        boards[envs, self.body_y[envs, self.head_index], self.body_x[envs, self.head_index]] = 3
+        return boards
@@ -0,0 +1,183 @@
+import pygame
+from collections import OrderedDict
+from Renderer import Renderer
+
+
+class Viewport(Renderer):
+    '''
+    Класс Viewport отрисовывает игровое поле, которое больше окна. Камера следует за головой змейки,
+    а поле разбито на квадратные блоки клеток, препятствия каждого из которых один раз отрисовываются
+    в отдельную поверхность. На кадре рисуются только блоки, змейка и бонус, попадающие в окно,
+    поэтому время кадра зависит от размера окна, а не от размера поля.
+    '''
+    def __init__(self, screen, level, cell_size, chunk_size=16, cache_capacity=64):
+        '''
+        Инициализация нового объекта Viewport.
+
+        Args:
+            screen (Surface): Объект Surface из pygame, на котором отображается игра.
+            level (Level): Уровень, препятствия которого отрисовываются в блоки.
+            cell_size (int): Размер ячейки на игровом поле.
+            chunk_size (int, optional): Размер блока в клетках. По умолчанию 16.
+            cache_capacity (int, optional): Максимальное количество блоков в кэше. По умолчанию 64.
+        '''
+        self.screen = screen
+        self.level = level
+        self.cell_size = cell_size
+        self.chunk_size = chunk_size
+        self.cache_capacity = cache_capacity
+        self.chunks = OrderedDict()
+        self.camera = (0, 0)
+        self.needs_full_redraw = True
+        self.head = None
+        self.tail = None
+
+    def invalidate(self, rect):
+        '''
+        Окно перерисовывается целиком на каждом кадре, поэтому отмечать клетки не нужно.
+
+        Args:
+            rect (Rect): Прямоугольник в пикселях.
+        '''
+
+    def record(self, simulation):
+        '''
+        Запоминание головы и хвоста змейки после такта симуляции для плавного движения между тактами.
+
+        Args:
+            simulation (Simulation): Симуляция, выполнившая такт.
+        '''
+        segments = simulation.snake.get_segments()
+        self.head = (segments[0], segments[1]) if len(segments) > 1 else None
+        self.tail = (simulation.freed_cells[0], segments[-1]) if simulation.freed_cells else None
+
+    def cell_rect(self, position):
+        '''
+        Вычисление прямоугольника клетки на экране с учетом положения камеры.
+
+        Args:
+            position (tuple): Координаты клетки в формате (y, x).
+
+        Returns:
+            Rect: Прямоугольник клетки в пикселях экрана.
+        '''
+        return pygame.Rect(position[1] * self.cell_size - self.camera[0], position[0] * self.cell_size - self.camera[1], self.cell_size, self.cell_size)
+
+    def get_chunk(self, chunk):
+        '''
+        Получение поверхности блока с препятствиями. Блок отрисовывается при первом обращении,
+        а при переполнении кэша вытесняется блок, который дольше всех не попадал в окно.
+
+        Args:
+            chunk (tuple): Координаты блока в формате (y, x).
+
+        Returns:
+            Surface: Поверхность блока или None, если в блоке нет препятствий.
+        '''
+        if chunk in self.chunks:
+            self.chunks.move_to_end(chunk)
+            return self.chunks[chunk]
+
+        size = self.chunk_size
+        surface = None
+        for y in range(chunk[0] * size, min((chunk[0] + 1) * size, self.level.rows)):
+            for x in range(chunk[1] * size, min((chunk[1] + 1) * size, self.level.cols)):
+                if self.level.is_obstacle((y, x)):
+                    if surface is None:
+                        surface = pygame.Surface((size * self.cell_size, size * self.cell_size))
+                        surface.fill((0, 0, 0))
+                    rect = ((x - chunk[1] * size) * self.cell_size, (y - chunk[0] * size) * self.cell_size, self.cell_size, self.cell_size)
+                    pygame.draw.rect(surface, (128, 128, 128), rect)
+
+        self.chunks[chunk] = surface
+        if len(self.chunks) > self.cache_capacity:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def update_camera(self, alpha):
+        '''
+        Перемещение камеры так, чтобы голова змейки с учетом доли пройденной клетки оказалась в центре окна.
+        Камера не выходит за границы игрового поля.
+
+        Args:
+            alpha (float): Доля времени, прошедшая с последнего такта, от 0 до 1.
+        '''
+        if self.head is None:
+            return
+        head, previous = self.head
+        y, x = head
+        if alpha < 1 and abs(head[0] - previous[0]) + abs(head[1] - previous[1]) == 1:
+            y = previous[0] + (head[0] - previous[0]) * alpha
+            x = previous[1] + (head[1] - previous[1]) * alpha
+
+        width, height = self.screen.get_size()
+        left = round((x + 0.5) * self.cell_size - width / 2)
+        top = round((y + 0.5) * self.cell_size - height / 2)
+        left = max(0, min(left, self.level.cols * self.cell_size - width))
+        top = max(0, min(top, self.level.rows * self.cell_size - height))
+        self.camera = (left, top)
+
+    def visible_cells(self):
+        '''
+        Вычисление диапазона клеток, попадающих в окно.
+
+        Returns:
+            tuple: Первая и последняя видимые строки и первый и последний видимые столбцы.
+        '''
+        width, height = self.screen.get_size()
+        left, top = self.camera
+        return top // self.cell_size, (top + height - 1) // self.cell_size, left // self.cell_size, (left + width - 1) // self.cell_size
+
+    def render(self, simulation, alpha=1.0):
+        '''
+        Отрисовка видимой части игрового поля. Поскольку камера сдвигается каждый такт, окно перерисовывается целиком.
+
+        Args:
+            simulation (Simulation): Отрисовываемая симуляция.
+            alpha (float, optional): Доля времени, прошедшая с последнего такта, от 0 до 1. По умолчанию 1.0.
+        '''
+        if self.needs_full_redraw:
+            self.record(simulation)
+            self.needs_full_redraw = False
+        self.update_camera(alpha)
+        self.screen.fill((0, 0, 0))
+
+        first_row, last_row, first_col, last_col = self.visible_cells()
+        size = self.chunk_size
+        for chunk_y in range(first_row // size, last_row // size + 1):
+            for chunk_x in range(first_col // size, last_col // size + 1):
+                surface = self.get_chunk((chunk_y, chunk_x))
+                if surface is not None:
+                    self.screen.blit(surface, (chunk_x * size * self.cell_size - self.camera[0], chunk_y * size * self.cell_size - self.camera[1]))
+
+        head = self.head[0] if self.head is not None and alpha < 1 else None
+        snake = simulation.snake
+        visible_count = (last_row - first_row + 1) * (last_col - first_col + 1)
+        if len(snake.segments) <= visible_count:
+            segments = [segment for segment in snake.segments
+                        if first_row <= segment[0] <= last_row and first_col <= segment[1] <= last_col]
+        else:
+            segments = [(y, x) for y in range(first_row, last_row + 1) for x in range(first_col, last_col + 1) if snake.contains((y, x))]
+        for segment in segments:
+            if segment != head:
+                pygame.draw.rect(self.screen, (255, 255, 255), self.cell_rect(segment))
+
+        pickups = simulation.pickups
+        if len(pickups) <= visible_count:
+            slots = [slot for slot in range(len(pickups))
+                     if first_row <= pickups.rows[slot] <= last_row and first_col <= pickups.cols[slot] <= last_col]
+        else:
+            slots = [slot for slot in (pickups.at((y, x)) for y in range(first_row, last_row + 1) for x in range(first_col, last_col + 1)) if slot >= 0]
+        for slot in slots:
+            pygame.draw.rect(self.screen, pickups.get_type(slot).color, self.cell_rect(pickups.get_position(slot)))
+
+        if head is not None:
+            rect = self.partial_rect(head, self.head[1], alpha)
+            pygame.draw.rect(self.screen, (255, 255, 255), rect if rect is not None else self.cell_rect(head))
+        if self.tail is not None and simulation.running and alpha < 1:
+            tail, new_tail = self.tail
+            rect = self.partial_rect(tail, new_tail, 1 - alpha)
+            if rect is not None and not snake.contains(tail) and pickups.at(tail) < 0:
+                pygame.draw.rect(self.screen, (255, 255, 255), rect)
+
+        pygame.display.flip()
@@ -0,0 +1,379 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from random import Random
+from Snake import Snake
+from Level import Level
+from Simulation import Simulation
+from GameState import GameState
+from level_compiler import compile_level
+from Autopilot import Autopilot
+from tournament import greedy_strategy
+
+SNAKE_LENGTHS = [10, 100, 1000, 10000]
+BOARD_SIZES = [(32, 24), (128, 96), (512, 384)]
+DENSITIES = [0.0, 0.1, 0.3]
+PICKUP_COUNTS = [1, 100, 10000]
+CELL_SIZE = 20
+
+
+def measure(function, budget=0.2):
+    '''
+    Измерение времени одного вызова функции. Количество вызовов подбирается так, чтобы замер
+    длился около budget секунд, а из пяти повторов берется лучший.
+
+    Args:
+        function (callable): Измеряемая функция без аргументов.
+        budget (float, optional): Примерная продолжительность одного повтора в секундах. По умолчанию 0.2.
+
+    Returns:
+        float: Время одного вызова в наносекундах.
+    '''
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget / 10:
+            break
+        number *= 10
+    number = max(1, int(number * budget / 10 / elapsed * 2))
+
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e9
+
+
+def make_snake(length, cols):
+    '''
+    Создание змейки заданной длины, уложенной змейкой по строкам поля.
+
+    Args:
+        length (int): Длина змейки.
+        cols (int): Количество столбцов поля.
+
+    Returns:
+        Snake: Новая змейка, голова которой движется вправо.
+    '''
+    snake = Snake((0, 1), (0, 1))
+    snake.segments.clear()
+    snake.occupied.clear()
+    for i in range(length):
+        y, x = divmod(length - 1 - i, cols)
+        position = (y, x if y % 2 == 0 else cols - 1 - x)
+        snake.segments.append(position)
+        snake.occupied[position] = 1
+    return snake
+
+
+def replace_snake(simulation, snake):
+    '''
+    Замена змейки в симуляции. Клетки прежней змейки возвращаются в свободные, клетки новой убираются из них,
+    а бонусы размещаются заново, поэтому состояние симуляции совпадает с игрой, в которой змейка выросла сама.
+
+    Args:
+        simulation (Simulation): Симуляция.
+        snake (Snake): Новая змейка.
+    '''
+    for segment in simulation.snake.get_segments():
+        if not simulation.level.is_obstacle(segment):
+            simulation.free_cells.add(segment)
+    simulation.snake = snake
+    for segment in snake.get_segments():
+        simulation.free_cells.discard(segment)
+    simulation.pickups.clear()
+    simulation.fill_bonuses()
+
+
+def write_level(path, cols, rows, density, seed=0):
+    '''
+    Запись случайного уровня в текстовом формате. Строка появления змейки остается свободной.
+
+    Args:
+        path (str): Путь к файлу уровня.
+        cols (int): Количество столбцов.
+        rows (int): Количество строк.
+        density (float): Доля клеток с препятствиями.
+        seed (int, optional): Начальное значение генератора случайных чисел. По умолчанию 0.
+    '''
+    random = Random(seed)
+    with open(path, 'w') as file:
+        for y in range(rows):
+            if y == rows // 2:
+                file.write(' ' * cols + '\n')
+            else:
+                file.write(''.join('#' if random.random() < density else ' ' for _ in range(cols)) + '\n')
+
+
+def make_simulation(directory, cols, rows, density, snake_length=2):
+    '''
+    Создание симуляции на случайном уровне заданного размера.
+
+    Args:
+        directory (str): Каталог для временных файлов уровней.
+        cols (int): Количество столбцов.
+        rows (int): Количество строк.
+        density (float): Доля клеток с препятствиями.
+        snake_length (int, optional): Длина змейки. По умолчанию 2.
+
+    Returns:
+        Simulation: Новая симуляция.
+    '''
+    path = os.path.join(directory, f'level_{cols}x{rows}_{density}.txt')
+    if not os.path.exists(path):
+        write_level(path, cols, rows, density)
+    simulation = Simulation('Easy', cols * CELL_SIZE, rows * CELL_SIZE, CELL_SIZE, seed=0, level_file=path)
+    if snake_length > 2:
+        replace_snake(simulation, make_snake(snake_length, cols))
+    return simulation
+
+
+def respawn_bonus(simulation):
+    '''
+    Замена бонусов на поле одним новым бонусом, как после того, как змейка съела бонус.
+
+    Args:
+        simulation (Simulation): Симуляция.
+    '''
+    simulation.pickups.clear()
+    simulation.generate_bonus()
+
+
+def bench_snake(results):
+    '''
+    Замеры методов Snake для разных длин змейки.
+
+    Args:
+        results (dict): Словарь, в который добавляются результаты.
+    '''
+    for length in SNAKE_LENGTHS:
+        snake = make_snake(length, 1000)
+
+        def move():
+            head = snake.segments[0]
+            snake.move((head[0], head[1] + 1))
+
+        results[f'snake.move[len={length}]'] = measure(move)
+        results[f'snake.is_collision[len={length}]'] = measure(snake.is_collision)
+
+        best = None
+        for _ in range(5):
+            snake = make_snake(length, 1000)
+            start = time.perf_counter()
+            for _ in range(10000):
+                snake.grow()
+            elapsed = (time.perf_counter() - start) / 10000
+            best = elapsed if best is None else min(best, elapsed)
+        results[f'snake.grow[len={length}]'] = best * 1e9
+
+
+def bench_simulation(results, directory):
+    '''
+    Замеры проверки столкновений, размещения бонусов, загрузки уровней и полного такта
+    для разных размеров поля, плотности препятствий и длины змейки.
+
+    Args:
+        results (dict): Словарь, в который добавляются результаты.
+        directory (str): Каталог для временных файлов уровней.
+    '''
+    for cols, rows in BOARD_SIZES:
+        for density in DENSITIES:
+            key = f'board={cols}x{rows},density={density}'
+            simulation = make_simulation(directory, cols, rows, density)
+            results[f'game.check_collision[{key}]'] = measure(simulation.check_collision)
+            results[f'game.generate_bonus[{key}]'] = measure(lambda: respawn_bonus(simulation))
+
+            path = os.path.join(directory, f'level_{cols}x{rows}_{density}.txt')
+
+            def generate_obstacles():
+                Level(cols * CELL_SIZE, rows * CELL_SIZE, CELL_SIZE).generate_obstacles(path)
+
+            results[f'level.generate_obstacles[{key}]'] = measure(generate_obstacles)
+
+            compiled_path = os.path.splitext(path)[0] + '.lvl'
+            compile_level(path, compiled_path)
+            results[f'level.load[{key}]'] = measure(lambda: Level.load(compiled_path, CELL_SIZE))
+
+            simulation = make_simulation(directory, cols, rows, density)
+            strategy = greedy_strategy(0)
+
+            def tick():
+                nonlocal simulation
+                if not simulation.step(strategy(simulation)):
+                    simulation = make_simulation(directory, cols, rows, density)
+
+            results[f'loop.tick[{key}]'] = measure(tick)
+
+    for length in SNAKE_LENGTHS:
+        simulation = make_simulation(directory, 512, 384, 0.0, length)
+        results[f'game.check_collision[len={length}]'] = measure(simulation.check_collision)
+        results[f'game.generate_bonus[len={length}]'] = measure(lambda: respawn_bonus(simulation))
+
+    for count in PICKUP_COUNTS:
+        def make_crowded_simulation():
+            simulation = make_simulation(directory, 512, 384, 0.0)
+            while len(simulation.pickups) < count:
+                simulation.generate_bonus()
+            return simulation
+
+        simulation = make_crowded_simulation()
+        head = simulation.snake.get_head()
+        results[f'pickups.at[count={count}]'] = measure(lambda: simulation.pickups.at(head))
+        strategy = greedy_strategy(0)
+
+        def tick():
+            nonlocal simulation
+            if not simulation.step(strategy(simulation)):
+                simulation = make_crowded_simulation()
+
+        results[f'loop.tick[pickups={count}]'] = measure(tick)
+
+
+def bench_state(results, directory):
+    '''
+    Замеры копирования GameState и пары step/undo для разных длин змейки.
+
+    Args:
+        results (dict): Словарь, в который добавляются результаты.
+        directory (str): Каталог для временных файлов уровней.
+    '''
+    for length in SNAKE_LENGTHS:
+        simulation = make_simulation(directory, 512, 384, 0.0, length)
+        state = GameState.from_simulation(simulation)
+        action = simulation.snake.direction
+
+        def step_undo():
+            state.step(action)
+            state.undo()
+
+        def clone_step():
+            state.clone().step(action)
+
+        results[f'state.clone[len={length}]'] = measure(state.clone)
+        results[f'state.step_undo[len={length}]'] = measure(step_undo)
+        results[f'state.clone_step[len={length}]'] = measure(clone_step)
+
+
+def bench_autopilot(results, directory, ticks=2000):
+    '''
+    Замеры времени решения автопилота для разных размеров поля. Записываются среднее и 99-й перцентиль.
+
+    Args:
+        results (dict): Словарь, в который добавляются результаты.
+        directory (str): Каталог для временных файлов уровней.
+        ticks (int, optional): Количество тактов для каждого размера поля. По умолчанию 2000.
+    '''
+    for cols, rows in BOARD_SIZES:
+        key = f'board={cols}x{rows},density=0.1'
+        simulation = make_simulation(directory, cols, rows, 0.1)
+        autopilot = Autopilot()
+        for _ in range(ticks):
+            if not simulation.step(autopilot(simulation)):
+                simulation = make_simulation(directory, cols, rows, 0.1)
+        stats = autopilot.get_stats()
+        results[f'autopilot.decide[{key}]'] = stats['mean_ms'] * 1e6
+        results[f'autopilot.decide.p99[{key}]'] = stats['p99_ms'] * 1e6
+
+
+def bench_render(results):
+    '''
+    Замеры Game.render при полной и инкрементальной отрисовке с видеодрайвером SDL dummy.
+
+    Args:
+        results (dict): Словарь, в который добавляются результаты.
+    '''
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    try:
+        from Game import Game
+    except ImportError:
+        print('pygame is not installed, skipping render benchmarks', file=sys.stderr)
+        return
+
+    for incremental in (False, True):
+        mode = 'incremental' if incremental else 'full'
+        for length in (10, 300):
+            game = Game('bench', 'Easy', incremental_render=incremental)
+            replace_snake(game.simulation, make_snake(length, game.width // game.cell_size))
+            game.render()
+            results[f'game.render[{mode},len={length}]'] = measure(game.render)
+
+        game = Game('bench', 'Easy', incremental_render=incremental)
+        strategy = greedy_strategy(0)
+
+        def frame():
+            if not game.simulation.step(strategy(game.simulation)):
+                game.simulation = Simulation('Easy', seed=0)
+                if game.renderer is not None:
+                    game.renderer.needs_full_redraw = True
+            game.process_input()
+            game.render()
+
+        results[f'loop.frame[{mode}]'] = measure(frame)
+
+
+def compare(results, baseline, threshold):
+    '''
+    Сравнение результатов с базовыми замерами.
+
+    Args:
+        results (dict): Текущие результаты в наносекундах.
+        baseline (dict): Базовые результаты в наносекундах.
+        threshold (float): Допустимое относительное замедление, например 0.2 для 20%.
+
+    Returns:
+        list: Список замедлившихся замеров в виде кортежей (имя, базовое время, текущее время).
+    '''
+    regressions = []
+    for name, value in results.items():
+        if name in baseline and value > baseline[name] * (1 + threshold):
+            regressions.append((name, baseline[name], value))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Замеры производительности "Snake Game".')
+    parser.add_argument('--output', default=None, help='Файл, в который сохраняются результаты в формате JSON.')
+    parser.add_argument('--baseline', default=None, help='Файл с базовыми результатами для сравнения.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Допустимое относительное замедление.')
+    parser.add_argument('--groups', default='snake,simulation,state,autopilot,render', help='Группы замеров через запятую: snake, simulation, state, autopilot, render.')
+    args = parser.parse_args()
+    groups = args.groups.split(',')
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        if 'snake' in groups:
+            bench_snake(results)
+        if 'simulation' in groups:
+            bench_simulation(results, directory)
+        if 'state' in groups:
+            bench_state(results, directory)
+        if 'autopilot' in groups:
+            bench_autopilot(results, directory)
+        if 'render' in groups:
+            bench_render(results)
+
+    for name, value in results.items():
+        print(f'{name:60s} {value:14.1f} ns')
+
+    document = {'python': sys.version.split()[0], 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(document, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f'REGRESSION {name}: {before:.1f} ns -> {after:.1f} ns ({after / before - 1:+.0%})')
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,393 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import statistics
+import sys
+from array import array
+from collections import Counter, deque
+from multiprocessing import Pool
+from GameState import get_walls
+from Level import LEVEL_HEADER, Level
+from Simulation import Simulation
+from tournament import load_strategy
+
+ANALYZER_VERSION = 2
+
+
+def neighbours(cell, rows, cols):
+    '''
+    Вычисление четырех соседей клетки с переходом через края поля, как в Simulation.get_next_snake_position.
+
+    Args:
+        cell (int): Номер клетки y * cols + x.
+        rows (int): Количество строк с учетом скрытой строки.
+        cols (int): Количество столбцов с учетом скрытого столбца.
+
+    Returns:
+        tuple: Номера соседних клеток сверху, снизу, слева и справа.
+    '''
+    y, x = divmod(cell, cols)
+    return (
+        cell - cols if y > 0 else cell + (rows - 1) * cols,
+        cell + cols if y < rows - 1 else x,
+        cell - 1 if x > 0 else cell + cols - 1,
+        cell + 1 if x < cols - 1 else cell - x,
+    )
+
+
+def label_components(free, rows, cols):
+    '''
+    Разметка связных областей свободных клеток обходом в ширину.
+
+    Args:
+        free (bytes): 1 для свободной клетки и 0 для препятствия.
+        rows (int): Количество строк с учетом скрытой строки.
+        cols (int): Количество столбцов с учетом скрытого столбца.
+
+    Returns:
+        tuple: Номер области для каждой клетки (-1 для препятствий) и список размеров областей.
+    '''
+    labels = array('i', [-1]) * (rows * cols)
+    sizes = []
+    for start in range(rows * cols):
+        if not free[start] or labels[start] >= 0:
+            continue
+        label = len(sizes)
+        labels[start] = label
+        queue = deque((start,))
+        size = 0
+        while queue:
+            cell = queue.popleft()
+            size += 1
+            for neighbour in neighbours(cell, rows, cols):
+                if free[neighbour] and labels[neighbour] < 0:
+                    labels[neighbour] = label
+                    queue.append(neighbour)
+        sizes.append(size)
+    return labels, sizes
+
+
+def find_dead_ends(free, rows, cols, labels, label):
+    '''
+    Поиск тупиковых коридоров: от клетки с одним свободным соседом коридор продолжается,
+    пока у клеток ровно два свободных соседа.
+
+    Args:
+        free (bytes): 1 для свободной клетки и 0 для препятствия.
+        rows (int): Количество строк с учетом скрытой строки.
+        cols (int): Количество столбцов с учетом скрытого столбца.
+        labels (array): Номера областей клеток.
+        label (int): Номер области, в которой ищутся тупики.
+
+    Returns:
+        list: Тупики в виде (y, x, длина) от самых длинных, где (y, x) - конец тупика.
+    '''
+    def free_neighbours(cell):
+        return [neighbour for neighbour in neighbours(cell, rows, cols) if free[neighbour]]
+
+    dead_ends = []
+    for cell in range(rows * cols):
+        if labels[cell] != label:
+            continue
+        around = free_neighbours(cell)
+        if len(around) != 1:
+            continue
+        previous, current, length = cell, around[0], 1
+        while True:
+            around = free_neighbours(current)
+            if len(around) != 2:
+                break
+            previous, current = current, around[0] if around[1] == previous else around[1]
+            length += 1
+        dead_ends.append(divmod(cell, cols) + (length,))
+    dead_ends.sort(key=lambda dead_end: -dead_end[2])
+    return dead_ends
+
+
+def find_choke_points(free, rows, cols, root):
+    '''
+    Поиск узких мест - шарниров графа свободных клеток, после занятия которых часть поля становится недостижимой.
+    Используется нерекурсивный алгоритм Тарьяна, поэтому глубина обхода не ограничена стеком Python.
+
+    Args:
+        free (bytes): 1 для свободной клетки и 0 для препятствия.
+        rows (int): Количество строк с учетом скрытой строки.
+        cols (int): Количество столбцов с учетом скрытого столбца.
+        root (int): Клетка, с которой начинается обход, обычно начальная позиция змейки.
+
+    Returns:
+        list: Узкие места в виде (y, x, размер отрезаемой области) от самых опасных.
+    '''
+    count = rows * cols
+    order = array('i', [-1]) * count
+    low = array('i', bytes(4 * count))
+    size = array('i', bytes(4 * count))
+    parent = array('i', [-1]) * count
+    next_direction = bytearray(count)
+    separated = {}
+    root_children = []
+
+    order[root] = low[root] = 0
+    size[root] = 1
+    time = 1
+    stack = [root]
+    while stack:
+        cell = stack[-1]
+        direction = next_direction[cell]
+        if direction < 4:
+            next_direction[cell] = direction + 1
+            neighbour = neighbours(cell, rows, cols)[direction]
+            if not free[neighbour]:
+                continue
+            if order[neighbour] < 0:
+                parent[neighbour] = cell
+                order[neighbour] = low[neighbour] = time
+                size[neighbour] = 1
+                time += 1
+                stack.append(neighbour)
+            elif neighbour != parent[cell] and order[neighbour] < low[cell]:
+                low[cell] = order[neighbour]
+            continue
+        stack.pop()
+        above = parent[cell]
+        if above < 0:
+            continue
+        size[above] += size[cell]
+        if low[cell] < low[above]:
+            low[above] = low[cell]
+        if above == root:
+            root_children.append(size[cell])
+        elif low[cell] >= order[above]:
+            separated[above] = max(separated.get(above, 0), size[cell])
+    if len(root_children) > 1:
+        separated[root] = size[root] - 1 - max(root_children)
+
+    choke_points = [divmod(cell, cols) + (region,) for cell, region in separated.items()]
+    choke_points.sort(key=lambda choke_point: -choke_point[2])
+    return choke_points
+
+
+def get_board_size(path, width=640, height=480, cell_size=20):
+    '''
+    Размер игрового поля, на котором уровень помещается целиком. Размеры скомпилированного уровня берутся
+    из заголовка файла .lvl, а текстовый уровень, как в level_compiler, занимает столько строк, сколько строк в файле,
+    и столько столбцов, сколько символов в самой длинной строке, но не меньше заданного поля.
+
+    Args:
+        path (str): Путь к файлу уровня.
+        width (int, optional): Минимальная ширина игрового поля для текстового уровня. По умолчанию 640.
+        height (int, optional): Минимальная высота игрового поля для текстового уровня. По умолчанию 480.
+        cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+
+    Returns:
+        tuple: Ширина и высота игрового поля.
+    '''
+    if path.endswith('.lvl'):
+        with open(path, 'rb') as file:
+            _, _, _, rows, cols, _, _, _ = LEVEL_HEADER.unpack(file.read(LEVEL_HEADER.size))
+        return cols * cell_size, rows * cell_size
+    with open(path, 'r') as file:
+        lines = file.read().splitlines()
+    rows = max(height // cell_size, len(lines))
+    cols = max([width // cell_size] + [len(line) for line in lines])
+    return cols * cell_size, rows * cell_size
+
+
+def analyze_structure(path, width=640, height=480, cell_size=20):
+    '''
+    Анализ структуры уровня: связность свободных клеток с учетом перехода через края поля,
+    недостижимые от начальной позиции клетки, тупики и узкие места. Поле увеличивается до размеров карты
+    (см. get_board_size), поэтому большие текстовые уровни не обрезаются.
+
+    Args:
+        path (str): Путь к файлу уровня.
+        width (int, optional): Минимальная ширина игрового поля для текстового уровня. По умолчанию 640.
+        height (int, optional): Минимальная высота игрового поля для текстового уровня. По умолчанию 480.
+        cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+
+    Returns:
+        dict: Результаты анализа и список найденных проблем.
+    '''
+    width, height = get_board_size(path, width, height, cell_size)
+    level = Level.from_file(path, width, height, cell_size)
+    rows, cols = level.rows + 1, level.cols + 1
+    walls = get_walls(level, rows, cols)
+    free = walls.translate(bytes([1] + [0] * 255))
+    spawn = level.spawn or (level.height // 2 // cell_size, level.width // 4 // cell_size)
+    tail = (spawn[0], spawn[1] - 1)
+
+    problems = []
+    for name, (y, x) in (('spawn', spawn), ('tail', tail)):
+        if not (0 <= y < rows and 0 <= x < cols) or not free[y * cols + x]:
+            problems.append(f'{name} cell {y},{x} is blocked')
+    if problems:
+        return {'rows': level.rows, 'cols': level.cols, 'spawn': list(spawn), 'problems': problems}
+
+    labels, sizes = label_components(free, rows, cols)
+    root = spawn[0] * cols + spawn[1]
+    label = labels[root]
+    unreachable = [divmod(cell, cols) for cell in range(rows * cols)
+                   if free[cell] and labels[cell] != label and cell // cols < level.rows and cell % cols < level.cols]
+    if unreachable:
+        problems.append(f'{len(unreachable)} free cells are unreachable from the spawn')
+    dead_ends = find_dead_ends(free, rows, cols, labels, label)
+    choke_points = find_choke_points(free, rows, cols, root)
+
+    return {
+        'rows': level.rows,
+        'cols': level.cols,
+        'spawn': list(spawn),
+        'obstacles': walls.count(1),
+        'free_cells': sum(sizes),
+        'regions': len(sizes),
+        'reachable_cells': sizes[label],
+        'unreachable_cells': len(unreachable),
+        'unreachable_examples': [list(cell) for cell in unreachable[:10]],
+        'dead_ends': len(dead_ends),
+        'longest_dead_ends': [list(dead_end) for dead_end in dead_ends[:10]],
+        'choke_points': len(choke_points),
+        'worst_choke_points': [list(choke_point) for choke_point in choke_points[:10]],
+        'problems': problems,
+    }
+
+
+def play_level(job):
+    '''
+    Проведение одной игры на уровне без отображения.
+
+    Args:
+        job (tuple): Путь к файлу уровня, размеры поля (ширина, высота), имя стратегии, номер игры
+            и максимальное количество тактов.
+
+    Returns:
+        tuple: Путь к файлу уровня, счет, количество тактов и причина завершения.
+    '''
+    path, (width, height), strategy_name, seed, max_ticks = job
+    simulation = Simulation(width=width, height=height, seed=seed, level_file=path)
+    strategy = load_strategy(strategy_name)(seed)
+    while simulation.running and simulation.ticks < max_ticks:
+        simulation.step(strategy(simulation))
+    return path, simulation.get_score(), simulation.ticks, simulation.death_cause or 'timeout'
+
+
+def summarize_games(games, max_ticks):
+    '''
+    Сводка игр на одном уровне. Сложность - доля тактов до max_ticks, которые змейка в среднем не прожила:
+    0 - все игры продолжались до конца, 1 - змейка гибнет сразу.
+
+    Args:
+        games (list): Результаты игр в виде (счет, количество тактов, причина завершения).
+        max_ticks (int): Максимальная продолжительность игры в тактах.
+
+    Returns:
+        dict: Оценка сложности, средние счет и продолжительность, доля доигранных игр и причины завершения.
+    '''
+    mean_ticks = statistics.fmean(ticks for _, ticks, _ in games)
+    causes = Counter(cause for _, _, cause in games)
+    return {
+        'games': len(games),
+        'difficulty': round(1 - mean_ticks / max_ticks, 3),
+        'mean_score': statistics.fmean(score for score, _, _ in games),
+        'mean_ticks': mean_ticks,
+        'survival_rate': causes['timeout'] / len(games),
+        'death_causes': dict(causes),
+    }
+
+
+def get_key(path, parameters):
+    '''
+    Ключ кэша результатов: хэш содержимого файла уровня и параметров анализа. Путь к файлу в ключ не входит,
+    поэтому переименованный или скопированный уровень не анализируется повторно.
+
+    Args:
+        path (str): Путь к файлу уровня.
+        parameters (dict): Параметры анализа.
+
+    Returns:
+        str: Шестнадцатеричный хэш SHA-256.
+    '''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        digest.update(file.read())
+    digest.update(json.dumps(dict(parameters, version=ANALYZER_VERSION), sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def analyze_levels(paths, games=100, max_ticks=2000, strategy='greedy', workers=None, cache_path=os.path.join('.level_cache', 'analysis.json'), chunksize=8):
+    '''
+    Анализ уровней: структура каждого уровня и оценка сложности по играм стратегии с разными начальными значениями.
+    Анализ структуры и игры всех уровней распределяются по общему пулу процессов. Результаты хранятся в кэше
+    по хэшу содержимого уровня, поэтому неизмененные уровни повторно не анализируются.
+
+    Args:
+        paths (list): Пути к файлам уровней.
+        games (int, optional): Количество игр на уровень. По умолчанию 100.
+        max_ticks (int, optional): Максимальная продолжительность игры в тактах. По умолчанию 2000.
+        strategy (str, optional): Имя стратегии из tournament или путь вида 'module:function'. По умолчанию 'greedy'.
+        workers (int, optional): Количество процессов. По умолчанию равно количеству ядер.
+        cache_path (str, optional): Файл кэша результатов или None, чтобы не использовать кэш. По умолчанию '.level_cache/analysis.json'.
+        chunksize (int, optional): Количество игр, передаваемых процессу за раз. По умолчанию 8.
+
+    Returns:
+        dict: Результаты анализа для каждого пути.
+    '''
+    parameters = {'games': games, 'max_ticks': max_ticks, 'strategy': strategy}
+    cache = {}
+    if cache_path is not None and os.path.exists(cache_path):
+        with open(cache_path, 'r') as file:
+            cache = json.load(file)
+
+    keys = {path: get_key(path, parameters) for path in paths}
+    pending = sorted({path for path in paths if keys[path] not in cache})
+    if pending:
+        sizes = {path: get_board_size(path) for path in pending}
+        jobs = [(path, sizes[path], strategy, seed, max_ticks) for path in pending for seed in range(games)]
+        outcomes = {path: [] for path in pending}
+        with Pool(workers) as pool:
+            structures = pool.map_async(analyze_structure, pending)
+            for path, score, ticks, cause in pool.imap_unordered(play_level, jobs, chunksize):
+                outcomes[path].append((score, ticks, cause))
+            for path, structure in zip(pending, structures.get()):
+                cache[keys[path]] = dict(structure, **summarize_games(outcomes[path], max_ticks)) if games else structure
+
+        if cache_path is not None:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            with open(cache_path, 'w') as file:
+                json.dump(cache, file)
+
+    return {path: cache[keys[path]] for path in paths}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Проверка уровней "Snake Game": связность, тупики, узкие места и оценка сложности.')
+    parser.add_argument('paths', nargs='*', help='Файлы уровней. По умолчанию level*.txt в текущем каталоге.')
+    parser.add_argument('--games', type=int, default=100, help='Количество игр на уровень для оценки сложности.')
+    parser.add_argument('--max-ticks', type=int, default=2000, help='Максимальная продолжительность игры в тактах.')
+    parser.add_argument('--strategy', default='greedy', help="Стратегия из tournament или путь вида 'module:function'.")
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов.')
+    parser.add_argument('--cache', default=os.path.join('.level_cache', 'analysis.json'), help='Файл кэша результатов.')
+    parser.add_argument('--no-cache', action='store_true', help='Не использовать кэш результатов.')
+    parser.add_argument('--json', action='store_true', help='Вывести полные результаты в формате JSON.')
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob('level*.txt'))
+    results = analyze_levels(paths, args.games, args.max_ticks, args.strategy, args.workers, None if args.no_cache else args.cache)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for path, result in results.items():
+            status = 'FAIL' if result['problems'] else 'OK  '
+            line = f"{status} {path}: {result['rows']}x{result['cols']}"
+            if 'regions' in result:
+                line += (f", {result['reachable_cells']} reachable, {result['unreachable_cells']} unreachable,"
+                         f" {result['dead_ends']} dead ends, {result['choke_points']} choke points")
+            if 'difficulty' in result:
+                line += f", difficulty {result['difficulty']:.2f}, mean score {result['mean_score']:.1f}"
+            print(line)
+            for problem in result['problems']:
+                print(f'     {problem}')
+
+    if any(result['problems'] for result in results.values()):
+        sys.exit(1)
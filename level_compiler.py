@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+from Level import LEVEL_HEADER, LEVEL_MAGIC, LEVEL_VERSION
+
+BITS = bytes(ord('1') if byte == ord('#') else ord('0') for byte in range(256))
+
+
+def compile_level(source, destination, rows=0, cols=0, metadata=None):
+    '''
+    Компиляция текстового уровня в двоичный формат .lvl: заголовок с размерами поля и начальной позицией
+    змейки (первый символ 'S', как в Level.generate_obstacles), метаданные в формате JSON и упакованная битовая карта препятствий.
+
+    Args:
+        source (str): Путь к текстовому файлу уровня.
+        destination (str): Путь к файлу .lvl.
+        rows (int, optional): Минимальное количество строк поля. По умолчанию равно количеству строк в файле.
+        cols (int, optional): Минимальное количество столбцов поля. По умолчанию равно длине самой длинной строки.
+        metadata (dict, optional): Дополнительные метаданные уровня. По умолчанию None.
+
+    Returns:
+        tuple: Количество строк и столбцов поля.
+    '''
+    with open(source, 'r') as file:
+        lines = file.read().splitlines()
+    rows = max(rows, len(lines))
+    cols = max([cols] + [len(line) for line in lines])
+
+    spawn_y, spawn_x = -1, -1
+    for y, line in enumerate(lines):
+        x = line.find('S')
+        if x >= 0:
+            spawn_y, spawn_x = y, x
+            break
+
+    bits = b''.join(line.encode('latin-1', 'replace').ljust(cols).translate(BITS) for line in lines)
+    bits += b'0' * (rows * cols - len(bits))
+    bits += b'0' * (-len(bits) % 8)
+    bitmap = int(bits, 2).to_bytes(len(bits) // 8, 'big') if bits else b''
+
+    info = {'name': os.path.splitext(os.path.basename(source))[0], 'source': source}
+    info.update(metadata or {})
+    write_level(destination, rows, cols, (spawn_y, spawn_x), bitmap, info)
+    return rows, cols
+
+
+def write_level(destination, rows, cols, spawn, bitmap, metadata):
+    '''
+    Запись уровня в двоичный формат .lvl. Файл записывается во временный файл в том же каталоге и затем
+    заменяет прежний, поэтому процессы, которые отобразили прежний файл в память, не увидят его недописанным.
+
+    Args:
+        destination (str): Путь к файлу .lvl.
+        rows (int): Количество строк поля.
+        cols (int): Количество столбцов поля.
+        spawn (tuple): Начальная позиция змейки в формате (y, x) или None.
+        bitmap (bytes): Упакованная битовая карта препятствий.
+        metadata (dict): Метаданные уровня.
+    '''
+    spawn_y, spawn_x = spawn or (-1, -1)
+    encoded = json.dumps(metadata).encode('utf-8')
+    temporary_path = f'{destination}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_path, 'wb') as file:
+            file.write(LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, 0, rows, cols, spawn_y, spawn_x, len(encoded)))
+            file.write(encoded)
+            file.write(bitmap)
+        os.replace(temporary_path, destination)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Компиляция текстовых уровней "Snake Game" в формат .lvl.')
+    parser.add_argument('sources', nargs='+', help='Текстовые файлы уровней.')
+    parser.add_argument('--output-dir', default='.', help='Каталог для файлов .lvl.')
+    parser.add_argument('--rows', type=int, default=24, help='Минимальное количество строк поля.')
+    parser.add_argument('--cols', type=int, default=32, help='Минимальное количество столбцов поля.')
+    args = parser.parse_args()
+
+    for source in args.sources:
+        name = os.path.splitext(os.path.basename(source))[0]
+        destination = os.path.join(args.output_dir, name + '.lvl')
+        rows, cols = compile_level(source, destination, args.rows, args.cols)
+        print(f'{source} -> {destination} ({cols}x{rows})')
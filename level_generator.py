@@ -0,0 +1,216 @@
+import argparse
+import math
+import os
+import time
+from random import Random
+from Level import Level
+from level_compiler import write_level
+
+GENERATOR_VERSION = 1
+MIN_ROOM = 3
+
+
+def get_line_fraction(density, loops):
+    '''
+    Подбор доли строк и столбцов, занятых стенами, для заданной плотности препятствий. Стены на доле f строк
+    и f столбцов занимают 2f - f^2 поля, а двери, по одной на ребро остовного дерева комнат и на каждую
+    дополнительную петлю, освобождают около f^2 * (1 + loops) клеток.
+
+    Args:
+        density (float): Желаемая доля клеток с препятствиями.
+        loops (float): Доля дополнительных дверей от количества комнат.
+
+    Returns:
+        float: Доля строк и столбцов со стенами, не больше 1 / (MIN_ROOM + 1).
+    '''
+    limit = 1 / (MIN_ROOM + 1)
+    if density <= 0:
+        return 0.0
+    a = 2 + loops
+    discriminant = 1 - a * density
+    if discriminant <= 0:
+        return limit
+    return min(limit, (1 - math.sqrt(discriminant)) / a)
+
+
+def place_lines(random, length, fraction):
+    '''
+    Размещение стен вдоль одной оси: length - n свободных клеток делятся на n + 1 комнату почти равного
+    размера, а комнаты, которым достается лишняя клетка, выбираются случайно.
+
+    Args:
+        random (Random): Генератор случайных чисел.
+        length (int): Количество строк или столбцов поля.
+        fraction (float): Доля строк или столбцов со стенами.
+
+    Returns:
+        tuple: Список координат стен, начала и концы комнат (конец не включается).
+    '''
+    count = min(round(fraction * length), (length - MIN_ROOM) // (MIN_ROOM + 1)) if length > MIN_ROOM else 0
+    base, extra = divmod(length - count, count + 1)
+    bigger = set(random.sample(range(count + 1), extra))
+    lines, starts, ends = [], [], []
+    position = 0
+    for room in range(count + 1):
+        starts.append(position)
+        position += base + (room in bigger)
+        ends.append(position)
+        if room < count:
+            lines.append(position)
+            position += 1
+    return lines, starts, ends
+
+
+def generate_grid(rows, cols, density=0.2, seed=None, loops=0.1):
+    '''
+    Генерация препятствий: поле делится стенами на комнаты, а двери между соседними комнатами открываются
+    в случайном порядке алгоритмом Краскала. Система непересекающихся множеств объединяет комнаты
+    по мере открытия дверей, поэтому дверь, соединяющая уже связанные комнаты, пропускается (кроме заданной доли
+    петель), и связность свободных клеток поддерживается без повторного обхода поля. Стены записываются срезами
+    в bytearray, поэтому на поле 2000x2000 генерация занимает доли секунды.
+
+    Args:
+        rows (int): Количество строк поля.
+        cols (int): Количество столбцов поля.
+        density (float, optional): Желаемая доля клеток с препятствиями, достижимая примерно до 0.37. По умолчанию 0.2.
+        seed (int, optional): Начальное значение генератора случайных чисел. По умолчанию None.
+        loops (float, optional): Доля дополнительных дверей между уже связанными комнатами, чтобы на уровне
+            были кольцевые пути. По умолчанию 0.1.
+
+    Returns:
+        tuple: Поле в виде bytearray из символов '1' (препятствие) и '0' построчно и начальная позиция змейки или None.
+    '''
+    random = Random(seed)
+    fraction = get_line_fraction(density, loops)
+    ys, y_starts, y_ends = place_lines(random, rows, fraction)
+    xs, x_starts, x_ends = place_lines(random, cols, fraction)
+
+    grid = bytearray(b'0') * (rows * cols)
+    wall_row = b'1' * cols
+    for y in ys:
+        grid[y * cols:(y + 1) * cols] = wall_row
+    wall_column = b'1' * rows
+    for x in xs:
+        grid[x::cols] = wall_column
+
+    room_cols = len(x_starts)
+    rooms = len(y_starts) * room_cols
+    edges = list(range(1, 2 * (rooms - room_cols), 2))
+    for i in range(len(y_starts)):
+        edges.extend(range(2 * i * room_cols, 2 * ((i + 1) * room_cols - 1), 2))
+    random.shuffle(edges)
+    parent = list(range(rooms))
+    joins = rooms - 1
+    extra = round(loops * rooms)
+    doors = []
+    for edge in edges:
+        a = edge >> 1
+        b = a + room_cols if edge & 1 else a + 1
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a != b:
+            parent[a] = b
+            joins -= 1
+        elif extra:
+            extra -= 1
+        else:
+            continue
+        doors.append(edge)
+        if not joins and not extra:
+            break
+
+    uniform = random.random
+    for edge in doors:
+        i, j = divmod(edge >> 1, room_cols)
+        if edge & 1:
+            grid[ys[i] * cols + x_starts[j] + int(uniform() * (x_ends[j] - x_starts[j]))] = 48
+        else:
+            grid[(y_starts[i] + int(uniform() * (y_ends[i] - y_starts[i]))) * cols + xs[j]] = 48
+
+    spawn = None
+    target = cols // 4
+    wide = [j for j in range(room_cols) if x_ends[j] - x_starts[j] >= 3]
+    if wide:
+        j = min(wide, key=lambda j: abs(x_starts[j] + 1 - target))
+        i = min(range(len(y_starts)), key=lambda i: abs(y_starts[i] - rows // 2))
+        spawn = (y_starts[i], x_starts[j] + 1)
+    return grid, spawn
+
+
+def generate_level(rows, cols, density=0.2, seed=None, loops=0.1, cell_size=20):
+    '''
+    Генерация уровня со связным свободным пространством сразу в структуре Level.
+
+    Args:
+        rows (int): Количество строк поля.
+        cols (int): Количество столбцов поля.
+        density (float, optional): Желаемая доля клеток с препятствиями. По умолчанию 0.2.
+        seed (int, optional): Начальное значение генератора случайных чисел. По умолчанию None.
+        loops (float, optional): Доля дополнительных дверей между уже связанными комнатами. По умолчанию 0.1.
+        cell_size (int, optional): Размер ячейки на игровом поле. По умолчанию 20.
+
+    Returns:
+        Level: Уровень с битовой картой препятствий. Список obstacles строится из нее при первом обращении,
+        а фактическая плотность записывается в metadata.
+    '''
+    grid, spawn = generate_grid(rows, cols, density, seed, loops)
+    walls = grid.count(b'1')
+    grid += b'0' * (-len(grid) % 8)
+    level = Level(cols * cell_size, rows * cell_size, cell_size)
+    level.bitmap = bytearray(int(grid, 2).to_bytes(len(grid) // 8, 'big')) if grid else bytearray()
+    level._obstacles = None
+    level.spawn = spawn
+    level.metadata = {
+        'name': f'generated_{cols}x{rows}_{seed}',
+        'generator': GENERATOR_VERSION,
+        'seed': seed,
+        'density': density,
+        'loops': loops,
+        'obstacles': walls,
+        'actual_density': walls / (rows * cols) if rows * cols else 0.0,
+    }
+    return level
+
+
+def save_level(level, path):
+    '''
+    Сохранение уровня в файл. Файлы .lvl записываются в двоичном формате, остальные - текстом,
+    который читает Level.generate_obstacles.
+
+    Args:
+        level (Level): Уровень.
+        path (str): Путь к файлу уровня.
+    '''
+    if path.endswith('.lvl'):
+        metadata = dict(level.metadata, name=os.path.splitext(os.path.basename(path))[0])
+        write_level(path, level.rows, level.cols, level.spawn, level.bitmap, metadata)
+        return
+    size = level.rows * level.cols
+    bits = format(int.from_bytes(level.bitmap, 'big'), f'0{len(level.bitmap) * 8}b')[:size] if size else ''
+    grid = bytearray(bits.translate(str.maketrans('01', ' #')), 'ascii')
+    if level.spawn is not None:
+        grid[level.spawn[0] * level.cols + level.spawn[1]] = ord('S')
+    with open(path, 'wb') as file:
+        file.write(b'\n'.join(grid[y * level.cols:(y + 1) * level.cols].rstrip() for y in range(level.rows)) + b'\n')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Генерация уровней "Snake Game" со связным свободным пространством.')
+    parser.add_argument('output', help='Файл уровня: .lvl или текстовый.')
+    parser.add_argument('--size', default='32x24', help='Размер поля в клетках.')
+    parser.add_argument('--density', type=float, default=0.2, help='Доля клеток с препятствиями.')
+    parser.add_argument('--loops', type=float, default=0.1, help='Доля дополнительных дверей, образующих кольцевые пути.')
+    parser.add_argument('--seed', type=int, default=None, help='Начальное значение генератора случайных чисел.')
+    args = parser.parse_args()
+
+    cols, rows = (int(value) for value in args.size.split('x'))
+    start = time.perf_counter()
+    level = generate_level(rows, cols, args.density, args.seed, args.loops)
+    elapsed = time.perf_counter() - start
+    save_level(level, args.output)
+    print(f"{args.output}: {cols}x{rows}, {level.metadata['obstacles']} obstacles "
+          f"(density {level.metadata['actual_density']:.3f}), generated in {elapsed * 1000:.0f} ms")
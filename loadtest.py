@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from random import Random
+from ClientState import ClientState
+from Simulation import DIRECTIONS
+
+
+def choose_direction(state, random):
+    '''
+    Выбор направления для бота: ближайший по манхэттенскому расстоянию шаг к первому бонусу,
+    не ведущий в препятствие, разворот или тело своей змейки.
+
+    Args:
+        state (ClientState): Состояние матча на стороне клиента.
+        random (Random): Генератор случайных чисел для выбора при равных расстояниях.
+
+    Returns:
+        tuple: Новое направление движения или None, если змейки нет на поле.
+    '''
+    segments = state.get_segments()
+    if segments is None:
+        return None
+    own = set(segments)
+    target = next(iter(state.bonuses), None)
+    best, best_distance = None, None
+    for direction in random.sample(DIRECTIONS, len(DIRECTIONS)):
+        if direction == (-state.direction[0], -state.direction[1]):
+            continue
+        position = state.next_position(direction)
+        if state.is_obstacle(position) or position in own:
+            continue
+        distance = abs(position[0] - target[0]) + abs(position[1] - target[1]) if target is not None else 0
+        if best is None or distance < best_distance:
+            best, best_distance = direction, distance
+    return best
+
+
+async def bot(host, port, name, stop, results):
+    '''
+    Бот нагрузочного теста: подключается к серверу, применяет изменения каждого такта, поворачивает к бонусу
+    с предсказанием своего хода и возвращается в игру после гибели.
+
+    Args:
+        host (str): Адрес сервера.
+        port (int): Порт сервера.
+        name (str): Имя игрока.
+        stop (Event): Событие окончания теста.
+        results (list): Список, в который добавляется результат бота.
+    '''
+    random = Random(name)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((json.dumps({'type': 'join', 'name': name}) + '\n').encode())
+    line = await reader.readline()
+    state = ClientState()
+    state.apply_snapshot(json.loads(line))
+    received = len(line)
+    first_tick, messages, deaths = state.tick, 0, 0
+    start = time.perf_counter()
+
+    while not stop.is_set():
+        try:
+            line = await asyncio.wait_for(reader.readline(), 1.0)
+        except asyncio.TimeoutError:
+            continue
+        if not line:
+            break
+        received += len(line)
+        messages += 1
+        delta = json.loads(line)
+        state.apply_delta(delta)
+        if state.get_segments() is None:
+            if state.player in delta.get('d', ()):
+                deaths += 1
+                writer.write(b'{"type":"respawn"}\n')
+            continue
+        direction = choose_direction(state, random)
+        if direction is not None and direction != state.direction:
+            writer.write((json.dumps({'type': 'turn', 'd': direction}) + '\n').encode())
+            state.predict(direction)
+
+    results.append({
+        'match': state.match,
+        'bytes': received,
+        'messages': messages,
+        'ticks': state.tick - first_tick,
+        'seconds': time.perf_counter() - start,
+        'deaths': deaths,
+        'predictions': state.predictions,
+        'mispredictions': state.mispredictions,
+    })
+    writer.close()
+
+
+async def query_stats(host, port):
+    '''
+    Запрос статистики матчей у сервера.
+
+    Args:
+        host (str): Адрес сервера.
+        port (int): Порт сервера.
+
+    Returns:
+        dict: Статистика матчей, возвращенная MatchServer.get_stats.
+    '''
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"type":"stats"}\n')
+    message = json.loads(await reader.readline())
+    writer.close()
+    return message['matches']
+
+
+async def run_load_test(host, port, players, duration, ramp):
+    '''
+    Проведение нагрузочного теста: подключение players ботов, игра в течение duration секунд и сбор статистики.
+
+    Args:
+        host (str): Адрес сервера.
+        port (int): Порт сервера.
+        players (int): Количество ботов.
+        duration (float): Продолжительность теста в секундах после подключения всех ботов.
+        ramp (float): Пауза между подключениями ботов в секундах.
+
+    Returns:
+        tuple: Результаты ботов и статистика сервера.
+    '''
+    stop = asyncio.Event()
+    results = []
+    tasks = []
+    for i in range(players):
+        tasks.append(asyncio.create_task(bot(host, port, f'bot{i}', stop, results)))
+        await asyncio.sleep(ramp)
+    await asyncio.sleep(duration)
+    server_stats = await query_stats(host, port)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return results, server_stats
+
+
+def summarize(results, server_stats):
+    '''
+    Сводка нагрузочного теста по матчам.
+
+    Args:
+        results (list): Результаты ботов.
+        server_stats (dict): Статистика сервера.
+
+    Returns:
+        dict: Для каждого матча количество игроков, частота тактов, входящий трафик всех игроков матча и одного игрока,
+        доля ошибочных предсказаний и время такта на сервере.
+    '''
+    matches = {}
+    for result in results:
+        matches.setdefault(result['match'], []).append(result)
+    summary = {}
+    for match_id, group in sorted(matches.items()):
+        seconds = max(result['seconds'] for result in group)
+        total_bytes = sum(result['bytes'] for result in group)
+        predictions = sum(result['predictions'] for result in group)
+        server = server_stats.get(str(match_id), {})
+        summary[match_id] = {
+            'players': len(group),
+            'tick_rate': max(result['ticks'] for result in group) / seconds,
+            'match_kbps': total_bytes / seconds / 1024,
+            'player_kbps': total_bytes / len(group) / seconds / 1024,
+            'deaths': sum(result['deaths'] for result in group),
+            'misprediction_rate': sum(result['mispredictions'] for result in group) / predictions if predictions else 0.0,
+            'server_tick_ms_mean': server.get('tick_ms_mean'),
+            'server_tick_ms_max': server.get('tick_ms_max'),
+        }
+    return summary
+
+
+async def main(args):
+    '''
+    Запуск нагрузочного теста и, если требуется, сервера в отдельном процессе.
+
+    Args:
+        args (Namespace): Аргументы командной строки.
+    '''
+    process = None
+    if args.spawn_server:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py'),
+            '--host', args.host, '--port', str(args.port), '--tick-rate', str(args.tick_rate),
+            '--players-per-match', str(args.players_per_match), '--difficulty', args.difficulty)
+        await asyncio.sleep(1.0)
+    try:
+        results, server_stats = await run_load_test(args.host, args.port, args.players, args.duration, args.ramp)
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+
+    summary = summarize(results, server_stats)
+    print(json.dumps(summary, indent=2))
+    print(f"players: {len(results)}, matches: {len(summary)}, "
+          f"mean tick rate: {sum(match['tick_rate'] for match in summary.values()) / max(len(summary), 1):.1f}/s, "
+          f"mean bandwidth per match: {sum(match['match_kbps'] for match in summary.values()) / max(len(summary), 1):.1f} KiB/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Нагрузочный тест сервера "Snake Game".')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес сервера.')
+    parser.add_argument('--port', type=int, default=8765, help='Порт сервера.')
+    parser.add_argument('--players', type=int, default=200, help='Количество ботов.')
+    parser.add_argument('--duration', type=float, default=10.0, help='Продолжительность теста в секундах.')
+    parser.add_argument('--ramp', type=float, default=0.005, help='Пауза между подключениями ботов в секундах.')
+    parser.add_argument('--spawn-server', action='store_true', help='Запустить сервер в отдельном процессе.')
+    parser.add_argument('--tick-rate', type=int, default=20, help='Частота тактов запускаемого сервера.')
+    parser.add_argument('--players-per-match', type=int, default=8, help='Размер матча на запускаемом сервере.')
+    parser.add_argument('--difficulty', default='Easy', help='Уровень сложности матчей на запускаемом сервере.')
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+from Replay import Replay
+from Simulation import DIRECTIONS
+
+
+def render_replay(replay, output, fps=30, size=(640, 480), pool_size=8):
+    '''
+    Отрисовка записи игры в последовательность изображений или файл несжатого видео без окна и без ожидания таймера,
+    поэтому игра записывается быстрее, чем шла в реальном времени. Кадры между тактами строятся с плавным
+    движением головы и хвоста, как в игре, а захват ждет свободную поверхность пула, поэтому кадры не пропускаются.
+
+    Args:
+        replay (Replay): Запись игры.
+        output (str): Каталог, шаблон имени изображения или файл .rgb, как в FrameCapture.
+        fps (int, optional): Частота кадров видео или None, чтобы записывать один кадр на такт. По умолчанию 30.
+        size (tuple, optional): Размер кадра в пикселях. Поле берется из записи, а если оно больше кадра,
+            камера следует за змейкой. По умолчанию (640, 480).
+        pool_size (int, optional): Количество поверхностей в пуле FrameCapture. По умолчанию 8.
+
+    Returns:
+        dict: Статистика записи FrameCapture с количеством тактов и временем отрисовки в секундах.
+    '''
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from FrameCapture import FrameCapture
+    from Renderer import Renderer
+    from Viewport import Viewport
+
+    pygame.display.init()
+    screen = pygame.display.set_mode(size)
+    simulation = replay.create_simulation()
+    if simulation.width > size[0] or simulation.height > size[1]:
+        renderer = Viewport(screen, simulation.level, simulation.cell_size)
+    else:
+        renderer = Renderer(screen, simulation.level, simulation.cell_size)
+    capture = FrameCapture(output, fps=fps or simulation.snake_speed, pool_size=pool_size, block=True, realtime=False)
+
+    start = time.perf_counter()
+    try:
+        renderer.render(simulation)
+        capture.capture(screen)
+        elapsed = 0.0
+        next_frame = 1 / fps if fps else 0.0
+        for code in replay.directions:
+            duration = 1 / simulation.snake_speed
+            running = simulation.step(DIRECTIONS[code])
+            renderer.record(simulation)
+            if not fps:
+                renderer.render(simulation)
+                capture.capture(screen)
+            while fps and next_frame < elapsed + duration:
+                renderer.render(simulation, (next_frame - elapsed) / duration if running else 1.0)
+                capture.capture(screen)
+                next_frame += 1 / fps
+            elapsed += duration
+            if not running:
+                break
+    finally:
+        stats = capture.close()
+        pygame.display.quit()
+    stats['ticks'] = simulation.ticks
+    stats['seconds'] = time.perf_counter() - start
+    stats['game_seconds'] = elapsed
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Отрисовка записи игры "Snake Game" в изображения или несжатое видео без окна.')
+    parser.add_argument('replay', help='Файл записи игры.')
+    parser.add_argument('output', help="Каталог для кадров PNG, шаблон вида 'frames/frame_{:06d}.png' или файл .rgb.")
+    parser.add_argument('--fps', type=int, default=30, help='Частота кадров видео, 0 - один кадр на такт.')
+    parser.add_argument('--size', default='640x480', help='Размер кадра в пикселях.')
+    parser.add_argument('--pool-size', type=int, default=8, help='Количество кадров, ожидающих записи.')
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.split('x'))
+    stats = render_replay(Replay.load(args.replay), args.output, args.fps or None, (width, height), pool_size=args.pool_size)
+    print(f"{stats['written']} frames, {stats['ticks']} ticks: {stats['game_seconds']:.1f} s of game "
+          f"rendered in {stats['seconds']:.2f} s, {stats['encode_ms']:.2f} ms per frame to encode")
+    if stats['error'] is not None:
+        print(f"ERROR {stats['error']}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import deque
+from Match import Match
+
+SEPARATORS = (',', ':')
+
+
+class MatchServer:
+    '''
+    Класс MatchServer принимает игроков по TCP и проводит много матчей в одном цикле событий asyncio.
+    Сообщения передаются строками JSON. При подключении игрок получает полное состояние матча,
+    а затем на каждом такте только изменения, которые кодируются один раз и рассылаются всем игрокам матча.
+    '''
+    def __init__(self, host='127.0.0.1', port=8765, difficulty='Easy', tick_rate=20, players_per_match=8, bonus_count=3, max_buffer=1 << 20):
+        '''
+        Инициализация нового объекта MatchServer.
+
+        Args:
+            host (str, optional): Адрес, на котором сервер принимает подключения. По умолчанию '127.0.0.1'.
+            port (int, optional): Порт сервера. По умолчанию 8765.
+            difficulty (str, optional): Уровень сложности матчей. По умолчанию 'Easy'.
+            tick_rate (int, optional): Частота тактов матчей в секунду. По умолчанию 20.
+            players_per_match (int, optional): Максимальное количество игроков в матче. По умолчанию 8.
+            bonus_count (int, optional): Количество бонусов на поле каждого матча. По умолчанию 3.
+            max_buffer (int, optional): Размер неотправленных данных в байтах, после которого медленный клиент отключается. По умолчанию 1 МБ.
+        '''
+        self.host = host
+        self.port = port
+        self.difficulty = difficulty
+        self.tick_rate = tick_rate
+        self.players_per_match = players_per_match
+        self.bonus_count = bonus_count
+        self.max_buffer = max_buffer
+        self.matches = {}
+        self.connections = {}
+        self.tasks = {}
+        self.stats = {}
+        self.next_match_id = 1
+        self.server = None
+
+    async def start(self):
+        '''
+        Запуск приема подключений.
+        '''
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        '''
+        Запуск сервера и прием подключений до остановки цикла событий.
+        '''
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def find_match(self):
+        '''
+        Поиск матча со свободным местом. Если такого матча нет, создается новый.
+
+        Returns:
+            Match: Матч для нового игрока.
+        '''
+        for match in self.matches.values():
+            if len(match.players) < self.players_per_match:
+                return match
+        match = Match(self.next_match_id, self.difficulty, tick_rate=self.tick_rate, bonus_count=self.bonus_count)
+        self.next_match_id += 1
+        self.matches[match.match_id] = match
+        self.connections[match.match_id] = {}
+        self.stats[match.match_id] = {'bytes': 0, 'messages': 0, 'tick_times': deque(maxlen=1000)}
+        self.tasks[match.match_id] = asyncio.get_running_loop().create_task(self.run_match(match))
+        return match
+
+    async def run_match(self, match):
+        '''
+        Цикл матча: такты с фиксированной частотой и рассылка изменений. Если такт задержался больше
+        чем на один интервал, расписание сдвигается, а пропущенные такты не наверстываются.
+        Матч завершается, когда из него выходит последний игрок.
+
+        Args:
+            match (Match): Матч.
+        '''
+        loop = asyncio.get_running_loop()
+        interval = 1 / match.tick_rate
+        connections = self.connections[match.match_id]
+        stats = self.stats[match.match_id]
+        next_tick = loop.time()
+        while match.players:
+            start = time.perf_counter()
+            data = (json.dumps(match.step(), separators=SEPARATORS) + '\n').encode()
+            for player_id, writer in list(connections.items()):
+                if writer.transport.get_write_buffer_size() > self.max_buffer:
+                    self.disconnect(match, player_id)
+                    continue
+                writer.write(data)
+                stats['bytes'] += len(data)
+                stats['messages'] += 1
+            stats['tick_times'].append(time.perf_counter() - start)
+
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < -interval:
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(max(delay, 0))
+
+        del self.matches[match.match_id]
+        del self.connections[match.match_id]
+        del self.tasks[match.match_id]
+        del self.stats[match.match_id]
+
+    def disconnect(self, match, player_id):
+        '''
+        Удаление игрока из матча и закрытие его подключения.
+
+        Args:
+            match (Match): Матч.
+            player_id (int): Номер игрока.
+        '''
+        match.remove_player(player_id)
+        writer = self.connections.get(match.match_id, {}).pop(player_id, None)
+        if writer is not None:
+            writer.close()
+
+    def send(self, writer, message):
+        '''
+        Отправка одного сообщения клиенту.
+
+        Args:
+            writer (StreamWriter): Поток записи клиента.
+            message (dict): Сообщение.
+        '''
+        writer.write((json.dumps(message, separators=SEPARATORS) + '\n').encode())
+
+    async def handle_client(self, reader, writer):
+        '''
+        Обработка подключения игрока. Первое сообщение должно быть {"type": "join", "name": ...},
+        затем принимаются сообщения "turn" с направлением "d", "respawn" для возврата после гибели и "stats".
+        Строка, которая не является объектом JSON, завершает подключение, а направление, которое не является
+        списком из двух чисел, игнорируется.
+
+        Args:
+            reader (StreamReader): Поток чтения клиента.
+            writer (StreamWriter): Поток записи клиента.
+        '''
+        match = None
+        player = None
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    break
+                if not isinstance(message, dict):
+                    break
+                kind = message.get('type')
+                if kind == 'join' and player is None:
+                    match = self.find_match()
+                    player = match.add_player(str(message.get('name', ''))[:32])
+                    self.connections[match.match_id][player.player_id] = writer
+                    self.send(writer, dict(match.snapshot(), type='welcome', player=player.player_id))
+                elif kind == 'turn' and player is not None:
+                    direction = message.get('d')
+                    if isinstance(direction, list) and len(direction) == 2 and tuple(direction) in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                        match.turn(player.player_id, tuple(direction))
+                elif kind == 'respawn' and player is not None and not player.alive:
+                    match.spawn(player)
+                elif kind == 'stats':
+                    self.send(writer, {'type': 'stats', 'matches': self.get_stats()})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if player is not None and match.match_id in self.connections:
+                self.disconnect(match, player.player_id)
+            else:
+                writer.close()
+
+    def get_stats(self):
+        '''
+        Статистика работы матчей с момента их создания.
+
+        Returns:
+            dict: Для каждого матча количество игроков, тактов, отправленных байтов и сообщений
+            и время такта в миллисекундах по последним 1000 тактам: среднее и максимум.
+        '''
+        result = {}
+        for match_id, match in self.matches.items():
+            stats = self.stats[match_id]
+            tick_times = stats['tick_times']
+            result[str(match_id)] = {
+                'players': len(match.players),
+                'ticks': match.ticks,
+                'bytes': stats['bytes'],
+                'messages': stats['messages'],
+                'tick_ms_mean': statistics.fmean(tick_times) * 1000 if tick_times else 0.0,
+                'tick_ms_max': max(tick_times) * 1000 if tick_times else 0.0,
+            }
+        return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Сервер сетевой игры "Snake Game".')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес сервера.')
+    parser.add_argument('--port', type=int, default=8765, help='Порт сервера.')
+    parser.add_argument('--difficulty', default='Easy', help='Уровень сложности матчей.')
+    parser.add_argument('--tick-rate', type=int, default=20, help='Частота тактов в секунду.')
+    parser.add_argument('--players-per-match', type=int, default=8, help='Максимальное количество игроков в матче.')
+    parser.add_argument('--bonus-count', type=int, default=3, help='Количество бонусов на поле.')
+    args = parser.parse_args()
+
+    server = MatchServer(args.host, args.port, args.difficulty, args.tick_rate, args.players_per_match, args.bonus_count)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
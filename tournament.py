@@ -0,0 +1,323 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+from collections import Counter
+from itertools import product
+from multiprocessing import Pool
+from random import Random
+from Autopilot import Autopilot
+from GameState import GameState
+from Simulation import Simulation, DIFFICULTIES, DIRECTIONS
+
+
+def straight_strategy(seed):
+    '''
+    Стратегия, которая никогда не меняет направление змейки.
+
+    Args:
+        seed (int): Номер игры.
+
+    Returns:
+        callable: Функция, принимающая Simulation и возвращающая направление или None.
+    '''
+    return lambda simulation: None
+
+
+def random_strategy(seed):
+    '''
+    Стратегия, которая поворачивает змейку в случайном направлении.
+
+    Args:
+        seed (int): Номер игры, используемый как начальное значение генератора случайных чисел.
+
+    Returns:
+        callable: Функция, принимающая Simulation и возвращающая направление.
+    '''
+    random = Random(seed)
+    return lambda simulation: random.choice(DIRECTIONS)
+
+
+def next_position(simulation, direction):
+    '''
+    Вычисление клетки, в которую попадет голова змейки при движении в заданном направлении.
+
+    Args:
+        simulation (Simulation): Симуляция игры.
+        direction (tuple): Направление движения.
+
+    Returns:
+        tuple: Координаты клетки в формате (y, x).
+    '''
+    head = simulation.snake.get_head()
+    rows = simulation.height // simulation.cell_size + 1
+    cols = simulation.width // simulation.cell_size + 1
+    return (head[0] + direction[0]) % rows, (head[1] + direction[1]) % cols
+
+
+def greedy_strategy(seed):
+    '''
+    Стратегия, которая идет к бонусу кратчайшим шагом, избегая клеток, ведущих к немедленному столкновению.
+
+    Args:
+        seed (int): Номер игры.
+
+    Returns:
+        callable: Функция, принимающая Simulation и возвращающая направление.
+    '''
+    def choose(simulation):
+        snake = simulation.snake
+        tail = snake.segments[-1]
+        best, best_distance = None, None
+        for direction in DIRECTIONS:
+            if direction == (-snake.direction[0], -snake.direction[1]):
+                continue
+            position = next_position(simulation, direction)
+            if simulation.level.is_obstacle(position) or (snake.contains(position) and position != tail):
+                continue
+            distance = 0
+            if simulation.bonus is not None:
+                distance = abs(position[0] - simulation.bonus.position[0]) + abs(position[1] - simulation.bonus.position[1])
+            if best is None or distance < best_distance:
+                best, best_distance = direction, distance
+        return best
+    return choose
+
+
+def autopilot_strategy(seed):
+    '''
+    Стратегия, которая передает управление автопилоту с полем расстояний до бонуса и проверкой свободного места.
+
+    Args:
+        seed (int): Номер игры.
+
+    Returns:
+        callable: Объект Autopilot, принимающий Simulation и возвращающий направление.
+    '''
+    return Autopilot()
+
+
+def lookahead_strategy(seed, depth=4):
+    '''
+    Стратегия, которая перебирает все ходы на depth тактов вперед на состоянии GameState с помощью step и undo
+    и выбирает ход, после которого змейка дольше остается живой и длиннее, а при равенстве ближе к бонусу.
+
+    Args:
+        seed (int): Номер игры, используемый как начальное значение генератора бонусов при переборе.
+        depth (int, optional): Глубина перебора в тактах. По умолчанию 4.
+
+    Returns:
+        callable: Функция, принимающая Simulation и возвращающая направление.
+    '''
+    def search(state, depth):
+        if not state.running or depth == 0:
+            return int(state.running), state.length
+        best = (0, state.length)
+        for action in state.get_actions():
+            state.step(action)
+            survived, length = search(state, depth - 1)
+            state.undo()
+            best = max(best, (survived + 1, length))
+        return best
+
+    def choose(simulation):
+        state = GameState.from_simulation(simulation, seed)
+        bonus = simulation.bonus
+        best, best_value = None, None
+        for action in state.get_actions():
+            state.step(action)
+            head = state.get_head()
+            distance = abs(head[0] - bonus.position[0]) + abs(head[1] - bonus.position[1]) if bonus is not None else 0
+            value = search(state, depth - 1) + (-distance,)
+            state.undo()
+            if best is None or value > best_value:
+                best, best_value = action, value
+        return best
+    return choose
+
+
+STRATEGIES = {
+    'straight': straight_strategy,
+    'random': random_strategy,
+    'greedy': greedy_strategy,
+    'autopilot': autopilot_strategy,
+    'lookahead': lookahead_strategy,
+}
+
+
+def load_strategy(name):
+    '''
+    Поиск фабрики стратегии по имени. Кроме встроенных стратегий, принимается путь вида 'module:function'.
+
+    Args:
+        name (str): Имя стратегии.
+
+    Returns:
+        callable: Фабрика, которая по номеру игры создает функцию выбора направления.
+    '''
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module_name, _, attribute = name.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def play_game(job):
+    '''
+    Проведение одной игры без отображения.
+
+    Args:
+        job (tuple): Имя стратегии, уровень сложности, номер игры и максимальное количество тактов.
+
+    Returns:
+        dict: Результат игры: счет, количество тактов и причина завершения.
+    '''
+    strategy_name, difficulty, seed, max_ticks = job
+    simulation = Simulation(difficulty, seed=seed)
+    strategy = load_strategy(strategy_name)(seed)
+    while simulation.running and simulation.ticks < max_ticks:
+        simulation.step(strategy(simulation))
+    return {
+        'strategy': strategy_name,
+        'difficulty': difficulty,
+        'seed': seed,
+        'score': simulation.get_score(),
+        'ticks': simulation.ticks,
+        'death_cause': simulation.death_cause or 'timeout',
+    }
+
+
+def load_results(path):
+    '''
+    Чтение результатов, уже сохраненных в файле. Оборванная последняя строка после прерывания пропускается.
+
+    Args:
+        path (str): Путь к файлу результатов в формате JSON Lines.
+
+    Returns:
+        tuple: Список результатов игр и размер неповрежденной части файла в байтах.
+    '''
+    results = []
+    size = 0
+    if not os.path.exists(path):
+        return results, size
+    with open(path, 'rb') as file:
+        for line in file:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+            size += len(line)
+    return results, size
+
+
+def percentile(values, fraction):
+    '''
+    Вычисление перцентиля отсортированного списка.
+
+    Args:
+        values (list): Отсортированный список чисел.
+        fraction (float): Доля от 0 до 1.
+
+    Returns:
+        float: Значение перцентиля.
+    '''
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(results):
+    '''
+    Сводка результатов по каждой паре стратегии и уровня сложности.
+
+    Args:
+        results (list): Список результатов игр.
+
+    Returns:
+        dict: Распределения счетов, продолжительность игр и причины завершения.
+    '''
+    groups = {}
+    for result in results:
+        groups.setdefault(f"{result['strategy']}/{result['difficulty']}", []).append(result)
+
+    summary = {}
+    for key, group in sorted(groups.items()):
+        scores = sorted(result['score'] for result in group)
+        ticks = sorted(result['ticks'] for result in group)
+        summary[key] = {
+            'games': len(group),
+            'score': {
+                'mean': statistics.fmean(scores),
+                'stdev': statistics.pstdev(scores),
+                'min': scores[0],
+                'p50': percentile(scores, 0.5),
+                'p90': percentile(scores, 0.9),
+                'max': scores[-1],
+                'histogram': dict(sorted(Counter(scores).items())),
+            },
+            'ticks': {
+                'mean': statistics.fmean(ticks),
+                'p50': percentile(ticks, 0.5),
+                'max': ticks[-1],
+            },
+            'death_causes': dict(Counter(result['death_cause'] for result in group)),
+        }
+    return summary
+
+
+def run_tournament(strategies, difficulties, games, output, seed_start=0, max_ticks=10000, workers=None, chunksize=16):
+    '''
+    Проведение турнира: все стратегии играют одинаковые наборы игр на каждом уровне сложности.
+    Игры распределяются по пулу процессов порциями, а результаты по мере готовности дописываются в файл,
+    поэтому прерванный турнир продолжается с места остановки. В сводку попадают только игры текущего турнира,
+    а результаты других стратегий, уровней сложности и номеров игр, оставшиеся в файле, не учитываются.
+
+    Args:
+        strategies (list): Имена стратегий.
+        difficulties (list): Уровни сложности.
+        games (int): Количество игр для каждой пары стратегии и уровня сложности.
+        output (str): Путь к файлу результатов в формате JSON Lines.
+        seed_start (int, optional): Номер первой игры. По умолчанию 0.
+        max_ticks (int, optional): Максимальная продолжительность игры в тактах. По умолчанию 10000.
+        workers (int, optional): Количество процессов. По умолчанию равно количеству ядер.
+        chunksize (int, optional): Количество игр, передаваемых процессу за раз. По умолчанию 16.
+
+    Returns:
+        dict: Сводка результатов турнира.
+    '''
+    results, size = load_results(output)
+    done = {(result['strategy'], result['difficulty'], result['seed']) for result in results}
+    keys = list(product(strategies, difficulties, range(seed_start, seed_start + games)))
+    jobs = [(strategy, difficulty, seed, max_ticks) for strategy, difficulty, seed in keys if (strategy, difficulty, seed) not in done]
+
+    with open(output, 'a') as file:
+        file.truncate(size)
+        if jobs:
+            with Pool(workers) as pool:
+                for result in pool.imap_unordered(play_game, jobs, chunksize):
+                    results.append(result)
+                    file.write(json.dumps(result) + '\n')
+                    file.flush()
+
+    wanted = set(keys)
+    return summarize([result for result in results if (result['strategy'], result['difficulty'], result['seed']) in wanted])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Турнир стратегий "Snake Game" на пуле процессов.')
+    parser.add_argument('--strategies', default='greedy', help="Имена стратегий через запятую или пути вида 'module:function'.")
+    parser.add_argument('--difficulties', default=','.join(DIFFICULTIES), help='Уровни сложности через запятую.')
+    parser.add_argument('--games', type=int, default=100, help='Количество игр на каждую стратегию и уровень сложности.')
+    parser.add_argument('--seed-start', type=int, default=0, help='Номер первой игры.')
+    parser.add_argument('--max-ticks', type=int, default=10000, help='Максимальная продолжительность игры в тактах.')
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов.')
+    parser.add_argument('--chunksize', type=int, default=16, help='Количество игр, передаваемых процессу за раз.')
+    parser.add_argument('--output', default='tournament.jsonl', help='Файл результатов, из которого турнир продолжается после прерывания.')
+    args = parser.parse_args()
+
+    summary = run_tournament(
+        args.strategies.split(','), args.difficulties.split(','), args.games, args.output,
+        args.seed_start, args.max_ticks, args.workers, args.chunksize,
+    )
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,113 @@
+import argparse
+import glob
+import os
+import struct
+import sys
+import time
+from multiprocessing import Pool
+from Leaderboard import Leaderboard
+from Replay import Replay
+
+
+def verify_file(path):
+    '''
+    Проверка одного файла записи. Поврежденный файл или отсутствующий файл уровня не прерывают проверку
+    остальных записей, а отмечаются в результате вместе с сообщением об ошибке.
+
+    Args:
+        path (str): Путь к файлу записи.
+
+    Returns:
+        dict: Данные записи и результат проверки.
+    '''
+    try:
+        replay = Replay.load(path)
+        simulation = replay.simulate()
+    except (OSError, ValueError, IndexError, struct.error) as error:
+        return {'path': path, 'valid': False, 'error': str(error)}
+    return {
+        'path': path,
+        'name': replay.name,
+        'difficulty': replay.difficulty,
+        'score': replay.score,
+        'ticks': len(replay.directions),
+        'replayed_score': simulation.get_score(),
+        'valid': simulation.ticks == len(replay.directions) and simulation.get_score() == replay.score,
+    }
+
+
+def verify_directory(directory, workers=None, chunksize=8):
+    '''
+    Параллельная проверка всех записей в каталоге.
+
+    Args:
+        directory (str): Каталог с файлами записей *.snr.
+        workers (int, optional): Количество процессов. По умолчанию равно количеству ядер.
+        chunksize (int, optional): Количество файлов, передаваемых процессу за раз. По умолчанию 8.
+
+    Returns:
+        list: Результаты проверки, отсортированные по пути к файлу.
+    '''
+    paths = sorted(glob.glob(os.path.join(directory, '*.snr')))
+    with Pool(workers) as pool:
+        return sorted(pool.imap_unordered(verify_file, paths, chunksize), key=lambda result: result['path'])
+
+
+def find_unconfirmed_highscores(results, leaderboard, count=10):
+    '''
+    Поиск рекордов из таблицы, для которых нет подтвержденной записи игры.
+
+    Args:
+        results (list): Результаты проверки записей.
+        leaderboard (Leaderboard): Таблица рекордов.
+        count (int, optional): Количество проверяемых лучших рекордов. По умолчанию 10.
+
+    Returns:
+        list: Пары (имя, счет) рекордов без подтвержденной записи.
+    '''
+    confirmed = {}
+    for result in results:
+        if result['valid']:
+            key = (result['name'], result['score'])
+            confirmed[key] = confirmed.get(key, 0) + 1
+
+    unconfirmed = []
+    for name, score in leaderboard.top(count):
+        if confirmed.get((name, score), 0) > 0:
+            confirmed[(name, score)] -= 1
+        else:
+            unconfirmed.append((name, score))
+    return unconfirmed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Проверка записей игр "Snake Game" и таблицы рекордов.')
+    parser.add_argument('directory', nargs='?', default='replays', help='Каталог с файлами записей.')
+    parser.add_argument('--leaderboard', default='highscores.log', help='Журнал рекордов для сверки.')
+    parser.add_argument('--top', type=int, default=10, help='Количество сверяемых лучших рекордов.')
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов.')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = verify_directory(args.directory, args.workers)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if result['valid']:
+            print(f"OK       {result['path']}: {result['name']} {result['difficulty']} {result['score']}")
+        elif 'error' in result:
+            print(f"BROKEN   {result['path']}: {result['error']}")
+        else:
+            print(f"MISMATCH {result['path']}: recorded {result['score']}, replayed {result['replayed_score']}")
+    ticks = sum(result.get('ticks', 0) for result in results)
+    print(f'{len(results)} replays, {ticks} ticks in {elapsed:.2f} s')
+
+    failed = any(not result['valid'] for result in results)
+    if os.path.exists(args.leaderboard):
+        leaderboard = Leaderboard(args.leaderboard, read_only=True)
+        for name, score in find_unconfirmed_highscores(results, leaderboard, args.top):
+            print(f'UNCONFIRMED highscore {name}: {score}')
+            failed = True
+        leaderboard.close()
+
+    if failed:
+        sys.exit(1)